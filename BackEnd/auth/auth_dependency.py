@@ -1,29 +1,119 @@
+import hashlib
+import os
+import time
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from fastapi.concurrency import run_in_threadpool
+from pydantic import BaseModel
+from typing import Optional
 from auth.supabase_client import supabase
-from typing import Dict, Any
+from auth.jwt_verifier import (
+    verify_access_token,
+    unverified_claims,
+    TokenVerificationError,
+    LocalVerificationUnavailable
+)
+from models.pessoa_model import PessoaModel
+from services.cache import TTLCache
+from services.identity import identity_cache
 
 security = HTTPBearer()
+_pessoa_model = PessoaModel()
 
-async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)) -> Dict[str, Any]:
+# Intervalo (s) para reconsultar o Auth e detectar tokens revogados; 0 desativa
+AUTH_REVOCATION_CHECK_SECONDS = int(os.getenv("AUTH_REVOCATION_CHECK_SECONDS", "0"))
+
+# Principais já verificados, indexados pelo hash do token e expirando junto com ele
+_token_cache = TTLCache(maxsize=int(os.getenv("AUTH_TOKEN_CACHE_SIZE", "10000")))
+
+
+class AuthenticatedUser(BaseModel):
+    id: str
+    email: Optional[str] = None
+    role: Optional[str] = None
+    expires_at: int
+    checked_at: float
+
+
+class Principal(AuthenticatedUser):
+    nickname: str
+    tipo: str
+
+
+def _unauthorized() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Token inválido ou expirado",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
+def _token_key(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def _principal_from_claims(claims, checked_at: float) -> AuthenticatedUser:
+    return AuthenticatedUser(
+        id=claims["sub"],
+        email=claims.get("email"),
+        role=claims.get("role"),
+        expires_at=int(claims["exp"]),
+        checked_at=checked_at
+    )
+
+
+async def _verify_remotely(token: str) -> AuthenticatedUser:
+    """Validar o token no Supabase Auth (fallback e checagem de revogação)"""
+    response = await run_in_threadpool(supabase.auth.get_user, token)
+    if not response or not response.user:
+        raise TokenVerificationError("Token rejeitado pelo Auth")
+
+    claims = unverified_claims(token)
+    claims.setdefault("email", response.user.email)
+    return _principal_from_claims(claims, checked_at=time.time())
+
+
+async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)) -> AuthenticatedUser:
     """
     Dependency to verify JWT token and return current user
     """
+    token = credentials.credentials
+    key = _token_key(token)
+
     try:
-        # Verify the JWT token with Supabase
-        user = supabase.auth.get_user(credentials.credentials)
-        
-        if not user.user:
+        principal = _token_cache.get(key)
+
+        if principal is None:
+            try:
+                claims = await run_in_threadpool(verify_access_token, token)
+                principal = _principal_from_claims(claims, checked_at=time.time())
+            except LocalVerificationUnavailable:
+                principal = await _verify_remotely(token)
+            _token_cache.set(key, principal, expires_at=principal.expires_at)
+        elif AUTH_REVOCATION_CHECK_SECONDS and time.time() - principal.checked_at > AUTH_REVOCATION_CHECK_SECONDS:
+            principal = await _verify_remotely(token)
+            _token_cache.set(key, principal, expires_at=principal.expires_at)
+
+        return principal
+    except Exception:
+        _token_cache.delete(key)
+        raise _unauthorized()
+
+
+async def get_current_principal(current_user: AuthenticatedUser = Depends(get_current_user)) -> Principal:
+    """
+    Dependency que retorna o usuário autenticado com nickname e tipo já resolvidos
+    """
+    pessoa = identity_cache.get(current_user.email)
+
+    if pessoa is None:
+        result = await _pessoa_model.find_by_email(current_user.email)
+        if not result["success"]:
             raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Token inválido ou expirado",
-                headers={"WWW-Authenticate": "Bearer"},
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Usuário autenticado não encontrado na tabela pessoa"
             )
-        
-        return user.user
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Token inválido ou expirado",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+        pessoa = result["data"]
+        identity_cache.set(pessoa)
+
+    return Principal(**current_user.dict(), nickname=pessoa["nickname"], tipo=pessoa["tipo"])
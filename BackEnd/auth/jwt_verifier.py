@@ -0,0 +1,76 @@
+import os
+from typing import Dict, Any, Optional
+import jwt
+from jwt import PyJWKClient
+from dotenv import load_dotenv
+from .supabase_client import SUPABASE_URL
+
+# Carrega variáveis de ambiente
+load_dotenv()
+
+# Segredo HS256 do projeto (Settings > API > JWT Secret no painel do Supabase)
+SUPABASE_JWT_SECRET = os.getenv("SUPABASE_JWT_SECRET")
+# Endpoint JWKS usado pelos projetos com chaves assimétricas (RS256/ES256)
+SUPABASE_JWKS_URL = os.getenv("SUPABASE_JWKS_URL", f"{SUPABASE_URL}/auth/v1/.well-known/jwks.json")
+SUPABASE_JWT_AUDIENCE = os.getenv("SUPABASE_JWT_AUDIENCE", "authenticated")
+
+# Algoritmos aceitos para chaves do JWKS; o alg do header nunca escolhe o algoritmo
+ALGORITMOS_ASSIMETRICOS = {"RS256", "ES256"}
+
+_jwks_client: Optional[PyJWKClient] = None
+
+
+class TokenVerificationError(Exception):
+    """Token malformado, expirado ou com assinatura inválida"""
+
+
+class LocalVerificationUnavailable(Exception):
+    """Não há chave local para validar o token (sem segredo ou JWKS inacessível)"""
+
+
+def verify_access_token(token: str) -> Dict[str, Any]:
+    """
+    Verificar assinatura, expiração e audiência do access token do Supabase.
+
+    Tokens HS256 são validados com o segredo do projeto, só com HS256; os
+    demais usam a chave pública obtida (e mantida em cache) a partir do JWKS,
+    só com o algoritmo dessa chave.
+    Pode fazer I/O na primeira busca do JWKS, então deve rodar fora do event loop.
+    """
+    global _jwks_client
+
+    try:
+        algorithm = jwt.get_unverified_header(token).get("alg")
+
+        if algorithm == "HS256":
+            if not SUPABASE_JWT_SECRET:
+                raise LocalVerificationUnavailable("SUPABASE_JWT_SECRET não configurado")
+            key, algorithms = SUPABASE_JWT_SECRET, ["HS256"]
+        else:
+            if _jwks_client is None:
+                _jwks_client = PyJWKClient(SUPABASE_JWKS_URL, cache_keys=True)
+            try:
+                signing_key = _jwks_client.get_signing_key_from_jwt(token)
+            except jwt.PyJWKClientError as e:
+                raise LocalVerificationUnavailable(str(e))
+            if signing_key.algorithm_name not in ALGORITMOS_ASSIMETRICOS:
+                raise TokenVerificationError(f"Algoritmo de chave não permitido: {signing_key.algorithm_name}")
+            key, algorithms = signing_key.key, [signing_key.algorithm_name]
+
+        return jwt.decode(
+            token,
+            key,
+            algorithms=algorithms,
+            audience=SUPABASE_JWT_AUDIENCE,
+            options={"require": ["exp", "sub"]}
+        )
+    except jwt.PyJWTError as e:
+        raise TokenVerificationError(str(e))
+
+
+def unverified_claims(token: str) -> Dict[str, Any]:
+    """Ler claims sem validar assinatura (usar apenas após validação remota)"""
+    try:
+        return jwt.decode(token, options={"verify_signature": False})
+    except jwt.PyJWTError as e:
+        raise TokenVerificationError(str(e))
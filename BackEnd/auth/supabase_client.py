@@ -1,5 +1,5 @@
 import os
-from supabase import create_client, Client
+from supabase import create_client, Client, AsyncClient
 from dotenv import load_dotenv
 
 # Carrega variáveis de ambiente
@@ -10,4 +10,7 @@ SUPABASE_URL = os.getenv("SUPABASE_URL", "http://127.0.0.1:54321")
 SUPABASE_KEY = os.getenv("SUPABASE_ANON_KEY", "your-anon-key-here")
 
 # Criar cliente Supabase
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
\ No newline at end of file
+supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
+
+# Cliente assíncrono usado pela camada de models (não bloqueia o event loop)
+async_supabase: AsyncClient = AsyncClient(SUPABASE_URL, SUPABASE_KEY)
\ No newline at end of file
@@ -1,7 +1,29 @@
-from auth.supabase_client import supabase
+from auth.supabase_client import supabase, async_supabase
+from config.postgres_pool import is_direct_table
+from models.postgres_repository import PostgresRepository
+from services.db_metrics import InstrumentedClient
+
+# Cliente assíncrono instrumentado: cada execute() é contado no request atual
+_async_database = InstrumentedClient(async_supabase)
 
 def get_database():
     """
     Retorna a instância do cliente Supabase para operações de banco de dados
     """
     return supabase
+
+def get_async_database():
+    """
+    Retorna a instância do cliente Supabase assíncrono (PostgREST async) usada pelos models
+    """
+    return _async_database
+
+def get_direct_repository(table: str):
+    """
+    Retorna o repositório Postgres com pool direto se a tabela estiver listada em
+    DB_DIRECT_TABLES (e DATABASE_URL configurada); caso contrário None, e o model
+    continua usando o PostgREST
+    """
+    if not is_direct_table(table):
+        return None
+    return PostgresRepository()
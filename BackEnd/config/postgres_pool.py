@@ -0,0 +1,60 @@
+import asyncio
+import os
+from typing import Optional, Set
+from dotenv import load_dotenv
+
+try:
+    import asyncpg
+except ImportError:  # backend direto é opcional
+    asyncpg = None
+
+# Carrega variáveis de ambiente
+load_dotenv()
+
+# String de conexão direta ao Postgres (Settings > Database no painel do Supabase)
+DATABASE_URL = os.getenv("DATABASE_URL")
+DB_POOL_MIN_SIZE = int(os.getenv("DB_POOL_MIN_SIZE", "1"))
+DB_POOL_MAX_SIZE = int(os.getenv("DB_POOL_MAX_SIZE", "10"))
+# Prepared statements mantidos por conexão; use 0 atrás do pooler em modo transaction
+DB_STATEMENT_CACHE_SIZE = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "100"))
+# Tabelas lidas pelo pool direto em vez do PostgREST, ex.: "coleta,usuario,mensagem"
+DB_DIRECT_TABLES: Set[str] = {
+    tabela.strip().lower()
+    for tabela in os.getenv("DB_DIRECT_TABLES", "").split(",")
+    if tabela.strip()
+}
+
+_pool = None
+_pool_lock = asyncio.Lock()
+
+
+def is_direct_table(table: str) -> bool:
+    """Indica se a tabela deve usar o pool direto"""
+    return bool(DATABASE_URL) and asyncpg is not None and table.lower() in DB_DIRECT_TABLES
+
+
+async def get_pool():
+    """
+    Retorna o pool de conexões asyncpg, criando-o na primeira chamada
+    """
+    global _pool
+
+    if _pool is None:
+        async with _pool_lock:
+            if _pool is None:
+                _pool = await asyncpg.create_pool(
+                    DATABASE_URL,
+                    min_size=DB_POOL_MIN_SIZE,
+                    max_size=DB_POOL_MAX_SIZE,
+                    statement_cache_size=DB_STATEMENT_CACHE_SIZE
+                )
+    return _pool
+
+
+async def close_pool() -> None:
+    """Fechar o pool (chamado no shutdown da aplicação)"""
+    global _pool
+
+    if _pool is not None:
+        await _pool.close()
+        _pool = None
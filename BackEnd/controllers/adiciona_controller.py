@@ -1,3 +1,4 @@
+import asyncio
 from pydantic import BaseModel
 from typing import Optional, Dict, Any
 from models.adiciona_model import AdicionaModel
@@ -23,10 +24,13 @@ class AdicionaController:
         self.usuario_model = UsuarioModel()
         self.pessoa_model = PessoaModel()
     
-    def create_solicitacao(self, adiciona_data: AdicionaCreate, usuario1: str) -> Dict[str, Any]:
+    async def create_solicitacao(self, adiciona_data: AdicionaCreate, usuario1: str) -> Dict[str, Any]:
         """Criar nova solicitação de amizade"""
-        # Verificar se usuário1 existe
-        usuario1_result = self.usuario_model.find_by_nickname(usuario1)
+        # Verificar se ambos os usuários existem (consultas em paralelo)
+        usuario1_result, usuario2_result = await asyncio.gather(
+            self.usuario_model.find_by_nickname(usuario1),
+            self.usuario_model.find_by_nickname(adiciona_data.usuario2)
+        )
         if not usuario1_result["success"]:
             return {
                 "success": False,
@@ -34,8 +38,6 @@ class AdicionaController:
                 "status_code": 404
             }
         
-        # Verificar se usuário2 existe
-        usuario2_result = self.usuario_model.find_by_nickname(adiciona_data.usuario2)
         if not usuario2_result["success"]:
             return {
                 "success": False,
@@ -52,7 +54,7 @@ class AdicionaController:
             }
         
         # Verificar se já existe solicitação
-        existing = self.model.find_by_usuarios(usuario1, adiciona_data.usuario2)
+        existing = await self.model.find_by_usuarios(usuario1, adiciona_data.usuario2)
         if existing["success"]:
             return {
                 "success": False,
@@ -76,35 +78,35 @@ class AdicionaController:
             "status": adiciona_data.status
         }
         
-        result = self.model.create(solicitacao_dict)
+        result = await self.model.create(solicitacao_dict)
         
         if not result["success"]:
             result["status_code"] = 400
         
         return result
     
-    def get_solicitacoes_enviadas(self, usuario: str, limit: Optional[int] = None) -> Dict[str, Any]:
+    async def get_solicitacoes_enviadas(self, usuario: str, limit: Optional[int] = None) -> Dict[str, Any]:
         """Buscar solicitações enviadas"""
-        result = self.model.find_by_usuario1(usuario, limit)
+        result = await self.model.find_by_usuario1(usuario, limit)
         
         if not result["success"]:
             result["status_code"] = 500
         
         return result
     
-    def get_solicitacoes_recebidas(self, usuario: str, limit: Optional[int] = None) -> Dict[str, Any]:
+    async def get_solicitacoes_recebidas(self, usuario: str, limit: Optional[int] = None) -> Dict[str, Any]:
         """Buscar solicitações recebidas"""
-        result = self.model.find_by_usuario2(usuario, limit)
+        result = await self.model.find_by_usuario2(usuario, limit)
         
         if not result["success"]:
             result["status_code"] = 500
         
         return result
     
-    def update_status_solicitacao(self, usuario1: str, usuario2: str, status_data: AdicionaUpdate) -> Dict[str, Any]:
+    async def update_status_solicitacao(self, usuario1: str, usuario2: str, status_data: AdicionaUpdate) -> Dict[str, Any]:
         """Atualizar status da solicitação"""
         # Verificar se solicitação existe
-        existing = self.model.find_by_usuarios(usuario1, usuario2)
+        existing = await self.model.find_by_usuarios(usuario1, usuario2)
         if not existing["success"]:
             return {
                 "success": False,
@@ -121,17 +123,17 @@ class AdicionaController:
                 "status_code": 400
             }
         
-        result = self.model.update_status(usuario1, usuario2, status_data.status)
+        result = await self.model.update_status(usuario1, usuario2, status_data.status)
         
         if not result["success"]:
             result["status_code"] = 400
         
         return result
     
-    def delete_solicitacao(self, usuario1: str, usuario2: str) -> Dict[str, Any]:
+    async def delete_solicitacao(self, usuario1: str, usuario2: str) -> Dict[str, Any]:
         """Deletar solicitação"""
         # Verificar se solicitação existe
-        existing = self.model.find_by_usuarios(usuario1, usuario2)
+        existing = await self.model.find_by_usuarios(usuario1, usuario2)
         if not existing["success"]:
             return {
                 "success": False,
@@ -139,7 +141,7 @@ class AdicionaController:
                 "status_code": 404
             }
         
-        result = self.model.delete(usuario1, usuario2)
+        result = await self.model.delete(usuario1, usuario2)
         
         if not result["success"]:
             result["status_code"] = 400
@@ -1,8 +1,8 @@
+import asyncio
 from pydantic import BaseModel
 from typing import Optional, Dict, Any, List
 from models.amizade_model import AmizadeModel
 from models.usuario_model import UsuarioModel
-from models.pessoa_model import PessoaModel
 
 class SolicitacaoAmizadeRequest(BaseModel):
     destinatario: str
@@ -29,27 +29,15 @@ class AmizadeController:
     def __init__(self):
         self.model = AmizadeModel()
         self.usuario_model = UsuarioModel()
-        self.pessoa_model = PessoaModel()
     
-    def _get_nickname_from_email(self, email: str) -> Dict[str, Any]:
-        """Buscar nickname do usuário pelo email"""
-        pessoa_result = self.pessoa_model.find_by_email(email)
-        if not pessoa_result["success"]:
-            return {
-                "success": False,
-                "error": "Usuário não encontrado",
-                "status_code": 404
-            }
-        return {
-            "success": True,
-            "data": pessoa_result["data"]["nickname"]
-        }
-    
-    def enviar_solicitacao(self, solicitante: str, solicitacao_data: SolicitacaoAmizadeRequest) -> Dict[str, Any]:
+    async def enviar_solicitacao(self, solicitante: str, solicitacao_data: SolicitacaoAmizadeRequest) -> Dict[str, Any]:
         """Enviar solicitação de amizade"""
         try:
-            # Verificar se solicitante existe na tabela usuario
-            solicitante_result = self.usuario_model.find_by_nickname(solicitante)
+            # Verificar se solicitante e destinatário existem na tabela usuario
+            solicitante_result, destinatario_result = await asyncio.gather(
+                self.usuario_model.find_by_nickname(solicitante),
+                self.usuario_model.find_by_nickname(solicitacao_data.destinatario)
+            )
             if not solicitante_result["success"]:
                 return {
                     "success": False,
@@ -57,8 +45,6 @@ class AmizadeController:
                     "status_code": 404
                 }
             
-            # Verificar se destinatário existe
-            destinatario_result = self.usuario_model.find_by_nickname(solicitacao_data.destinatario)
             if not destinatario_result["success"]:
                 return {
                     "success": False,
@@ -74,7 +60,7 @@ class AmizadeController:
                     "status_code": 400
                 }
             
-            result = self.model.enviar_solicitacao(solicitante, solicitacao_data.destinatario)
+            result = await self.model.enviar_solicitacao(solicitante, solicitacao_data.destinatario)
             
             if not result["success"]:
                 result["status_code"] = 400
@@ -87,10 +73,10 @@ class AmizadeController:
                 "status_code": 500
             }
     
-    def aceitar_solicitacao(self, solicitacao_id: int) -> Dict[str, Any]:
+    async def aceitar_solicitacao(self, solicitacao_id: int) -> Dict[str, Any]:
         """Aceitar solicitação de amizade"""
         try:
-            result = self.model.aceitar_solicitacao(solicitacao_id)
+            result = await self.model.aceitar_solicitacao(solicitacao_id)
             
             if not result["success"]:
                 result["status_code"] = 400
@@ -103,10 +89,10 @@ class AmizadeController:
                 "status_code": 500
             }
     
-    def recusar_solicitacao(self, solicitacao_id: int) -> Dict[str, Any]:
+    async def recusar_solicitacao(self, solicitacao_id: int) -> Dict[str, Any]:
         """Recusar solicitação de amizade"""
         try:
-            result = self.model.recusar_solicitacao(solicitacao_id)
+            result = await self.model.recusar_solicitacao(solicitacao_id)
             
             if not result["success"]:
                 result["status_code"] = 400
@@ -119,10 +105,10 @@ class AmizadeController:
                 "status_code": 500
             }
     
-    def remover_amizade(self, usuario1: str, usuario2: str) -> Dict[str, Any]:
+    async def remover_amizade(self, usuario1: str, usuario2: str) -> Dict[str, Any]:
         """Remover amizade"""
         try:
-            result = self.model.remover_amizade(usuario1, usuario2)
+            result = await self.model.remover_amizade(usuario1, usuario2)
             
             if not result["success"]:
                 result["status_code"] = 400
@@ -135,10 +121,10 @@ class AmizadeController:
                 "status_code": 500
             }
     
-    def listar_amigos(self, nickname: str) -> Dict[str, Any]:
+    async def listar_amigos(self, nickname: str) -> Dict[str, Any]:
         """Listar amigos de um usuário"""
         try:
-            result = self.model.listar_amigos(nickname)
+            result = await self.model.listar_amigos(nickname)
             
             if not result["success"]:
                 result["status_code"] = 500
@@ -151,10 +137,10 @@ class AmizadeController:
                 "status_code": 500
             }
     
-    def listar_solicitacoes_pendentes(self, nickname: str) -> Dict[str, Any]:
+    async def listar_solicitacoes_pendentes(self, nickname: str) -> Dict[str, Any]:
         """Listar solicitações pendentes recebidas"""
         try:
-            result = self.model.listar_solicitacoes_pendentes(nickname)
+            result = await self.model.listar_solicitacoes_pendentes(nickname)
             
             if not result["success"]:
                 result["status_code"] = 500
@@ -167,7 +153,7 @@ class AmizadeController:
                 "status_code": 500
             }
     
-    def buscar_usuarios(self, termo_busca: str, usuario_atual: str, limit: int = 20) -> Dict[str, Any]:
+    async def buscar_usuarios(self, termo_busca: str, usuario_atual: str, limit: int = 20) -> Dict[str, Any]:
         """Buscar usuários por nickname"""
         try:
             if len(termo_busca.strip()) < 2:
@@ -177,7 +163,7 @@ class AmizadeController:
                     "status_code": 400
                 }
             
-            result = self.model.buscar_usuarios(termo_busca, usuario_atual, limit)
+            result = await self.model.buscar_usuarios(termo_busca, usuario_atual, limit)
             
             if not result["success"]:
                 result["status_code"] = 500
@@ -190,10 +176,10 @@ class AmizadeController:
                 "status_code": 500
             }
     
-    def verificar_status_amizade(self, usuario1: str, usuario2: str) -> Dict[str, Any]:
+    async def verificar_status_amizade(self, usuario1: str, usuario2: str) -> Dict[str, Any]:
         """Verificar status de amizade entre dois usuários"""
         try:
-            result = self.model.verificar_status_amizade(usuario1, usuario2)
+            result = await self.model.verificar_status_amizade(usuario1, usuario2)
             
             if not result["success"]:
                 result["status_code"] = 500
@@ -1,6 +1,7 @@
 from pydantic import BaseModel, HttpUrl
 from typing import Optional, List, Dict, Any
 from models.carta_model import CartaModel
+from models.colecao_model import ColecaoModel
 
 class CartaCreate(BaseModel):
     qrcode: str
@@ -29,8 +30,9 @@ class CartaResponse(BaseModel):
 class CartaController:
     def __init__(self):
         self.model = CartaModel()
+        self.colecao_model = ColecaoModel()
     
-    def create_carta(self, carta_data: CartaCreate) -> Dict[str, Any]:
+    async def create_carta(self, carta_data: CartaCreate) -> Dict[str, Any]:
         """Criar uma nova carta"""
         # Validar raridade
         valid_raridades = ["comum", "rara", "épica", "lendária"]
@@ -42,7 +44,7 @@ class CartaController:
             }
         
         # Verificar se QRCode já existe
-        existing = self.model.find_by_qrcode(carta_data.qrcode)
+        existing = await self.model.find_by_qrcode(carta_data.qrcode)
         if existing["success"]:
             return {
                 "success": False,
@@ -51,52 +53,71 @@ class CartaController:
             }
         
         # Criar carta
-        result = self.model.create(carta_data.dict())
+        result = await self.model.create(carta_data.dict())
         
         if not result["success"]:
             result["status_code"] = 400
         
         return result
     
-    def get_carta_by_qrcode(self, qrcode: str) -> Dict[str, Any]:
+    async def get_carta_by_qrcode(self, qrcode: str) -> Dict[str, Any]:
         """Buscar carta por QRCode"""
-        result = self.model.find_by_qrcode(qrcode)
+        result = await self.model.find_by_qrcode(qrcode)
         
         if not result["success"]:
             result["status_code"] = 404
         
         return result
     
-    def get_all_cartas(self, 
+    async def get_all_cartas(self, 
                       limit: Optional[int] = None, 
                       raridade: Optional[str] = None,
                       localizacao: Optional[str] = None) -> Dict[str, Any]:
         """Buscar todas as cartas com filtros opcionais"""
         if raridade:
-            result = self.model.find_by_raridade(raridade)
+            result = await self.model.find_by_raridade(raridade)
         elif localizacao:
-            result = self.model.find_by_localizacao(localizacao)
+            result = await self.model.find_by_localizacao(localizacao)
         else:
-            result = self.model.find_all(limit)
+            result = await self.model.find_all(limit)
         
         if not result["success"]:
             result["status_code"] = 500
         
         return result
     
-    def get_cartas_raras(self) -> Dict[str, Any]:
+    async def get_cartas_proximas(self, latitude: float, longitude: float,
+                                  raio: Optional[float] = None, limit: int = 10,
+                                  usuario: Optional[str] = None) -> Dict[str, Any]:
+        """Buscar cartas próximas, opcionalmente sem as que o usuário já coletou"""
+        excluir = None
+        if usuario:
+            coletadas = await self.colecao_model.get_qrcodes_usuario(usuario)
+            if not coletadas["success"]:
+                coletadas["status_code"] = 500
+                return coletadas
+            excluir = coletadas["data"]
+        
+        result = await self.model.find_proximas(latitude, longitude, raio, limit, excluir)
+        
+        if not result["success"]:
+            result["status_code"] = 500
+        
+        return result
+    
+    async def get_cartas_raras(self) -> Dict[str, Any]:
         """Buscar cartas raras com história"""
-        result = self.model.get_cartas_raras()
+        result = await self.model.get_cartas_raras()
         
         if not result["success"]:
             result["status_code"] = 500
         
         return result
     
-    def update_carta(self, qrcode: str, update_data: CartaUpdate) -> Dict[str, Any]:
+    async def update_carta(self, qrcode: str, update_data: CartaUpdate) -> Dict[str, Any]:
         """Atualizar carta"""
         # Verificar se carta existe
-        existing = self.model.find_by_qrcode(qrcode)
+        existing = await self.model.find_by_qrcode(qrcode)
         if not existing["success"]:
             return {
                 "success": False,
@@ -124,17 +145,17 @@ class CartaController:
                     "status_code": 400
                 }
         
-        result = self.model.update(qrcode, update_dict)
+        result = await self.model.update(qrcode, update_dict)
         
         if not result["success"]:
             result["status_code"] = 400
         
         return result
     
-    def delete_carta(self, qrcode: str) -> Dict[str, Any]:
+    async def delete_carta(self, qrcode: str) -> Dict[str, Any]:
         """Deletar carta"""
         # Verificar se carta existe
-        existing = self.model.find_by_qrcode(qrcode)
+        existing = await self.model.find_by_qrcode(qrcode)
         if not existing["success"]:
             return {
                 "success": False,
@@ -142,7 +163,7 @@ class CartaController:
                 "status_code": 404
             }
         
-        result = self.model.delete(qrcode)
+        result = await self.model.delete(qrcode)
         
         if not result["success"]:
             result["status_code"] = 400
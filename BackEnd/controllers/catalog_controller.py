@@ -0,0 +1,15 @@
+from typing import Dict, Any
+from services.catalog_bundle import catalog_bundle
+
+class CatalogController:
+    async def get_bundle(self) -> Dict[str, Any]:
+        """Obter o snapshot atual do catálogo (cartas, histórias e missões)"""
+        try:
+            snapshot = await catalog_bundle.get()
+            return {"success": True, "data": snapshot}
+        except Exception as e:
+            return {
+                "success": False,
+                "error": f"Erro ao montar catálogo: {str(e)}",
+                "status_code": 500
+            }
@@ -1,3 +1,4 @@
+import asyncio
 from pydantic import BaseModel
 from typing import Optional, Dict, Any
 from models.chat_model import ChatModel
@@ -17,10 +18,13 @@ class ChatController:
         self.usuario_model = UsuarioModel()
         self.pessoa_model = PessoaModel()
     
-    def create_chat(self, chat_data: ChatCreate, usuario1: str) -> Dict[str, Any]:
+    async def create_chat(self, chat_data: ChatCreate, usuario1: str) -> Dict[str, Any]:
         """Criar novo chat"""
-        # Verificar se usuário1 existe
-        usuario1_result = self.usuario_model.find_by_nickname(usuario1)
+        # Verificar se ambos os usuários existem (consultas em paralelo)
+        usuario1_result, usuario2_result = await asyncio.gather(
+            self.usuario_model.find_by_nickname(usuario1),
+            self.usuario_model.find_by_nickname(chat_data.usuario2)
+        )
         if not usuario1_result["success"]:
             return {
                 "success": False,
@@ -28,8 +32,6 @@ class ChatController:
                 "status_code": 404
             }
         
-        # Verificar se usuário2 existe
-        usuario2_result = self.usuario_model.find_by_nickname(chat_data.usuario2)
         if not usuario2_result["success"]:
             return {
                 "success": False,
@@ -46,7 +48,7 @@ class ChatController:
             }
         
         # Verificar se chat já existe
-        existing = self.model.find_by_usuarios(usuario1, chat_data.usuario2)
+        existing = await self.model.find_by_usuarios(usuario1, chat_data.usuario2)
         if existing["success"]:
             return {
                 "success": False,
@@ -61,35 +63,35 @@ class ChatController:
             "usuario2": usuarios_ordenados[1]
         }
         
-        result = self.model.create(chat_dict)
+        result = await self.model.create(chat_dict)
         
         if not result["success"]:
             result["status_code"] = 400
         
         return result
     
-    def get_chat_by_usuarios(self, usuario1: str, usuario2: str) -> Dict[str, Any]:
+    async def get_chat_by_usuarios(self, usuario1: str, usuario2: str) -> Dict[str, Any]:
         """Buscar chat entre dois usuários"""
-        result = self.model.find_by_usuarios(usuario1, usuario2)
+        result = await self.model.find_by_usuarios(usuario1, usuario2)
         
         if not result["success"]:
             result["status_code"] = 404
         
         return result
     
-    def get_chats_by_usuario(self, usuario: str, limit: Optional[int] = None) -> Dict[str, Any]:
+    async def get_chats_by_usuario(self, usuario: str, limit: Optional[int] = None) -> Dict[str, Any]:
         """Buscar todos os chats de um usuário"""
-        result = self.model.find_by_usuario(usuario, limit)
+        result = await self.model.find_by_usuario(usuario, limit)
         
         if not result["success"]:
             result["status_code"] = 500
         
         return result
     
-    def delete_chat(self, usuario1: str, usuario2: str) -> Dict[str, Any]:
+    async def delete_chat(self, usuario1: str, usuario2: str) -> Dict[str, Any]:
         """Deletar chat"""
         # Verificar se chat existe
-        existing = self.model.find_by_usuarios(usuario1, usuario2)
+        existing = await self.model.find_by_usuarios(usuario1, usuario2)
         if not existing["success"]:
             return {
                 "success": False,
@@ -97,7 +99,7 @@ class ChatController:
                 "status_code": 404
             }
         
-        result = self.model.delete(usuario1, usuario2)
+        result = await self.model.delete(usuario1, usuario2)
         
         if not result["success"]:
             result["status_code"] = 400
@@ -1,6 +1,6 @@
 from pydantic import BaseModel, validator
-from typing import Optional, Dict, Any
-from models.pessoa_model import PessoaModel
+from datetime import datetime
+from typing import Optional, Dict, Any, List
 from models.colecao_model import ColecaoModel
 from models.carta_model import CartaModel
 from models.usuario_model import UsuarioModel
@@ -15,6 +15,21 @@ class AdicionarCartaRequest(BaseModel):
             raise ValueError('Quantidade deve ser maior que 0')
         return v
 
+class ItemLoteRequest(BaseModel):
+    carta_id: str  # QRCode da carta
+    quantidade: Optional[int] = 1
+    scanned_at: Optional[datetime] = None  # Momento do scan no aparelho
+    client_id: Optional[str] = None  # Identificador do item na fila do app
+    
+    @validator('quantidade')
+    def validate_quantidade(cls, v):
+        if v < 1:
+            raise ValueError('Quantidade deve ser maior que 0')
+        return v
+
+# Máximo de itens aceitos em um lote
+MAX_ITENS_LOTE = 200
+
 class RemoverCartaRequest(BaseModel):
     carta_id: str  # QRCode da carta
     quantidade: Optional[int] = 1
@@ -29,7 +44,6 @@ class ColecaoController:
     def __init__(self):
         self.model = ColecaoModel()
         self.carta_model = CartaModel()
-        self.pessoa_model = PessoaModel()
         self.usuario_model = UsuarioModel()
     
     def _calculate_xp_by_rarity(self, raridade: str) -> int:
@@ -43,120 +57,171 @@ class ColecaoController:
         }
         return xp_values.get(raridade.lower(), 10)
     
-    def get_minha_colecao(self, current_user) -> Dict[str, Any]:
+    async def get_minha_colecao(self, current_user) -> Dict[str, Any]:
         """Buscar coleção do usuário"""
-        # Buscar nickname do usuário pelo email
-        pessoa_result = self.pessoa_model.find_by_email(current_user.email)
-        if not pessoa_result["success"]:
-            return {
-                "success": False,
-                "error": "Usuário não encontrado",
-                "status_code": 404
-            }
-        
-        nickname = pessoa_result["data"]["nickname"]
-        result = self.model.get_colecao_usuario(nickname)
+        nickname = current_user.nickname
+        result = await self.model.get_colecao_usuario(nickname)
         
         if not result["success"]:
             result["status_code"] = 500
         
         return result
     
-    def adicionar_carta(self, current_user, request: AdicionarCartaRequest) -> Dict[str, Any]:
+    async def adicionar_carta(self, current_user, request: AdicionarCartaRequest) -> Dict[str, Any]:
         """Adicionar carta à coleção do usuário"""
         try:
-            print(f"DEBUG: Recebendo request para adicionar carta")
-            print(f"DEBUG: current_user = {current_user}")
-            print(f"DEBUG: request.carta_id = {request.carta_id}")
-            print(f"DEBUG: request.quantidade = {request.quantidade}")
+            nickname = current_user.nickname
             
-            # Buscar nickname do usuário pelo email
-            pessoa_result = self.pessoa_model.find_by_email(current_user.email)
-            print(f"DEBUG: pessoa_result = {pessoa_result}")
-            
-            if not pessoa_result["success"]:
+            # Validação e raridade vêm do catálogo em memória
+            carta_result = await self.carta_model.find_by_qrcode(request.carta_id)
+            if not carta_result["success"]:
                 return {
                     "success": False,
-                    "error": "Usuário não encontrado",
+                    "error": "Carta não encontrada",
                     "status_code": 404
                 }
             
-            nickname = pessoa_result["data"]["nickname"]
-            print(f"DEBUG: nickname encontrado = {nickname}")
+            raridade = carta_result["data"].get("raridade", "comum")
+            xp_carta = self._calculate_xp_by_rarity(raridade)
+            
+            # Coleta, contador, XP, nível e ranking numa única ida ao banco
+            result = await self.model.coletar_carta(nickname, request.carta_id, request.quantidade, xp_carta)
+            if not result["success"]:
+                result["status_code"] = 400
+                return result
             
-            # Verificar se a carta existe
-            carta_result = self.carta_model.find_by_qrcode(request.carta_id)
-            print(f"DEBUG: carta_result = {carta_result}")
+            estado = result["data"]
+            response = {
+                "success": True,
+                "data": {
+                    "usuario": estado["usuario"],
+                    "qrcode": estado["qrcode"],
+                    "quantidade": estado["quantidade"]
+                },
+                "missoes_concluidas": estado.get("missoes_concluidas", [])
+            }
             
-            if not carta_result["success"]:
+            # XP só é concedido na primeira coleta da carta
+            if estado["nova"]:
+                response["xp_info"] = {
+                    "xp_ganho": estado["xp_ganho"],
+                    "xp_total": estado["xp"],
+                    "nivel_atual": estado["nivel"],
+                    "ranking": estado["ranking"],
+                    "level_up": estado["nivel"] > estado["nivel_anterior"],
+                    "raridade": raridade
+                }
+            
+            return response
+            
+        except Exception as e:
+            print(f"ERROR: Erro inesperado em adicionar_carta: {str(e)}")
+            import traceback
+            traceback.print_exc()
+            return {
+                "success": False,
+                "error": f"Erro interno: {str(e)}",
+                "status_code": 500
+            }
+    
+    async def adicionar_cartas_lote(self, current_user, itens: List[ItemLoteRequest]) -> Dict[str, Any]:
+        """Adicionar um lote de cartas escaneadas offline à coleção do usuário"""
+        try:
+            if not itens:
+                return {"success": False, "error": "Lote vazio", "status_code": 400}
+            if len(itens) > MAX_ITENS_LOTE:
                 return {
                     "success": False,
-                    "error": "Carta não encontrada",
-                    "status_code": 404
+                    "error": f"Lote excede o máximo de {MAX_ITENS_LOTE} itens",
+                    "status_code": 400
                 }
             
-            # Verificar se o usuário já possui esta carta
-            carta_existente = self.model.get_carta_usuario(nickname, request.carta_id)
-            is_new_card = not carta_existente["success"]
+            nickname = current_user.nickname
             
-            result = self.model.adicionar_carta(nickname, request.carta_id, request.quantidade)
-            print(f"DEBUG: result adicionar_carta = {result}")
+            # Validar todos os QRCodes contra o catálogo em memória
+            raridades = {}
+            for item in itens:
+                if item.carta_id not in raridades:
+                    carta_result = await self.carta_model.find_by_qrcode(item.carta_id)
+                    raridades[item.carta_id] = (
+                        carta_result["data"].get("raridade", "comum") if carta_result["success"] else None
+                    )
             
-            if not result["success"]:
-                result["status_code"] = 400
-                return result
+            validos = [item for item in itens if raridades[item.carta_id] is not None]
+            gravadas = {}
+            usuario = None
+            missoes_concluidas = []
             
-            # Se é uma carta nova, adicionar XP baseado na raridade
-            if is_new_card:
-                carta_data = carta_result["data"]
-                raridade = carta_data.get("raridade", "comum")
-                xp_ganho = self._calculate_xp_by_rarity(raridade)
-                
-                print(f"DEBUG: Carta nova coletada! Raridade: {raridade}, XP: {xp_ganho}")
-                
-                # Verificar se o usuário existe na tabela usuario
-                usuario_result = self.usuario_model.find_by_nickname(nickname)
-                if usuario_result["success"]:
-                    # Adicionar XP ao usuário
-                    current_xp = usuario_result["data"].get("xp", 0)
-                    current_level = usuario_result["data"].get("nivel", 1)
-                    current_qtdcartas = usuario_result["data"].get("qtdcartas", 0)
-                    
-                    new_xp = current_xp + xp_ganho
-                    new_level = (new_xp // 1000) + 1
-                    new_qtdcartas = current_qtdcartas + 1
-                    
-                    # Determinar novo ranking baseado no nível
-                    new_ranking = self._calculate_ranking(new_level, new_xp)
-                    
-                    # Atualizar dados do usuário
-                    update_data = {
-                        "xp": new_xp,
-                        "nivel": new_level,
-                        "ranking": new_ranking,
-                        "qtdcartas": new_qtdcartas
+            if validos:
+                result = await self.model.coletar_cartas_lote(nickname, [
+                    {
+                        "qrcode": item.carta_id,
+                        "quantidade": item.quantidade,
+                        "xp": self._calculate_xp_by_rarity(raridades[item.carta_id])
                     }
-                    
-                    update_result = self.usuario_model.update(nickname, update_data)
-                    print(f"DEBUG: update_result usuario = {update_result}")
-                    
-                    if update_result["success"]:
-                        level_up = new_level > current_level
-                        result["xp_info"] = {
-                            "xp_ganho": xp_ganho,
-                            "xp_total": new_xp,
-                            "nivel_atual": new_level,
-                            "ranking": new_ranking,
-                            "level_up": level_up,
-                            "raridade": raridade
-                        }
+                    for item in validos
+                ])
+                if not result["success"]:
+                    result["status_code"] = 400
+                    return result
+                gravadas = {g["qrcode"]: g for g in result["data"]["itens"]}
+                usuario = result["data"]["usuario"]
+                missoes_concluidas = result["data"].get("missoes_concluidas", [])
+            
+            # Resultado por item, na ordem dos scans; o XP de uma carta nova
+            # vai para o primeiro scan dela no lote
+            ordem = sorted(
+                range(len(itens)),
+                key=lambda i: (
+                    itens[i].scanned_at is None,
+                    itens[i].scanned_at.timestamp() if itens[i].scanned_at else 0,
+                    i
+                )
+            )
+            resultados = [None] * len(itens)
+            creditadas = set()
+            for i in ordem:
+                item = itens[i]
+                resultado = {"client_id": item.client_id, "carta_id": item.carta_id}
+                gravada = gravadas.get(item.carta_id)
+                if gravada is None:
+                    resultado.update({"success": False, "error": "Carta não encontrada"})
                 else:
-                    print(f"DEBUG: Usuário {nickname} não encontrado na tabela usuario, XP não adicionado")
+                    nova = gravada["nova"] and item.carta_id not in creditadas
+                    if nova:
+                        creditadas.add(item.carta_id)
+                    resultado.update({
+                        "success": True,
+                        "quantidade": gravada["quantidade"],
+                        "nova": nova,
+                        "xp_ganho": self._calculate_xp_by_rarity(raridades[item.carta_id]) if nova else 0
+                    })
+                resultados[i] = resultado
+            
+            response = {
+                "success": True,
+                "data": {
+                    "itens": resultados,
+                    "coletadas": sum(1 for r in resultados if r["success"]),
+                    "invalidas": sum(1 for r in resultados if not r["success"])
+                },
+                "missoes_concluidas": missoes_concluidas
+            }
+            
+            if usuario and usuario["xp_ganho"]:
+                response["xp_info"] = {
+                    "xp_ganho": usuario["xp_ganho"],
+                    "xp_total": usuario["xp"],
+                    "nivel_atual": usuario["nivel"],
+                    "ranking": usuario["ranking"],
+                    "level_up": usuario["nivel"] > usuario["nivel_anterior"],
+                    "cartas_novas": len(creditadas)
+                }
             
-            return result
+            return response
             
         except Exception as e:
-            print(f"ERROR: Erro inesperado em adicionar_carta: {str(e)}")
+            print(f"ERROR: Erro inesperado em adicionar_cartas_lote: {str(e)}")
             import traceback
             traceback.print_exc()
             return {
@@ -180,19 +245,10 @@ class ColecaoController:
         else:
             return "Iniciante"
     
-    def remover_carta(self, current_user, request: RemoverCartaRequest) -> Dict[str, Any]:
+    async def remover_carta(self, current_user, request: RemoverCartaRequest) -> Dict[str, Any]:
         """Remover carta da coleção do usuário"""
-        # Buscar nickname do usuário pelo email
-        pessoa_result = self.pessoa_model.find_by_email(current_user.email)
-        if not pessoa_result["success"]:
-            return {
-                "success": False,
-                "error": "Usuário não encontrado",
-                "status_code": 404
-            }
-        
-        nickname = pessoa_result["data"]["nickname"]
-        result = self.model.remover_carta(nickname, request.carta_id, request.quantidade)
+        nickname = current_user.nickname
+        result = await self.model.remover_carta(nickname, request.carta_id, request.quantidade)
         
         if not result["success"]:
             if "não encontrada" in result["error"]:
@@ -202,38 +258,20 @@ class ColecaoController:
         
         return result
     
-    def get_estatisticas(self, current_user) -> Dict[str, Any]:
+    async def get_estatisticas(self, current_user) -> Dict[str, Any]:
         """Buscar estatísticas da coleção do usuário"""
-        # Buscar nickname do usuário pelo email
-        pessoa_result = self.pessoa_model.find_by_email(current_user.email)
-        if not pessoa_result["success"]:
-            return {
-                "success": False,
-                "error": "Usuário não encontrado",
-                "status_code": 404
-            }
-        
-        nickname = pessoa_result["data"]["nickname"]
-        result = self.model.get_estatisticas_colecao(nickname)
+        nickname = current_user.nickname
+        result = await self.model.get_estatisticas_colecao(nickname)
         
         if not result["success"]:
             result["status_code"] = 500
         
         return result
     
-    def verificar_carta(self, current_user, carta_id: str) -> Dict[str, Any]:
+    async def verificar_carta(self, current_user, carta_id: str) -> Dict[str, Any]:
         """Verificar se usuário possui uma carta específica"""
-        # Buscar nickname do usuário pelo email
-        pessoa_result = self.pessoa_model.find_by_email(current_user.email)
-        if not pessoa_result["success"]:
-            return {
-                "success": False,
-                "error": "Usuário não encontrado",
-                "status_code": 404
-            }
-        
-        nickname = pessoa_result["data"]["nickname"]
-        result = self.model.get_carta_usuario(nickname, carta_id)
+        nickname = current_user.nickname
+        result = await self.model.get_carta_usuario(nickname, carta_id)
         
         if not result["success"]:
             if "não encontrada" in result["error"]:
@@ -243,19 +281,10 @@ class ColecaoController:
         
         return result
     
-    def limpar_colecao(self, current_user) -> Dict[str, Any]:
+    async def limpar_colecao(self, current_user) -> Dict[str, Any]:
         """Limpar toda a coleção do usuário"""
-        # Buscar nickname do usuário pelo email
-        pessoa_result = self.pessoa_model.find_by_email(current_user.email)
-        if not pessoa_result["success"]:
-            return {
-                "success": False,
-                "error": "Usuário não encontrado",
-                "status_code": 404
-            }
-        
-        nickname = pessoa_result["data"]["nickname"]
-        result = self.model.limpar_colecao(nickname)
+        nickname = current_user.nickname
+        result = await self.model.limpar_colecao(nickname)
         
         if not result["success"]:
             result["status_code"] = 400
@@ -1,8 +1,13 @@
+import asyncio
+import base64
+import json
 from pydantic import BaseModel, EmailStr
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
+from datetime import datetime
 from models.mensagem_model import MensagemModel
 from models.usuario_model import UsuarioModel
 from models.pessoa_model import PessoaModel
+from services.catalog import card_catalog
 
 class MensagemCreate(BaseModel):
     remetente: str
@@ -25,16 +30,35 @@ class PessoaResponse(BaseModel):
     email: str
     tipo: str
 
+def codificar_cursor(mensagem: Dict[str, Any]) -> str:
+    """Cursor opaco com a posição (datahora, remetente) de uma mensagem"""
+    posicao = json.dumps([mensagem["datahora"], mensagem["remetente"]], separators=(",", ":"))
+    return base64.urlsafe_b64encode(posicao.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decodificar_cursor(cursor: str) -> Tuple[str, str]:
+    """Posição (datahora, remetente) de um cursor; ValueError se inválido"""
+    try:
+        posicao = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        datahora, remetente = posicao
+        return datetime.fromisoformat(datahora).isoformat(), str(remetente)
+    except Exception:
+        raise ValueError("Cursor inválido")
+
+
 class MensagemController:
     def __init__(self):
         self.model = MensagemModel()
         self.usuario_model = UsuarioModel()
         self.pessoa_model = PessoaModel()
     
-    def create_mensagem(self, mensagem_data: MensagemCreate, destinatario: str) -> Dict[str, Any]:
+    async def create_mensagem(self, mensagem_data: MensagemCreate, destinatario: str) -> Dict[str, Any]:
         """Criar uma nova mensagem"""
-        # Verificar se remetente existe
-        remetente_result = self.pessoa_model.find_by_nickname(mensagem_data.remetente)
+        # Verificar se remetente e destinatário existem (consultas em paralelo)
+        remetente_result, destinatario_result = await asyncio.gather(
+            self.pessoa_model.find_by_nickname(mensagem_data.remetente),
+            self.pessoa_model.find_by_nickname(destinatario)
+        )
         if not remetente_result["success"]:
             return {
                 "success": False,
@@ -42,8 +66,6 @@ class MensagemController:
                 "status_code": 404
             }
         
-        # Verificar se destinatário existe
-        destinatario_result = self.pessoa_model.find_by_nickname(destinatario)
         if not destinatario_result["success"]:
             return {
                 "success": False,
@@ -64,34 +86,34 @@ class MensagemController:
             "carta": mensagem_data.carta
         }
         
-        result = self.model.create(mensagem_dict)
+        result = await self.model.create(mensagem_dict)
         
         if not result["success"]:
             result["status_code"] = 400
         
         return result
     
-    def get_mensagens_by_destinatario(self, destinatario: str, limit: Optional[int] = None) -> Dict[str, Any]:
+    async def get_mensagens_by_destinatario(self, destinatario: str, limit: Optional[int] = None) -> Dict[str, Any]:
         """Buscar mensagens por destinatário"""
-        result = self.model.find_by_destinatario(destinatario, limit)
+        result = await self.model.find_by_destinatario(destinatario, limit)
         
         if not result["success"]:
             result["status_code"] = 500
         
         return result
     
-    def get_mensagens_by_remetente(self, remetente: str, limit: Optional[int] = None) -> Dict[str, Any]:
+    async def get_mensagens_by_remetente(self, remetente: str, limit: Optional[int] = None) -> Dict[str, Any]:
         """Buscar mensagens por remetente"""
-        result = self.model.find_by_remetente(remetente, limit)
+        result = await self.model.find_by_remetente(remetente, limit)
         
         if not result["success"]:
             result["status_code"] = 500
         
         return result
     
-    def get_conversa(self, usuario1: str, usuario2: str, limit: Optional[int] = None) -> Dict[str, Any]:
+    async def get_conversa(self, usuario1: str, usuario2: str, limit: Optional[int] = None) -> Dict[str, Any]:
         """Buscar conversa entre dois usuários"""
-        result = self.model.find_conversa(usuario1, usuario2, limit)
+        result = await self.model.find_conversa(usuario1, usuario2, limit)
         
         if not result["success"]:
             result["status_code"] = 500
@@ -107,12 +129,12 @@ class MensagemController:
         
         return result
     
-    def get_all_pessoas(self, limit: Optional[int] = None, tipo: Optional[str] = None) -> Dict[str, Any]:
+    async def get_all_pessoas(self, limit: Optional[int] = None, tipo: Optional[str] = None) -> Dict[str, Any]:
         """Buscar todas as pessoas com filtros opcionais"""
         if tipo:
             result = self.model.find_by_tipo(tipo)
         else:
-            result = self.model.find_all(limit)
+            result = await self.model.find_all(limit)
         
         if not result["success"]:
             result["status_code"] = 500
@@ -157,7 +179,7 @@ class MensagemController:
         
         return result
     
-    def delete_pessoa(self, nickname: str) -> Dict[str, Any]:
+    async def delete_pessoa(self, nickname: str) -> Dict[str, Any]:
         """Deletar pessoa"""
         # Verificar se pessoa existe
         existing = self.model.find_by_nickname(nickname)
@@ -168,53 +190,101 @@ class MensagemController:
                 "status_code": 404
             }
         
-        result = self.model.delete(nickname)
+        result = await self.model.delete(nickname)
         
         if not result["success"]:
             result["status_code"] = 400
         
         return result
     
-    def get_chat_messages(self, usuario1: str, usuario2: str) -> Dict[str, Any]:
-        """Buscar mensagens do chat entre dois usuários"""
-        return self.model.get_chat_messages(usuario1, usuario2)
+    async def get_chat_messages(self, usuario1: str, usuario2: str, limit: int = 50,
+                                antes: Optional[str] = None, depois: Optional[str] = None) -> Dict[str, Any]:
+        """Buscar uma página de mensagens do chat entre dois usuários (mais novas primeiro)"""
+        if antes and depois:
+            return {"success": False, "error": "Use apenas um dos cursores: antes ou depois", "status_code": 400}
+        try:
+            cursor_antes = decodificar_cursor(antes) if antes else None
+            cursor_depois = decodificar_cursor(depois) if depois else None
+        except ValueError as e:
+            return {"success": False, "error": str(e), "status_code": 400}
+        
+        # O remetente do cursor só pode ser um dos dois participantes do chat
+        for cursor in (cursor_antes, cursor_depois):
+            if cursor and cursor[1] not in (usuario1, usuario2):
+                return {"success": False, "error": "Cursor inválido", "status_code": 400}
+        
+        result = await self.model.get_chat_messages(usuario1, usuario2, limit, cursor_antes, cursor_depois)
+        if not result["success"]:
+            result["status_code"] = 500
+            return result
+        
+        mensagens = result["data"]
+        # Páginas mais antigas partem da última mensagem; polling de novas, da primeira
+        tem_antigas = result["tem_mais"] if not depois else bool(mensagens)
+        return {
+            "success": True,
+            "data": mensagens,
+            "cursores": {
+                "antes": codificar_cursor(mensagens[-1]) if mensagens and tem_antigas else None,
+                "depois": codificar_cursor(mensagens[0]) if mensagens else depois
+            },
+            "tem_mais": result["tem_mais"],
+            "cartas": result["cartas"],
+            "trocas": result["trocas"]
+        }
     
-    def send_message(self, remetente: str, destinatario: str, texto: str, 
+    async def send_message(self, remetente: str, destinatario: str, texto: str, 
                     tipo: str = "texto", carta: str = None) -> Dict[str, Any]:
         """Enviar mensagem"""
-        return self.model.send_message(remetente, destinatario, texto, tipo, carta)
+        return await self.model.send_message(remetente, destinatario, texto, tipo, carta)
     
-    def get_user_chats(self, usuario: str) -> Dict[str, Any]:
+    async def get_user_chats(self, usuario: str, limit: int = 50, offset: int = 0) -> Dict[str, Any]:
         """Buscar lista de chats do usuário"""
-        return self.model.get_user_chats(usuario)
+        result = await self.model.get_user_chats(usuario, limit, offset)
+        
+        if not result["success"]:
+            result["status_code"] = 500
+        
+        return result
     
-    def send_card_message(self, remetente: str, destinatario: str, qrcode: str) -> Dict[str, Any]:
+    async def marcar_como_lidas(self, usuario: str, contato: str) -> Dict[str, Any]:
+        """Marcar conversa como lida"""
+        result = await self.model.marcar_como_lidas(usuario, contato)
+        
+        if not result["success"]:
+            result["status_code"] = 500
+        
+        return result
+    
+    async def get_nao_lidas_total(self, usuario: str) -> Dict[str, Any]:
+        """Buscar total de mensagens não lidas"""
+        result = await self.model.get_nao_lidas_total(usuario)
+        
+        if not result["success"]:
+            result["status_code"] = 500
+        
+        return result
+    
+    async def send_card_message(self, remetente: str, destinatario: str, qrcode: str) -> Dict[str, Any]:
         """Enviar uma carta como mensagem"""
         try:
-            # Verificar se o usuário possui a carta
-            coleta_check = (self.model.db.table("coleta")
-                          .select("quantidade")
-                          .eq("usuario", remetente)
-                          .eq("qrcode", qrcode)
-                          .execute())
+            # Carta vem do catálogo em memória; só a posse vai ao banco
+            carta = await card_catalog.get(qrcode)
+            if not carta:
+                return {"success": False, "error": "Carta não encontrada"}
+            
+            coleta_check = await (self.model.db.table("coleta")
+                                  .select("quantidade")
+                                  .eq("usuario", remetente)
+                                  .eq("qrcode", qrcode)
+                                  .execute())
             
             if not coleta_check.data or coleta_check.data[0]["quantidade"] < 1:
                 return {"success": False, "error": "Você não possui esta carta"}
             
-            # Buscar informações da carta
-            carta_info = (self.model.db.table("carta")
-                         .select("*")
-                         .eq("qrcode", qrcode)
-                         .single()
-                         .execute())
-            
-            if not carta_info.data:
-                return {"success": False, "error": "Carta não encontrada"}
-            
-            carta = carta_info.data
             texto = f"🎴 Compartilhou a carta: {carta.get('nome', qrcode)}"
             
-            return self.model.send_message(
+            return await self.model.send_message(
                 remetente=remetente,
                 destinatario=destinatario,
                 texto=texto,
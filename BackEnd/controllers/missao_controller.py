@@ -2,6 +2,7 @@ from pydantic import BaseModel
 from typing import Optional, Dict, Any
 from datetime import datetime
 from models.missao_model import MissaoModel
+from services.progresso_missoes import progresso_missoes
 
 class MissaoCreate(BaseModel):
     DataFim: Optional[datetime] = None
@@ -24,30 +25,44 @@ class MissaoController:
     def __init__(self):
         self.model = MissaoModel()
     
-    def create_missao(self, data: MissaoCreate) -> Dict[str, Any]:
+    async def create_missao(self, data: MissaoCreate) -> Dict[str, Any]:
         """Criar nova missão"""
-        result = self.model.create(data)
+        result = await self.model.create(data)
         if not result["success"]:
             result["status_code"] = 400
         return result
 
-    def get_missao_by_codigo(self, codigo: int) -> Dict[str, Any]:
+    async def get_missao_by_codigo(self, codigo: int) -> Dict[str, Any]:
         """Buscar missão por código"""
-        result = self.model.find_by_codigo(codigo)
+        result = await self.model.find_by_codigo(codigo)
         if not result["success"]:
             result["status_code"] = 404
         return result
 
-    def get_all_missoes(self) -> Dict[str, Any]:
+    async def get_progresso(self, nickname: str, incluir_encerradas: bool = False) -> Dict[str, Any]:
+        """Progresso do usuário nas missões ativas (contadores de participação)"""
+        try:
+            data = await progresso_missoes.get_progresso(nickname, incluir_encerradas)
+        except Exception as e:
+            print(f"ERROR MissaoController: {str(e)}")
+            return {"success": False, "error": str(e), "status_code": 500}
+        return {
+            "success": True,
+            "data": data,
+            "total": len(data),
+            "concluidas": sum(1 for m in data if m["concluida"])
+        }
+
+    async def get_all_missoes(self) -> Dict[str, Any]:
         """Buscar todas as missões"""
-        result = self.model.find_all()
+        result = await self.model.find_all()
         if not result["success"]:
             result["status_code"] = 500
         return result
 
-    def update_missao(self, codigo: int, update_data: MissaoUpdate) -> Dict[str, Any]:
+    async def update_missao(self, codigo: int, update_data: MissaoUpdate) -> Dict[str, Any]:
         """Atualizar missão"""
-        existing = self.model.find_by_codigo(codigo)
+        existing = await self.model.find_by_codigo(codigo)
         if not existing["success"]:
             return {
                 "success": False,
@@ -63,15 +78,15 @@ class MissaoController:
                 "status_code": 400
             }
 
-        result = self.model.update(codigo, update_dict)
+        result = await self.model.update(codigo, update_dict)
         if not result["success"]:
             result["status_code"] = 400
 
         return result
 
-    def delete_missao(self, codigo: int) -> Dict[str, Any]:
+    async def delete_missao(self, codigo: int) -> Dict[str, Any]:
         """Deletar missão"""
-        existing = self.model.find_by_codigo(codigo)
+        existing = await self.model.find_by_codigo(codigo)
         if not existing["success"]:
             return {
                 "success": False,
@@ -79,7 +94,7 @@ class MissaoController:
                 "status_code": 404
             }
 
-        result = self.model.delete(codigo)
+        result = await self.model.delete(codigo)
         if not result["success"]:
             result["status_code"] = 400
         return result
@@ -17,10 +17,10 @@ class MissaoQtdController:
     def __init__(self):
         self.model = MissaoQtdModel()
     
-    def create_missaoqtd(self, missaoqtd_data: MissaoQtdCreate) -> Dict[str, Any]:
+    async def create_missaoqtd(self, missaoqtd_data: MissaoQtdCreate) -> Dict[str, Any]:
         """Criar uma nova MissaoQtd"""
         # Verificar se já existe MissaoQtd para o Código
-        existing = self.model.find_by_codigo(missaoqtd_data.Codigo)
+        existing = await self.model.find_by_codigo(missaoqtd_data.Codigo)
         if existing["success"]:
             return {
                 "success": False,
@@ -28,35 +28,35 @@ class MissaoQtdController:
                 "status_code": 400
             }
         
-        result = self.model.create(missaoqtd_data.dict())
+        result = await self.model.create(missaoqtd_data.dict())
 
         if not result["success"]:
             result["status_code"] = 400
         
         return result
 
-    def get_missaoqtd_by_codigo(self, codigo: int) -> Dict[str, Any]:
+    async def get_missaoqtd_by_codigo(self, codigo: int) -> Dict[str, Any]:
         """Buscar MissaoQtd por Código"""
-        result = self.model.find_by_codigo(codigo)
+        result = await self.model.find_by_codigo(codigo)
         
         if not result["success"]:
             result["status_code"] = 404
         
         return result
 
-    def get_all_missaoqtd(self, limit: Optional[int] = None) -> Dict[str, Any]:
+    async def get_all_missaoqtd(self, limit: Optional[int] = None) -> Dict[str, Any]:
         """Buscar todas as MissaoQtd"""
-        result = self.model.find_all(limit)
+        result = await self.model.find_all(limit)
         
         if not result["success"]:
             result["status_code"] = 500
         
         return result
 
-    def update_missaoqtd(self, codigo: int, update_data: MissaoQtdUpdate) -> Dict[str, Any]:
+    async def update_missaoqtd(self, codigo: int, update_data: MissaoQtdUpdate) -> Dict[str, Any]:
         """Atualizar MissaoQtd"""
         # Verificar se MissaoQtd existe
-        existing = self.model.find_by_codigo(codigo)
+        existing = await self.model.find_by_codigo(codigo)
         if not existing["success"]:
             return {
                 "success": False,
@@ -74,17 +74,17 @@ class MissaoQtdController:
                 "status_code": 400
             }
         
-        result = self.model.update(codigo, update_dict)
+        result = await self.model.update(codigo, update_dict)
 
         if not result["success"]:
             result["status_code"] = 400
 
         return result
 
-    def delete_missaoqtd(self, codigo: int) -> Dict[str, Any]:
+    async def delete_missaoqtd(self, codigo: int) -> Dict[str, Any]:
         """Deletar MissaoQtd"""
         # Verificar se existe
-        existing = self.model.find_by_codigo(codigo)
+        existing = await self.model.find_by_codigo(codigo)
         if not existing["success"]:
             return {
                 "success": False,
@@ -92,7 +92,7 @@ class MissaoQtdController:
                 "status_code": 404
             }
 
-        result = self.model.delete(codigo)
+        result = await self.model.delete(codigo)
 
         if not result["success"]:
             result["status_code"] = 400
@@ -19,9 +19,9 @@ class ParticipaQuantidadeController:
     def __init__(self):
         self.model = ParticipaQuantidadeModel()
     
-    def create_participacao(self, data: ParticipaQuantidadeCreate) -> Dict[str, Any]:
+    async def create_participacao(self, data: ParticipaQuantidadeCreate) -> Dict[str, Any]:
         """Criar nova participação"""
-        existing = self.model.find_by_usuario_codigo(data.usuario, data.codigo)
+        existing = await self.model.find_by_usuario_codigo(data.usuario, data.codigo)
         if existing["success"]:
             return {
                 "success": False,
@@ -29,29 +29,29 @@ class ParticipaQuantidadeController:
                 "status_code": 400
             }
         
-        result = self.model.create(data.dict())
+        result = await self.model.create(data.dict())
         if not result["success"]:
             result["status_code"] = 400
         
         return result
 
-    def get_participacao(self, usuario: str, codigo: int) -> Dict[str, Any]:
+    async def get_participacao(self, usuario: str, codigo: int) -> Dict[str, Any]:
         """Buscar participação por chave primária composta"""
-        result = self.model.find_by_usuario_codigo(usuario, codigo)
+        result = await self.model.find_by_usuario_codigo(usuario, codigo)
         if not result["success"]:
             result["status_code"] = 404
         return result
 
-    def get_all_participacoes(self) -> Dict[str, Any]:
+    async def get_all_participacoes(self) -> Dict[str, Any]:
         """Buscar todas as participações"""
-        result = self.model.find_all()
+        result = await self.model.find_all()
         if not result["success"]:
             result["status_code"] = 500
         return result
 
-    def update_participacao(self, usuario: str, codigo: int, update_data: ParticipaQuantidadeUpdate) -> Dict[str, Any]:
+    async def update_participacao(self, usuario: str, codigo: int, update_data: ParticipaQuantidadeUpdate) -> Dict[str, Any]:
         """Atualizar participação"""
-        existing = self.model.find_by_usuario_codigo(usuario, codigo)
+        existing = await self.model.find_by_usuario_codigo(usuario, codigo)
         if not existing["success"]:
             return {
                 "success": False,
@@ -67,15 +67,15 @@ class ParticipaQuantidadeController:
                 "status_code": 400
             }
 
-        result = self.model.update(usuario, codigo, update_dict)
+        result = await self.model.update(usuario, codigo, update_dict)
         if not result["success"]:
             result["status_code"] = 400
 
         return result
 
-    def delete_participacao(self, usuario: str, codigo: int) -> Dict[str, Any]:
+    async def delete_participacao(self, usuario: str, codigo: int) -> Dict[str, Any]:
         """Deletar participação"""
-        existing = self.model.find_by_usuario_codigo(usuario, codigo)
+        existing = await self.model.find_by_usuario_codigo(usuario, codigo)
         if not existing["success"]:
             return {
                 "success": False,
@@ -83,7 +83,7 @@ class ParticipaQuantidadeController:
                 "status_code": 404
             }
 
-        result = self.model.delete(usuario, codigo)
+        result = await self.model.delete(usuario, codigo)
         if not result["success"]:
             result["status_code"] = 400
         return result
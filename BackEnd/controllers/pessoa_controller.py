@@ -20,7 +20,7 @@ class PessoaController:
     def __init__(self):
         self.model = PessoaModel()
     
-    def create_pessoa(self, pessoa_data: PessoaCreate) -> Dict[str, Any]:
+    async def create_pessoa(self, pessoa_data: PessoaCreate) -> Dict[str, Any]:
         """Criar uma nova pessoa"""
         # Validar tipo
         valid_tipos = ["usuario", "educador"]
@@ -32,7 +32,7 @@ class PessoaController:
             }
         
         # Verificar se nickname já existe
-        existing = self.model.find_by_nickname(pessoa_data.nickname)
+        existing = await self.model.find_by_nickname(pessoa_data.nickname)
         if existing["success"]:
             return {
                 "success": False,
@@ -41,7 +41,7 @@ class PessoaController:
             }
         
         # Verificar se email já existe
-        existing_email = self.model.find_by_email(pessoa_data.email)
+        existing_email = await self.model.find_by_email(pessoa_data.email)
         if existing_email["success"]:
             return {
                 "success": False,
@@ -50,38 +50,38 @@ class PessoaController:
             }
         
         # Criar pessoa
-        result = self.model.create(pessoa_data.dict())
+        result = await self.model.create(pessoa_data.dict())
         
         if not result["success"]:
             result["status_code"] = 400
         
         return result
     
-    def get_pessoa_by_nickname(self, nickname: str) -> Dict[str, Any]:
+    async def get_pessoa_by_nickname(self, nickname: str) -> Dict[str, Any]:
         """Buscar pessoa por nickname"""
-        result = self.model.find_by_nickname(nickname)
+        result = await self.model.find_by_nickname(nickname)
         
         if not result["success"]:
             result["status_code"] = 404
         
         return result
     
-    def get_all_pessoas(self, limit: Optional[int] = None, tipo: Optional[str] = None) -> Dict[str, Any]:
+    async def get_all_pessoas(self, limit: Optional[int] = None, tipo: Optional[str] = None) -> Dict[str, Any]:
         """Buscar todas as pessoas com filtros opcionais"""
         if tipo:
-            result = self.model.find_by_tipo(tipo)
+            result = await self.model.find_by_tipo(tipo)
         else:
-            result = self.model.find_all(limit)
+            result = await self.model.find_all(limit)
         
         if not result["success"]:
             result["status_code"] = 500
         
         return result
     
-    def update_pessoa(self, nickname: str, update_data: PessoaUpdate) -> Dict[str, Any]:
+    async def update_pessoa(self, nickname: str, update_data: PessoaUpdate) -> Dict[str, Any]:
         """Atualizar pessoa"""
         # Verificar se pessoa existe
-        existing = self.model.find_by_nickname(nickname)
+        existing = await self.model.find_by_nickname(nickname)
         if not existing["success"]:
             return {
                 "success": False,
@@ -101,7 +101,7 @@ class PessoaController:
         
         # Verificar se email já existe (se está sendo atualizado)
         if "email" in update_dict:
-            existing_email = self.model.find_by_email(update_dict["email"])
+            existing_email = await self.model.find_by_email(update_dict["email"])
             if existing_email["success"] and existing_email["data"]["nickname"] != nickname:
                 return {
                     "success": False,
@@ -109,17 +109,17 @@ class PessoaController:
                     "status_code": 400
                 }
         
-        result = self.model.update(nickname, update_dict)
+        result = await self.model.update(nickname, update_dict)
         
         if not result["success"]:
             result["status_code"] = 400
         
         return result
     
-    def delete_pessoa(self, nickname: str) -> Dict[str, Any]:
+    async def delete_pessoa(self, nickname: str) -> Dict[str, Any]:
         """Deletar pessoa"""
         # Verificar se pessoa existe
-        existing = self.model.find_by_nickname(nickname)
+        existing = await self.model.find_by_nickname(nickname)
         if not existing["success"]:
             return {
                 "success": False,
@@ -127,7 +127,7 @@ class PessoaController:
                 "status_code": 404
             }
         
-        result = self.model.delete(nickname)
+        result = await self.model.delete(nickname)
         
         if not result["success"]:
             result["status_code"] = 400
@@ -1,11 +1,17 @@
-from pydantic import BaseModel
-from typing import Optional, Dict, Any
+import asyncio
+from pydantic import BaseModel, validator
+from typing import Optional, Dict, Any, List
 import base64
 import uuid
 from models.usuario_model import UsuarioModel
 from models.pessoa_model import PessoaModel
 from models.colecao_model import ColecaoModel
-from config.database import get_database
+from models.amizade_model import AmizadeModel
+from models.xp_evento_model import XpEventoModel, ORIGENS_XP
+from services.cache import TTLCache
+from config.database import get_async_database
+from services.rank_index import rank_index
+from services.leaderboard import leaderboard, numerar_posicoes, LEADERBOARD_SIZE, LEADERBOARD_REFRESH_SECONDS
 
 class UsuarioCreate(BaseModel):
     nickname: str
@@ -30,11 +36,54 @@ class UsuarioResponse(BaseModel):
     fotoperfil: Optional[str] = None
     nivel: int
 
+# Maior XP concedido numa única operação (uma missão de evento vale 300)
+XP_MAXIMO_CONCESSAO = 10000
+
+def validar_xp_amount(v: int) -> int:
+    if v <= 0 or v > XP_MAXIMO_CONCESSAO:
+        raise ValueError(f'xp_amount deve estar entre 1 e {XP_MAXIMO_CONCESSAO}')
+    return v
+
 class PhotoUploadRequest(BaseModel):
     photo_data: str  # Base64 encoded image data
     
 class XpRequest(BaseModel):
     xp_amount: int
+    origem: str = "manual"  # coleta, missao, troca ou manual
+    referencia: Optional[str] = None  # QRCode, código da missão, id da troca...
+    
+    _validar_xp_amount = validator('xp_amount', allow_reuse=True)(validar_xp_amount)
+    
+    @validator('origem')
+    def validate_origem(cls, v):
+        if v not in ORIGENS_XP:
+            raise ValueError(f'Origem deve ser uma de: {", ".join(ORIGENS_XP)}')
+        return v
+
+class XpLoteItem(BaseModel):
+    nickname: str
+    xp_amount: int
+    
+    _validar_xp_amount = validator('xp_amount', allow_reuse=True)(validar_xp_amount)
+
+class XpLoteRequest(BaseModel):
+    itens: List[XpLoteItem]
+    origem: str = "manual"
+    referencia: Optional[str] = None
+    
+    @validator('itens')
+    def validate_itens(cls, v):
+        if not v:
+            raise ValueError('Informe ao menos um usuário')
+        if len(v) > 500:
+            raise ValueError('Máximo de 500 usuários por lote')
+        return v
+    
+    @validator('origem')
+    def validate_origem(cls, v):
+        if v not in ORIGENS_XP:
+            raise ValueError(f'Origem deve ser uma de: {", ".join(ORIGENS_XP)}')
+        return v
 
 class ProfileStatsResponse(BaseModel):
     nickname: str
@@ -51,12 +100,15 @@ class UsuarioController:
         self.model = UsuarioModel()
         self.pessoa_model = PessoaModel()
         self.colecao_model = ColecaoModel()
-        self.db = get_database()
+        self.amizade_model = AmizadeModel()
+        self.db = get_async_database()
+        self.xp_evento_model = XpEventoModel()
+        self._rankings_janela = TTLCache(maxsize=256, ttl=LEADERBOARD_REFRESH_SECONDS)
     
-    def create_usuario(self, usuario_data: UsuarioCreate) -> Dict[str, Any]:
+    async def create_usuario(self, usuario_data: UsuarioCreate) -> Dict[str, Any]:
         """Criar um novo usuário"""
         # Verificar se pessoa existe
-        pessoa_result = self.pessoa_model.find_by_nickname(usuario_data.nickname)
+        pessoa_result = await self.pessoa_model.find_by_nickname(usuario_data.nickname)
         if not pessoa_result["success"]:
             return {
                 "success": False,
@@ -73,7 +125,7 @@ class UsuarioController:
             }
         
         # Verificar se usuário já existe
-        existing = self.model.find_by_nickname(usuario_data.nickname)
+        existing = await self.model.find_by_nickname(usuario_data.nickname)
         if existing["success"]:
             return {
                 "success": False,
@@ -82,35 +134,35 @@ class UsuarioController:
             }
         
         # Criar usuário
-        result = self.model.create(usuario_data.dict())
+        result = await self.model.create(usuario_data.dict())
         
         if not result["success"]:
             result["status_code"] = 400
         
         return result
     
-    def get_usuario_by_nickname(self, nickname: str) -> Dict[str, Any]:
+    async def get_usuario_by_nickname(self, nickname: str) -> Dict[str, Any]:
         """Buscar usuário por nickname"""
-        result = self.model.find_by_nickname(nickname)
+        result = await self.model.find_by_nickname(nickname)
         
         if not result["success"]:
             result["status_code"] = 404
         
         return result
     
-    def get_all_usuarios(self, limit: Optional[int] = None) -> Dict[str, Any]:
+    async def get_all_usuarios(self, limit: Optional[int] = None) -> Dict[str, Any]:
         """Buscar todos os usuários"""
-        result = self.model.find_all(limit)
+        result = await self.model.find_all(limit)
         
         if not result["success"]:
             result["status_code"] = 500
         
         return result
     
-    def update_usuario(self, nickname: str, update_data: UsuarioUpdate) -> Dict[str, Any]:
+    async def update_usuario(self, nickname: str, update_data: UsuarioUpdate) -> Dict[str, Any]:
         """Atualizar usuário"""
         # Verificar se usuário existe
-        existing = self.model.find_by_nickname(nickname)
+        existing = await self.model.find_by_nickname(nickname)
         if not existing["success"]:
             return {
                 "success": False,
@@ -128,17 +180,17 @@ class UsuarioController:
                 "status_code": 400
             }
         
-        result = self.model.update(nickname, update_dict)
+        result = await self.model.update(nickname, update_dict)
         
         if not result["success"]:
             result["status_code"] = 400
         
         return result
     
-    def delete_usuario(self, nickname: str) -> Dict[str, Any]:
+    async def delete_usuario(self, nickname: str) -> Dict[str, Any]:
         """Deletar usuário"""
         # Verificar se usuário existe
-        existing = self.model.find_by_nickname(nickname)
+        existing = await self.model.find_by_nickname(nickname)
         if not existing["success"]:
             return {
                 "success": False,
@@ -146,18 +198,18 @@ class UsuarioController:
                 "status_code": 404
             }
         
-        result = self.model.delete(nickname)
+        result = await self.model.delete(nickname)
         
         if not result["success"]:
             result["status_code"] = 400
         
         return result
     
-    def upload_profile_photo(self, nickname: str, photo_request: PhotoUploadRequest) -> Dict[str, Any]:
+    async def upload_profile_photo(self, nickname: str, photo_request: PhotoUploadRequest) -> Dict[str, Any]:
         """Upload de foto de perfil para o Supabase Storage"""
         try:
             # Verificar se usuário existe
-            user_result = self.model.find_by_nickname(nickname)
+            user_result = await self.model.find_by_nickname(nickname)
             if not user_result["success"]:
                 return {
                     "success": False,
@@ -184,7 +236,7 @@ class UsuarioController:
             data_url = f"data:image/jpeg;base64,{photo_request.photo_data}"
             
             # Atualizar URL da foto no perfil do usuário com data URL
-            update_result = self.model.update(nickname, {"fotoperfil": data_url})
+            update_result = await self.model.update(nickname, {"fotoperfil": data_url})
             
             if not update_result["success"]:
                 return {
@@ -293,60 +345,66 @@ class UsuarioController:
                 "status_code": 500
             }
     
-    def add_xp(self, nickname: str, xp_request: XpRequest) -> Dict[str, Any]:
+    async def add_xp(self, nickname: str, xp_request: XpRequest) -> Dict[str, Any]:
         """Adicionar XP ao usuário e calcular novo nível"""
         try:
-            # Verificar se usuário existe
-            user_result = self.model.find_by_nickname(nickname)
-            if not user_result["success"]:
+            # Incremento, nível, ranking e histórico numa única operação atômica no banco
+            result = await self.model.conceder_xp(
+                nickname, xp_request.xp_amount, xp_request.origem, xp_request.referencia
+            )
+            if not result["success"]:
+                nao_encontrado = "não encontrada" in result["error"]
                 return {
                     "success": False,
-                    "error": "Usuário não encontrado",
-                    "status_code": 404
+                    "error": "Usuário não encontrado" if nao_encontrado else "Erro ao atualizar XP do usuário",
+                    "status_code": 404 if nao_encontrado else 500
                 }
             
-            current_user = user_result["data"]
-            current_xp = current_user.get("xp", 0)
-            current_level = current_user.get("nivel", 1)
-            
-            # Calcular novo XP
-            new_xp = current_xp + xp_request.xp_amount
-            
-            # Calcular novo nível (exemplo: cada 1000 XP = 1 nível)
-            new_level = (new_xp // 1000) + 1
-            
-            # Determinar novo ranking baseado no nível
-            new_ranking = self._calculate_ranking(new_level, new_xp)
-            
-            # Atualizar dados do usuário
-            update_data = {
-                "xp": new_xp,
-                "nivel": new_level,
-                "ranking": new_ranking
+            return {
+                "success": True,
+                "data": self._xp_info(result["data"], xp_request.xp_amount)
             }
             
-            update_result = self.model.update(nickname, update_data)
+        except Exception as e:
+            return {
+                "success": False,
+                "error": f"Erro interno: {str(e)}",
+                "status_code": 500
+            }
+    
+    async def add_xp_lote(self, current_user, request: XpLoteRequest) -> Dict[str, Any]:
+        """Conceder XP a vários usuários de uma vez (ex.: educador premiando uma turma)"""
+        try:
+            if current_user.tipo.lower() != "educador":
+                return {
+                    "success": False,
+                    "error": "Apenas educadores podem conceder XP em lote",
+                    "status_code": 403
+                }
             
-            if not update_result["success"]:
+            quantidades: Dict[str, int] = {}
+            for item in request.itens:
+                quantidades[item.nickname] = quantidades.get(item.nickname, 0) + item.xp_amount
+            result = await self.model.conceder_xp_lote(
+                [{"usuario": item.nickname, "quantidade": item.xp_amount} for item in request.itens],
+                request.origem,
+                request.referencia
+            )
+            if not result["success"]:
                 return {
                     "success": False,
-                    "error": "Erro ao atualizar XP do usuário",
+                    "error": f"Erro ao conceder XP: {result['error']}",
                     "status_code": 500
                 }
             
-            level_up = new_level > current_level
-            
+            concedidos = {u["nickname"]: u for u in result["data"]}
             return {
                 "success": True,
-                "data": {
-                    "xp_anterior": current_xp,
-                    "xp_atual": new_xp,
-                    "xp_adicionado": xp_request.xp_amount,
-                    "nivel_anterior": current_level,
-                    "nivel_atual": new_level,
-                    "ranking": new_ranking,
-                    "level_up": level_up
-                }
+                "data": [
+                    self._xp_info(concedidos[nickname], quantidades[nickname])
+                    for nickname in sorted(concedidos)
+                ],
+                "nao_encontrados": sorted(set(quantidades) - set(concedidos))
             }
             
         except Exception as e:
@@ -356,11 +414,24 @@ class UsuarioController:
                 "status_code": 500
             }
     
-    def get_profile_stats(self, nickname: str) -> Dict[str, Any]:
+    def _xp_info(self, estado: Dict[str, Any], xp_adicionado: int) -> Dict[str, Any]:
+        """Resumo de uma concessão de XP a partir do estado devolvido pelo banco"""
+        return {
+            "nickname": estado["nickname"],
+            "xp_anterior": estado["xp_anterior"],
+            "xp_atual": estado["xp"],
+            "xp_adicionado": xp_adicionado,
+            "nivel_anterior": estado["nivel_anterior"],
+            "nivel_atual": estado["nivel"],
+            "ranking": estado["ranking"],
+            "level_up": estado["nivel"] > estado["nivel_anterior"]
+        }
+    
+    async def get_profile_stats(self, nickname: str) -> Dict[str, Any]:
         """Obter estatísticas completas do perfil do usuário"""
         try:
             # Buscar dados básicos do usuário
-            user_result = self.model.find_by_nickname(nickname)
+            user_result = await self.model.find_by_nickname(nickname)
             if not user_result["success"]:
                 return {
                     "success": False,
@@ -370,13 +441,13 @@ class UsuarioController:
             
             user_data = user_result["data"]
             
-            # Buscar estatísticas da coleção
-            colecao_result = self.colecao_model.get_colecao_usuario(nickname)
+            # Buscar coleção e posição no ranking em paralelo
+            colecao_result, ranking_position = await asyncio.gather(
+                self.colecao_model.get_colecao_usuario(nickname),
+                self._get_user_ranking_position(nickname, user_data.get("xp"))
+            )
             colecao_stats = self._calculate_collection_stats(colecao_result.get("data", []))
             
-            # Buscar posição no ranking
-            ranking_position = self._get_user_ranking_position(nickname)
-            
             # Construir resposta completa
             profile_stats = {
                 "nickname": user_data["nickname"],
@@ -387,6 +458,7 @@ class UsuarioController:
                 "fotoperfil": user_data.get("fotoperfil"),
                 "colecao_stats": colecao_stats,
                 "ranking_position": ranking_position,
+                "ranking_percentil": rank_index.percentile(nickname),
                 "xp_para_proximo_nivel": self._xp_for_next_level(user_data["xp"])
             }
             
@@ -402,24 +474,66 @@ class UsuarioController:
                 "status_code": 500
             }
     
-    def get_leaderboard(self, limit: int = 10) -> Dict[str, Any]:
-        """Obter ranking dos usuários por XP"""
+    async def get_leaderboard(self, limit: int = 10) -> Dict[str, Any]:
+        """Obter ranking dos usuários por XP (snapshot em memória do topo)"""
         try:
-            # Buscar todos os usuários ordenados por XP
-            result = self.db.table("usuario").select("nickname, ranking, xp, nivel, qtdcartas").order('xp', desc=True).limit(limit).execute()
+            snapshot = await leaderboard.get()
+            limit = min(limit, LEADERBOARD_SIZE)
             
-            if hasattr(result, 'error') and result.error:
-                raise Exception(f"Erro ao buscar ranking: {result.error}")
+            return {
+                "success": True,
+                "data": snapshot.top(limit),
+                "etag": snapshot.etag(limit)
+            }
             
-            # Adicionar posição no ranking
-            leaderboard = []
-            for i, user in enumerate(result.data, 1):
-                user["posicao"] = i
-                leaderboard.append(user)
+        except Exception as e:
+            return {
+                "success": False,
+                "error": f"Erro interno: {str(e)}",
+                "status_code": 500
+            }
+    
+    async def get_leaderboard_amigos(self, nickname: str) -> Dict[str, Any]:
+        """Ranking do usuário entre os amigos (amigos em cache + índice de XP em memória)"""
+        try:
+            amigos, _ = await asyncio.gather(
+                self.amizade_model.get_amigos_nicknames(nickname),
+                rank_index.ensure_loaded()
+            )
+            membros = set(amigos) | {nickname}
+            
+            # Usuários criados em outro worker desde a última reconstrução do índice
+            faltando = [m for m in membros if rank_index.xp(m) is None]
+            if faltando:
+                resultados = await asyncio.gather(*(self.model.find_by_nickname(m) for m in faltando))
+                for membro, resultado in zip(faltando, resultados):
+                    if resultado["success"]:
+                        rank_index.update(membro, resultado["data"].get("xp"))
+            
+            usuarios = []
+            for membro in membros:
+                xp = rank_index.xp(membro)
+                if xp is None:
+                    continue
+                nivel = (xp // 1000) + 1
+                usuarios.append({
+                    "nickname": membro,
+                    "xp": xp,
+                    "nivel": nivel,
+                    "ranking": self._calculate_ranking(nivel, xp)
+                })
+            usuarios.sort(key=lambda u: (-u["xp"], u["nickname"]))
+            numerar_posicoes(usuarios)
+            
+            minha_posicao = next((u["posicao"] for u in usuarios if u["nickname"] == nickname), None)
             
             return {
                 "success": True,
-                "data": leaderboard
+                "data": {
+                    "ranking": usuarios,
+                    "minha_posicao": minha_posicao,
+                    "total": len(usuarios)
+                }
             }
             
         except Exception as e:
@@ -429,6 +543,38 @@ class UsuarioController:
                 "status_code": 500
             }
     
+    async def get_leaderboard_janela(self, janela: str, limit: int = 10) -> Dict[str, Any]:
+        """Ranking do XP ganho no dia ou na semana corrente"""
+        return await self._ranking_rollup(
+            ("janela", janela, limit),
+            lambda: self.xp_evento_model.get_ranking_janela(janela, limit)
+        )
+    
+    async def get_leaderboard_missao(self, codigo: int, limit: int = 10) -> Dict[str, Any]:
+        """Ranking do XP ganho durante o período de uma missão"""
+        return await self._ranking_rollup(
+            ("missao", codigo, limit),
+            lambda: self.xp_evento_model.get_ranking_missao(codigo, limit)
+        )
+    
+    async def _ranking_rollup(self, chave, buscar) -> Dict[str, Any]:
+        """Ranking lido dos rollups de XP, guardado por LEADERBOARD_REFRESH_SECONDS"""
+        cached = self._rankings_janela.get(chave)
+        if cached is not None:
+            return {"success": True, "data": [dict(u) for u in cached]}
+        
+        result = await buscar()
+        if not result["success"]:
+            return {
+                "success": False,
+                "error": f"Erro ao buscar ranking: {result['error']}",
+                "status_code": 500
+            }
+        
+        usuarios = numerar_posicoes(result["data"])
+        self._rankings_janela.set(chave, usuarios)
+        return {"success": True, "data": [dict(u) for u in usuarios]}
+    
     def calculate_xp_by_rarity(self, raridade: str) -> int:
         """Calcular XP baseado na raridade da carta"""
         xp_values = {
@@ -494,17 +640,16 @@ class UsuarioController:
             "progresso_colecao": round(progresso_colecao, 2)
         }
     
-    def _get_user_ranking_position(self, nickname: str) -> Optional[int]:
-        """Obter posição do usuário no ranking geral"""
+    async def _get_user_ranking_position(self, nickname: str, xp: Optional[int] = None) -> Optional[int]:
+        """Obter posição do usuário no ranking geral (índice em memória, O(log n))"""
         try:
-            result = self.db.table("usuario").select("nickname").order("xp", desc=True).execute()
+            await rank_index.ensure_loaded()
             
-            if result.data:
-                for i, user in enumerate(result.data, 1):
-                    if user["nickname"] == nickname:
-                        return i
+            # Usuário criado em outro worker depois da última reconstrução
+            if rank_index.xp(nickname) is None and xp is not None:
+                rank_index.update(nickname, xp)
             
-            return None
+            return rank_index.position(nickname)
             
         except Exception:
             return None
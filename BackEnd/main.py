@@ -1,4 +1,5 @@
 # BackEnd/main.py
+import asyncio
 from fastapi import FastAPI, HTTPException
 from pydantic import BaseModel
 from fastapi.middleware.cors import CORSMiddleware
@@ -24,6 +25,16 @@ from routes.participaquantidade_routes import router as participaquantidade_rout
 from routes.participararidade_routes import router as participararidade_router
 from routes.colecao_routes import router as colecao_router
 from routes.amizade_routes import router as amizade_router
+from routes.catalog_routes import router as catalog_router
+from routes.realtime_routes import router as realtime_router
+from config.postgres_pool import close_pool
+from services.db_metrics import DBMetricsMiddleware
+from services.dataloader import DataLoaderMiddleware
+from services.idempotency import IdempotencyMiddleware
+from services.reconciliacao import loop_reconciliacao, QTDCARTAS_RECONCILE_INTERVAL
+from services.catalog import card_catalog
+from services.rank_index import rank_index
+from services.realtime import broker as realtime_broker
 
 app = FastAPI(
     title="ESALQ Explorer API", 
@@ -63,8 +74,19 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-DB-Calls", "X-DB-Time", "ETag", "X-Catalog-Version", "Idempotent-Replayed"],
 )
 
+# Replay de escritas repetidas com o mesmo Idempotency-Key (antes das métricas,
+# para que um replay apareça com X-DB-Calls 0)
+app.add_middleware(IdempotencyMiddleware)
+
+# Conta e cronometra as consultas ao banco de cada request (X-DB-Calls / X-DB-Time)
+app.add_middleware(DBMetricsMiddleware)
+
+# Identity map / DataLoaders por request para buscas find_by_*
+app.add_middleware(DataLoaderMiddleware)
+
 # Include routers
 app.include_router(pessoa_router, prefix="/api")
 app.include_router(carta_router, prefix="/api")
@@ -81,6 +103,39 @@ app.include_router(participaquantidade_router, prefix="/api")
 app.include_router(participararidade_router, prefix="/api")
 app.include_router(colecao_router)
 app.include_router(amizade_router, prefix="/api")
+app.include_router(catalog_router, prefix="/api")
+app.include_router(realtime_router, prefix="/api")
+
+@app.on_event("startup")
+async def load_catalog():
+    # Carrega o catálogo de cartas e o índice de ranking já na subida; se falhar, carrega na primeira leitura
+    try:
+        await card_catalog.ensure_loaded()
+    except Exception as e:
+        print(f"Aviso: catálogo de cartas não carregado na inicialização: {e}")
+    try:
+        await rank_index.ensure_loaded()
+    except Exception as e:
+        print(f"Aviso: índice de ranking não carregado na inicialização: {e}")
+
+@app.on_event("startup")
+async def start_reconciliacao():
+    # Repara periodicamente o qtdcartas mantido por delta pelo trigger de coleta
+    if QTDCARTAS_RECONCILE_INTERVAL > 0:
+        app.state.reconciliacao = asyncio.create_task(loop_reconciliacao())
+
+@app.on_event("startup")
+async def start_realtime():
+    # Broker de eventos em tempo real (Redis entre workers, ou entrega local)
+    await realtime_broker.start()
+
+@app.on_event("shutdown")
+async def shutdown_pool():
+    tarefa = getattr(app.state, "reconciliacao", None)
+    if tarefa:
+        tarefa.cancel()
+    await realtime_broker.stop()
+    await close_pool()
 
 class RegisterRequest(BaseModel):
     nickname: str
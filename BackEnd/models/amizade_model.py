@@ -1,32 +1,39 @@
-from typing import Dict, Any, List
-from config.database import get_database
+import asyncio
+from typing import Dict, Any, FrozenSet, List
+from config.database import get_async_database
+from models.usuario_model import UsuarioModel
+from services.amigos import amigos_cache
+from services.realtime import publicar
 
 class AmizadeModel:
     def __init__(self):
-        self.db = get_database()
+        self.db = get_async_database()
+        self.usuario_model = UsuarioModel()
     
-    def enviar_solicitacao(self, solicitante: str, destinatario: str) -> Dict[str, Any]:
+    async def enviar_solicitacao(self, solicitante: str, destinatario: str) -> Dict[str, Any]:
         """Enviar solicitação de amizade"""
         try:
-            # Verificar se ambos os usuários existem
-            solicitante_exists = self.db.table("usuario").select("nickname").eq("nickname", solicitante).execute()
-            destinatario_exists = self.db.table("usuario").select("nickname").eq("nickname", destinatario).execute()
-            
-            if not solicitante_exists.data:
+            # Verificar se ambos os usuários existem e se já há vínculo (consultas em paralelo;
+            # a existência vem do DataLoader do request, já consultado pelo controller)
+            solicitante_exists, destinatario_exists, existing1, existing2 = await asyncio.gather(
+                self.usuario_model.find_by_nickname(solicitante),
+                self.usuario_model.find_by_nickname(destinatario),
+                self.db.table("amizade").select("*").eq("solicitante", solicitante).eq("destinatario", destinatario).execute(),
+                self.db.table("amizade").select("*").eq("solicitante", destinatario).eq("destinatario", solicitante).execute()
+            )
+            
+            if not solicitante_exists["success"]:
                 return {"success": False, "error": f"Usuário solicitante '{solicitante}' não encontrado"}
             
-            if not destinatario_exists.data:
+            if not destinatario_exists["success"]:
                 return {"success": False, "error": f"Usuário destinatário '{destinatario}' não encontrado"}
             
-            # Verificar se já existe solicitação ou amizade (duas consultas separadas)
-            existing1 = self.db.table("amizade").select("*").eq("solicitante", solicitante).eq("destinatario", destinatario).execute()
-            existing2 = self.db.table("amizade").select("*").eq("solicitante", destinatario).eq("destinatario", solicitante).execute()
-            
+            # Verificar se já existe solicitação ou amizade
             if existing1.data or existing2.data:
                 return {"success": False, "error": "Já existe uma solicitação ou amizade entre estes usuários"}
             
             # Criar nova solicitação
-            result = self.db.table("amizade").insert({
+            result = await self.db.table("amizade").insert({
                 "solicitante": solicitante,
                 "destinatario": destinatario,
                 "status": "pendente",
@@ -36,14 +43,18 @@ class AmizadeModel:
             if hasattr(result, 'error') and result.error:
                 raise Exception(f"Erro ao enviar solicitação: {result.error}")
             
-            return {"success": True, "data": result.data[0] if result.data else None}
+            solicitacao = result.data[0] if result.data else None
+            if solicitacao:
+                await publicar([solicitante, destinatario], "amizade", solicitacao)
+            
+            return {"success": True, "data": solicitacao}
         except Exception as e:
             return {"success": False, "error": str(e)}
     
-    def aceitar_solicitacao(self, solicitacao_id: int) -> Dict[str, Any]:
+    async def aceitar_solicitacao(self, solicitacao_id: int) -> Dict[str, Any]:
         """Aceitar solicitação de amizade"""
         try:
-            result = self.db.table("amizade").update({
+            result = await self.db.table("amizade").update({
                 "status": "aceito",
                 "data_aceite": "now()"
             }).eq("id", solicitacao_id).execute()
@@ -51,42 +62,59 @@ class AmizadeModel:
             if hasattr(result, 'error') and result.error:
                 raise Exception(f"Erro ao aceitar solicitação: {result.error}")
             
+            if result.data:
+                amigos_cache.invalidate(result.data[0]["solicitante"], result.data[0]["destinatario"])
+                await publicar([result.data[0]["solicitante"], result.data[0]["destinatario"]], "amizade", result.data[0])
+            
             return {"success": True, "data": result.data[0] if result.data else None}
         except Exception as e:
             return {"success": False, "error": str(e)}
     
-    def recusar_solicitacao(self, solicitacao_id: int) -> Dict[str, Any]:
+    async def recusar_solicitacao(self, solicitacao_id: int) -> Dict[str, Any]:
         """Recusar solicitação de amizade"""
         try:
-            result = self.db.table("amizade").update({
+            result = await self.db.table("amizade").update({
                 "status": "recusado"
             }).eq("id", solicitacao_id).execute()
             
             if hasattr(result, 'error') and result.error:
                 raise Exception(f"Erro ao recusar solicitação: {result.error}")
             
+            if result.data:
+                amigos_cache.invalidate(result.data[0]["solicitante"], result.data[0]["destinatario"])
+                await publicar([result.data[0]["solicitante"], result.data[0]["destinatario"]], "amizade", result.data[0])
+            
             return {"success": True, "data": result.data[0] if result.data else None}
         except Exception as e:
             return {"success": False, "error": str(e)}
     
-    def remover_amizade(self, usuario1: str, usuario2: str) -> Dict[str, Any]:
+    async def remover_amizade(self, usuario1: str, usuario2: str) -> Dict[str, Any]:
         """Remover amizade"""
         try:
             # Tentar remover em ambas as direções
-            result1 = self.db.table("amizade").delete().eq("solicitante", usuario1).eq("destinatario", usuario2).execute()
-            result2 = self.db.table("amizade").delete().eq("solicitante", usuario2).eq("destinatario", usuario1).execute()
+            result1, result2 = await asyncio.gather(
+                self.db.table("amizade").delete().eq("solicitante", usuario1).eq("destinatario", usuario2).execute(),
+                self.db.table("amizade").delete().eq("solicitante", usuario2).eq("destinatario", usuario1).execute()
+            )
             
             if (hasattr(result1, 'error') and result1.error) or (hasattr(result2, 'error') and result2.error):
                 raise Exception(f"Erro ao remover amizade")
             
+            amigos_cache.invalidate(usuario1, usuario2)
+            await publicar([usuario1, usuario2], "amizade", {
+                "solicitante": usuario1,
+                "destinatario": usuario2,
+                "status": "removido"
+            })
+            
             return {"success": True, "message": "Amizade removida com sucesso"}
         except Exception as e:
             return {"success": False, "error": str(e)}
     
-    def listar_amigos(self, nickname: str) -> Dict[str, Any]:
+    async def listar_amigos(self, nickname: str) -> Dict[str, Any]:
         """Listar amigos de um usuário"""
         try:
-            result = self.db.table("amizade").select(
+            result = await self.db.table("amizade").select(
                 "*, solicitante:usuario!solicitante(nickname,ranking,xp,nivel,fotoperfil), destinatario:usuario!destinatario(nickname,ranking,xp,nivel,fotoperfil)"
             ).or_(
                 f"solicitante.eq.{nickname},destinatario.eq.{nickname}"
@@ -118,10 +146,25 @@ class AmizadeModel:
         except Exception as e:
             return {"success": False, "error": str(e)}
     
-    def listar_solicitacoes_pendentes(self, nickname: str) -> Dict[str, Any]:
+    async def get_amigos_nicknames(self, nickname: str) -> FrozenSet[str]:
+        """Nicknames dos amigos (amizades aceitas), com cache por usuário"""
+        amigos = amigos_cache.get(nickname)
+        if amigos is None:
+            result = await self.db.table("amizade").select("solicitante, destinatario").or_(
+                f"solicitante.eq.{nickname},destinatario.eq.{nickname}"
+            ).eq("status", "aceito").execute()
+            
+            amigos = frozenset(
+                a["destinatario"] if a["solicitante"] == nickname else a["solicitante"]
+                for a in result.data
+            )
+            amigos_cache.set(nickname, amigos)
+        return amigos
+    
+    async def listar_solicitacoes_pendentes(self, nickname: str) -> Dict[str, Any]:
         """Listar solicitações pendentes recebidas"""
         try:
-            result = self.db.table("amizade").select(
+            result = await self.db.table("amizade").select(
                 "*, solicitante:usuario!solicitante(nickname,ranking,xp,nivel,fotoperfil)"
             ).eq("destinatario", nickname).eq("status", "pendente").execute()
             
@@ -147,10 +190,10 @@ class AmizadeModel:
         except Exception as e:
             return {"success": False, "error": str(e)}
     
-    def buscar_usuarios(self, termo_busca: str, usuario_atual: str, limit: int = 20) -> Dict[str, Any]:
+    async def buscar_usuarios(self, termo_busca: str, usuario_atual: str, limit: int = 20) -> Dict[str, Any]:
         """Buscar usuários por nickname"""
         try:
-            result = self.db.table("usuario").select(
+            result = await self.db.table("usuario").select(
                 "nickname, ranking, xp, nivel, fotoperfil"
             ).ilike("nickname", f"%{termo_busca}%").neq("nickname", usuario_atual).limit(limit).execute()
             
@@ -161,12 +204,14 @@ class AmizadeModel:
         except Exception as e:
             return {"success": False, "error": str(e)}
     
-    def verificar_status_amizade(self, usuario1: str, usuario2: str) -> Dict[str, Any]:
+    async def verificar_status_amizade(self, usuario1: str, usuario2: str) -> Dict[str, Any]:
         """Verificar status de amizade entre dois usuários"""
         try:
             # Verificar em ambas as direções
-            result1 = self.db.table("amizade").select("*").eq("solicitante", usuario1).eq("destinatario", usuario2).execute()
-            result2 = self.db.table("amizade").select("*").eq("solicitante", usuario2).eq("destinatario", usuario1).execute()
+            result1, result2 = await asyncio.gather(
+                self.db.table("amizade").select("*").eq("solicitante", usuario1).eq("destinatario", usuario2).execute(),
+                self.db.table("amizade").select("*").eq("solicitante", usuario2).eq("destinatario", usuario1).execute()
+            )
             
             if hasattr(result1, 'error') and result1.error:
                 raise Exception(f"Erro ao verificar amizade: {result1.error}")
@@ -1,134 +1,101 @@
-from typing import List, Optional, Dict, Any
-from config.database import get_database
+import asyncio
+from typing import List, Optional, Dict, Any, Set
+from config.database import get_async_database
+from services.catalog import card_catalog
+from services.geo_index import get_geo_index
 
 class CartaModel:
     def __init__(self):
-        self.db = get_database()
+        self.db = get_async_database()
     
-    def create(self, carta_data: Dict[str, Any]) -> Dict[str, Any]:
+    async def create(self, carta_data: Dict[str, Any]) -> Dict[str, Any]:
         """Criar uma nova carta"""
         try:
-            result = self.db.table("carta").insert(carta_data).execute()
+            result = await self.db.table("carta").insert(carta_data).execute()
             
             if hasattr(result, 'error') and result.error:
                 raise Exception(f"Erro ao criar carta: {result.error}")
             
+            card_catalog.invalidate()
+            
             return {"success": True, "data": result.data[0] if result.data else None}
         except Exception as e:
             return {"success": False, "error": str(e)}
     
-    def find_by_qrcode(self, qrcode: str) -> Dict[str, Any]:
+    async def find_by_qrcode(self, qrcode: str) -> Dict[str, Any]:
         """Buscar carta por QRCode"""
         try:
-            result = self.db.table("carta").select("*, latitude, longitude").eq("qrcode", qrcode).single().execute()
+            carta = await card_catalog.get(qrcode)
             
-            if not result.data:
+            if not carta:
                 return {"success": False, "error": "Carta não encontrada"}
             
-            # Adicionar nome dinâmico à carta
-            cartas_nomes = {
-                'QR001': 'Framboyant Dourado',
-                'QR002': 'Pau-Brasil Histórico', 
-                'QR003': 'Pau-Formiga Guardião',
-                'QR004': 'Cuieté Majestoso',
-                'QR005': 'Abricó-de-Macaco',
-                'QR006': 'Sol Radiante',
-                'QR007': 'Júpiter Colossal',
-                'QR008': 'Saturno dos Anéis',
-                'QR009': 'Urano Místico',
-                'QR010': 'Netuno Tempestuoso',
-                'QR011': 'Plutão Distante',
-                '1': 'Framboyant Dourado',
-                '2': 'Pau-Brasil Histórico',
-                '3': 'Pau-Formiga Guardião',
-                '4': 'Cuieté Majestoso',
-                '5': 'Abricó-de-Macaco'
-            }
-            
-            result.data["nome"] = cartas_nomes.get(qrcode, f"Carta {qrcode}")
-            
-            # Adicionar coordenadas se disponíveis
-            if result.data.get("latitude") is not None and result.data.get("longitude") is not None:
-                result.data["coordinates"] = {
-                    "latitude": float(result.data["latitude"]),
-                    "longitude": float(result.data["longitude"])
-                }
-            
-            return {"success": True, "data": result.data}
+            return {"success": True, "data": carta}
         except Exception as e:
             return {"success": False, "error": str(e)}
     
-    def find_all(self, limit: Optional[int] = None) -> Dict[str, Any]:
+    async def find_all(self, limit: Optional[int] = None) -> Dict[str, Any]:
         """Buscar todas as cartas"""
         try:
-            query = self.db.table("carta").select("*, latitude, longitude")
+            cartas = await card_catalog.all()
             if limit:
-                query = query.limit(limit)
-            
-            result = query.execute()
-            
-            # Adicionar nomes dinâmicos às cartas
-            if result.data:
-                cartas_nomes = {
-                    'QR001': 'Framboyant Dourado',
-                    'QR002': 'Pau-Brasil Histórico', 
-                    'QR003': 'Pau-Formiga Guardião',
-                    'QR004': 'Cuieté Majestoso',
-                    'QR005': 'Abricó-de-Macaco',
-                    'QR006': 'Sol Radiante',
-                    'QR007': 'Júpiter Colossal',
-                    'QR008': 'Saturno dos Anéis',
-                    'QR009': 'Urano Místico',
-                    'QR010': 'Netuno Tempestuoso',
-                    'QR011': 'Plutão Distante',
-                    '1': 'Framboyant Dourado',
-                    '2': 'Pau-Brasil Histórico',
-                    '3': 'Pau-Formiga Guardião',
-                    '4': 'Cuieté Majestoso',
-                    '5': 'Abricó-de-Macaco'
-                }
-                
-                for carta in result.data:
-                    qrcode = carta["qrcode"]
-                    carta["nome"] = cartas_nomes.get(qrcode, f"Carta {qrcode}")
-                    
-                    # Adicionar coordenadas se disponíveis
-                    if carta.get("latitude") is not None and carta.get("longitude") is not None:
-                        carta["coordinates"] = {
-                            "latitude": float(carta["latitude"]),
-                            "longitude": float(carta["longitude"])
-                        }
-            
-            return {"success": True, "data": result.data}
+                cartas = cartas[:limit]
+            
+            return {"success": True, "data": cartas}
         except Exception as e:
             return {"success": False, "error": str(e)}
     
-    def find_by_raridade(self, raridade: str) -> Dict[str, Any]:
+    async def find_by_raridade(self, raridade: str) -> Dict[str, Any]:
         """Buscar cartas por raridade"""
         try:
-            result = self.db.table("carta").select("*").eq("raridade", raridade).execute()
+            cartas = await card_catalog.all()
             
-            return {"success": True, "data": result.data}
+            return {"success": True, "data": [c for c in cartas if c.get("raridade") == raridade]}
         except Exception as e:
             return {"success": False, "error": str(e)}
     
-    def find_by_localizacao(self, localizacao: str) -> Dict[str, Any]:
+    async def find_by_localizacao(self, localizacao: str) -> Dict[str, Any]:
         """Buscar cartas por localização"""
         try:
-            result = self.db.table("carta").select("*").ilike("localizacao", f"%{localizacao}%").execute()
+            termo = localizacao.lower()
+            cartas = await card_catalog.all()
             
-            return {"success": True, "data": result.data}
+            return {"success": True, "data": [c for c in cartas if termo in (c.get("localizacao") or "").lower()]}
         except Exception as e:
             return {"success": False, "error": str(e)}
     
-    def update(self, qrcode: str, update_data: Dict[str, Any]) -> Dict[str, Any]:
+    async def find_proximas(self, latitude: float, longitude: float, raio: Optional[float] = None,
+                            limit: int = 10, excluir: Optional[Set[str]] = None) -> Dict[str, Any]:
+        """Buscar cartas mais próximas de um ponto (k-vizinhos ou dentro de um raio em metros)"""
+        try:
+            index = await get_geo_index()
+            
+            if raio is not None:
+                encontradas = index.within(latitude, longitude, raio, excluir)[:limit]
+            else:
+                encontradas = index.nearest(latitude, longitude, limit, excluir)
+            
+            cartas = []
+            for distancia, qrcode in encontradas:
+                carta = await card_catalog.get(qrcode)
+                if carta:
+                    carta["distancia"] = round(distancia, 1)
+                    cartas.append(carta)
+            
+            return {"success": True, "data": cartas}
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+    
+    async def update(self, qrcode: str, update_data: Dict[str, Any]) -> Dict[str, Any]:
         """Atualizar carta"""
         try:
-            result = self.db.table("carta").update(update_data).eq("qrcode", qrcode).execute()
+            result = await self.db.table("carta").update(update_data).eq("qrcode", qrcode).execute()
             
             if hasattr(result, 'error') and result.error:
                 raise Exception(f"Erro ao atualizar carta: {result.error}")
             
+            card_catalog.invalidate()
+            
             if not result.data:
                 return {"success": False, "error": "Carta não encontrada"}
             
@@ -136,26 +103,31 @@ class CartaModel:
         except Exception as e:
             return {"success": False, "error": str(e)}
     
-    def delete(self, qrcode: str) -> Dict[str, Any]:
+    async def delete(self, qrcode: str) -> Dict[str, Any]:
         """Deletar carta"""
         try:
-            result = self.db.table("carta").delete().eq("qrcode", qrcode).execute()
+            result = await self.db.table("carta").delete().eq("qrcode", qrcode).execute()
             
             if hasattr(result, 'error') and result.error:
                 raise Exception(f"Erro ao deletar carta: {result.error}")
             
+            card_catalog.invalidate()
+            
             return {"success": True, "message": "Carta deletada com sucesso"}
         except Exception as e:
             return {"success": False, "error": str(e)}
     
-    def get_cartas_raras(self) -> Dict[str, Any]:
+    async def get_cartas_raras(self) -> Dict[str, Any]:
         """Buscar cartas raras com história"""
         try:
-            result = (self.db.table("carta")
-                     .select("*, cartarara(historia)")
-                     .join("cartarara", "carta.qrcode", "cartarara.qrcode")
-                     .execute())
+            cartas, historias = await asyncio.gather(card_catalog.all(), card_catalog.historias())
+            
+            raras = []
+            for carta in cartas:
+                if carta["qrcode"] in historias:
+                    carta["cartarara"] = {"historia": historias[carta["qrcode"]]}
+                    raras.append(carta)
             
-            return {"success": True, "data": result.data}
+            return {"success": True, "data": raras}
         except Exception as e:
             return {"success": False, "error": str(e)}
@@ -1,14 +1,18 @@
 from typing import Optional, Dict, Any
-from config.database import get_database
+from config.database import get_async_database
 
 class ChatModel:
     def __init__(self):
-        self.db = get_database()
+        self.db = get_async_database()
     
-    def create(self, chat_data: Dict[str, Any]) -> Dict[str, Any]:
+    async def create(self, chat_data: Dict[str, Any]) -> Dict[str, Any]:
         """Criar novo chat"""
         try:
-            result = self.db.table("chat").insert(chat_data).execute()
+            # O banco ordena o par (usuario1 <= usuario2) pela sua collation
+            result = await self.db.rpc("criar_chat", {
+                "p_usuario1": chat_data["usuario1"],
+                "p_usuario2": chat_data["usuario2"]
+            }).execute()
             
             if hasattr(result, 'error') and result.error:
                 raise Exception(f"Erro ao criar chat: {result.error}")
@@ -17,10 +21,10 @@ class ChatModel:
         except Exception as e:
             return {"success": False, "error": str(e)}
     
-    def find_by_usuarios(self, usuario1: str, usuario2: str) -> Dict[str, Any]:
+    async def find_by_usuarios(self, usuario1: str, usuario2: str) -> Dict[str, Any]:
         """Buscar chat entre dois usuários"""
         try:
-            result = (self.db.table("chat")
+            result = (await self.db.table("chat")
                      .select("*")
                      .or_(f"and(usuario1.eq.{usuario1},usuario2.eq.{usuario2}),and(usuario1.eq.{usuario2},usuario2.eq.{usuario1})")
                      .single()
@@ -33,7 +37,7 @@ class ChatModel:
         except Exception as e:
             return {"success": False, "error": str(e)}
     
-    def find_by_usuario(self, usuario: str, limit: Optional[int] = None) -> Dict[str, Any]:
+    async def find_by_usuario(self, usuario: str, limit: Optional[int] = None) -> Dict[str, Any]:
         """Buscar todos os chats de um usuário"""
         try:
             query = (self.db.table("chat")
@@ -43,13 +47,13 @@ class ChatModel:
             if limit:
                 query = query.limit(limit)
             
-            result = query.execute()
+            result = await query.execute()
             
             return {"success": True, "data": result.data}
         except Exception as e:
             return {"success": False, "error": str(e)}
     
-    def find_all(self, limit: Optional[int] = None) -> Dict[str, Any]:
+    async def find_all(self, limit: Optional[int] = None) -> Dict[str, Any]:
         """Buscar todos os chats"""
         try:
             query = self.db.table("chat").select("*")
@@ -57,16 +61,16 @@ class ChatModel:
             if limit:
                 query = query.limit(limit)
             
-            result = query.execute()
+            result = await query.execute()
             
             return {"success": True, "data": result.data}
         except Exception as e:
             return {"success": False, "error": str(e)}
     
-    def delete(self, usuario1: str, usuario2: str) -> Dict[str, Any]:
+    async def delete(self, usuario1: str, usuario2: str) -> Dict[str, Any]:
         """Deletar chat"""
         try:
-            result = (self.db.table("chat")
+            result = (await self.db.table("chat")
                      .delete()
                      .or_(f"and(usuario1.eq.{usuario1},usuario2.eq.{usuario2}),and(usuario1.eq.{usuario2},usuario2.eq.{usuario1})")
                      .execute())
@@ -1,21 +1,32 @@
 from typing import Optional, Dict, Any, List
-from config.database import get_database
+from config.database import get_async_database, get_direct_repository
+from services.catalog import card_catalog
+from services.dataloader import forget
+from services.progresso_missoes import progresso_missoes
+from services.xp_events import xp_alterado
+
+# Campos da carta embutidos em cada item da coleção
+CAMPOS_CARTA_COLECAO = (
+    "qrcode", "raridade", "imagem", "audio", "localizacao", "descricao",
+    "latitude", "longitude", "nome", "coordinates"
+)
 
 class ColecaoModel:
     def __init__(self):
-        self.db = get_database()
+        self.db = get_async_database()
+        self.direct = get_direct_repository("coleta")
     
-    def adicionar_carta(self, usuario: str, qrcode: str, quantidade: int = 1) -> Dict[str, Any]:
+    async def adicionar_carta(self, usuario: str, qrcode: str, quantidade: int = 1) -> Dict[str, Any]:
         """Adicionar carta à coleção do usuário"""
         try:
             # Verificar se a carta já existe na coleção
-            existing = self.get_carta_usuario(usuario, qrcode)
+            existing = await self.get_carta_usuario(usuario, qrcode)
             
             if existing["success"]:
                 # Se já existe, atualizar quantidade
                 nova_quantidade = existing["data"]["quantidade"] + quantidade
                 print(f"DEBUG ColecaoModel: Atualizando quantidade para {nova_quantidade}")
-                result = (self.db.table("coleta")
+                result = (await self.db.table("coleta")
                          .update({"quantidade": nova_quantidade})
                          .eq("usuario", usuario)
                          .eq("qrcode", qrcode)
@@ -28,15 +39,18 @@ class ColecaoModel:
                     "quantidade": quantidade
                 }
                 print(f"DEBUG ColecaoModel: Inserindo nova entrada: {coleta_data}")
-                result = self.db.table("coleta").insert(coleta_data).execute()
+                result = await self.db.table("coleta").insert(coleta_data).execute()
             
             print(f"DEBUG ColecaoModel: Resultado da operação: {result}")
             
             if hasattr(result, 'error') and result.error:
                 raise Exception(f"Erro ao adicionar carta: {result.error}")
             
-            # Atualizar contador de cartas do usuário
-            self._atualizar_contador_cartas(usuario)
+            # qtdcartas é atualizado pelo trigger de coleta
+            forget("usuario.nickname", usuario)
+            await progresso_missoes.registrar_coletas(usuario, [
+                {"qrcode": qrcode, "quantidade": quantidade}
+            ])
             
             return {"success": True, "data": result.data[0] if result.data else None}
         except Exception as e:
@@ -45,73 +59,105 @@ class ColecaoModel:
             traceback.print_exc()
             return {"success": False, "error": str(e)}
     
-    def get_colecao_usuario(self, usuario: str) -> Dict[str, Any]:
+    async def coletar_carta(self, usuario: str, qrcode: str, quantidade: int, xp: int) -> Dict[str, Any]:
+        """Coletar carta numa única transação (função coletar_carta no banco)"""
+        try:
+            if self.direct:
+                data = await self.direct.coletar_carta(usuario, qrcode, quantidade, xp)
+            else:
+                result = await self.db.rpc("coletar_carta", {
+                    "p_usuario": usuario,
+                    "p_qrcode": qrcode,
+                    "p_quantidade": quantidade,
+                    "p_xp": xp
+                }).execute()
+                data = result.data[0] if result.data else None
+
+            if not data:
+                return {"success": False, "error": "Usuário não encontrado"}
+
+            forget("usuario.nickname", usuario)
+            xp_alterado(usuario, data["xp"])
+            data["missoes_concluidas"] = await progresso_missoes.registrar_coletas(usuario, [
+                {"qrcode": qrcode, "quantidade": quantidade}
+            ])
+            return {"success": True, "data": data}
+        except Exception as e:
+            print(f"ERROR ColecaoModel: {str(e)}")
+            return {"success": False, "error": str(e)}
+    
+    async def coletar_cartas_lote(self, usuario: str, itens: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Coletar várias cartas numa única transação (itens: qrcode, quantidade, xp)"""
+        try:
+            if self.direct:
+                data = await self.direct.coletar_cartas_lote(usuario, itens)
+            else:
+                result = await self.db.rpc("coletar_cartas_lote", {
+                    "p_usuario": usuario,
+                    "p_itens": itens
+                }).execute()
+                data = result.data
+
+            if not data or not data.get("usuario"):
+                return {"success": False, "error": "Usuário não encontrado"}
+
+            forget("usuario.nickname", usuario)
+            xp_alterado(usuario, data["usuario"]["xp"])
+
+            # Missões avançam pela quantidade escaneada, não pelo total gravado
+            escaneadas: Dict[str, int] = {}
+            for item in itens:
+                escaneadas[item["qrcode"]] = escaneadas.get(item["qrcode"], 0) + item["quantidade"]
+            data["missoes_concluidas"] = await progresso_missoes.registrar_coletas(usuario, [
+                {"qrcode": gravada["qrcode"], "quantidade": escaneadas.get(gravada["qrcode"], 0)}
+                for gravada in data["itens"]
+            ])
+            return {"success": True, "data": data}
+        except Exception as e:
+            print(f"ERROR ColecaoModel: {str(e)}")
+            return {"success": False, "error": str(e)}
+    
+    async def get_colecao_usuario(self, usuario: str) -> Dict[str, Any]:
         """Buscar todas as cartas coletadas por um usuário"""
         try:
-            result = (self.db.table("coleta")
-                     .select("""
-                         qrcode,
-                         quantidade,
-                         carta:qrcode (
-                             qrcode,
-                             raridade,
-                             imagem,
-                             audio,
-                             localizacao,
-                             descricao,
-                             latitude,
-                             longitude
-                         )
-                     """)
-                     .eq("usuario", usuario)
-                     .execute())
+            if self.direct:
+                data = await self.direct.get_coleta_usuario(usuario)
+            else:
+                result = (await self.db.table("coleta")
+                         .select("qrcode, quantidade")
+                         .eq("usuario", usuario)
+                         .execute())
+                data = result.data
             
-            # Adicionar nomes dinâmicos às cartas
-            if result.data:
-                cartas_nomes = {
-                    'QR001': 'Framboyant Dourado',
-                    'QR002': 'Pau-Brasil Histórico', 
-                    'QR003': 'Pau-Formiga Guardião',
-                    'QR004': 'Cuieté Majestoso',
-                    'QR005': 'Abricó-de-Macaco',
-                    'QR006': 'Sol Radiante',
-                    'QR007': 'Júpiter Colossal',
-                    'QR008': 'Saturno dos Anéis',
-                    'QR009': 'Urano Místico',
-                    'QR010': 'Netuno Tempestuoso',
-                    'QR011': 'Plutão Distante',
-                    '1': 'Framboyant Dourado',
-                    '2': 'Pau-Brasil Histórico',
-                    '3': 'Pau-Formiga Guardião',
-                    '4': 'Cuieté Majestoso',
-                    '5': 'Abricó-de-Macaco'
-                }
-                
-                for item in result.data:
-                    if item.get("carta"):
-                        qrcode = item["carta"]["qrcode"]
-                        item["carta"]["nome"] = cartas_nomes.get(qrcode, f"Carta {qrcode}")
-                        
-                        # Adicionar coordenadas se disponíveis
-                        carta = item["carta"]
-                        if carta.get("latitude") is not None and carta.get("longitude") is not None:
-                            carta["coordinates"] = {
-                                "latitude": float(carta["latitude"]),
-                                "longitude": float(carta["longitude"])
-                            }
+            # Dados da carta (nome, raridade, coordenadas...) vêm do catálogo em memória
+            for item in data:
+                carta = await card_catalog.get(item["qrcode"])
+                item["carta"] = {campo: carta[campo] for campo in CAMPOS_CARTA_COLECAO if campo in carta} if carta else None
             
-            return {"success": True, "data": result.data}
+            return {"success": True, "data": data}
         except Exception as e:
             print(f"ERROR ColecaoModel: {str(e)}")
             import traceback
             traceback.print_exc()
             return {"success": False, "error": str(e)}
     
-    def get_carta_usuario(self, usuario: str, qrcode: str) -> Dict[str, Any]:
+    async def get_qrcodes_usuario(self, usuario: str) -> Dict[str, Any]:
+        """Buscar apenas os QRCodes que o usuário já coletou"""
+        try:
+            result = (await self.db.table("coleta")
+                     .select("qrcode")
+                     .eq("usuario", usuario)
+                     .execute())
+            
+            return {"success": True, "data": {item["qrcode"] for item in result.data}}
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+    
+    async def get_carta_usuario(self, usuario: str, qrcode: str) -> Dict[str, Any]:
         """Verificar se usuário possui uma carta específica"""
         try:
             print(f"DEBUG get_carta_usuario: Buscando carta {qrcode} para usuario {usuario}")
-            result = (self.db.table("coleta")
+            result = (await self.db.table("coleta")
                      .select("*")
                      .eq("usuario", usuario)
                      .eq("qrcode", qrcode)
@@ -130,10 +176,10 @@ class ColecaoModel:
             traceback.print_exc()
             return {"success": False, "error": str(e)}
     
-    def remover_carta(self, usuario: str, qrcode: str, quantidade: int = 1) -> Dict[str, Any]:
+    async def remover_carta(self, usuario: str, qrcode: str, quantidade: int = 1) -> Dict[str, Any]:
         """Remover carta da coleção do usuário"""
         try:
-            existing = self.get_carta_usuario(usuario, qrcode)
+            existing = await self.get_carta_usuario(usuario, qrcode)
             
             if not existing["success"]:
                 return {"success": False, "error": "Carta não encontrada na coleção"}
@@ -142,7 +188,7 @@ class ColecaoModel:
             
             if quantidade_atual <= quantidade:
                 # Remover completamente
-                result = (self.db.table("coleta")
+                result = (await self.db.table("coleta")
                          .delete()
                          .eq("usuario", usuario)
                          .eq("qrcode", qrcode)
@@ -150,7 +196,7 @@ class ColecaoModel:
             else:
                 # Diminuir quantidade
                 nova_quantidade = quantidade_atual - quantidade
-                result = (self.db.table("coleta")
+                result = (await self.db.table("coleta")
                          .update({"quantidade": nova_quantidade})
                          .eq("usuario", usuario)
                          .eq("qrcode", qrcode)
@@ -159,8 +205,8 @@ class ColecaoModel:
             if hasattr(result, 'error') and result.error:
                 raise Exception(f"Erro ao remover carta: {result.error}")
             
-            # Atualizar contador de cartas do usuário
-            self._atualizar_contador_cartas(usuario)
+            # qtdcartas é atualizado pelo trigger de coleta
+            forget("usuario.nickname", usuario)
             
             return {"success": True, "data": result.data}
         except Exception as e:
@@ -169,12 +215,12 @@ class ColecaoModel:
             traceback.print_exc()
             return {"success": False, "error": str(e)}
     
-    def get_estatisticas_colecao(self, usuario: str) -> Dict[str, Any]:
+    async def get_estatisticas_colecao(self, usuario: str) -> Dict[str, Any]:
         """Buscar estatísticas da coleção do usuário"""
         try:
             # Total de cartas coletadas
-            total_result = (self.db.table("coleta")
-                           .select("quantidade")
+            total_result = (await self.db.table("coleta")
+                           .select("qrcode, quantidade")
                            .eq("usuario", usuario)
                            .execute())
             
@@ -183,18 +229,13 @@ class ColecaoModel:
             # Cartas únicas
             cartas_unicas = len(total_result.data)
             
-            # Cartas por raridade
-            raridade_result = (self.db.table("coleta")
-                              .select("""
-                                  quantidade,
-                                  carta:qrcode (raridade)
-                              """)
-                              .eq("usuario", usuario)
-                              .execute())
-            
+            # Cartas por raridade (raridade resolvida pelo catálogo em memória)
             raridades = {}
-            for item in raridade_result.data:
-                raridade = item["carta"]["raridade"]
+            for item in total_result.data:
+                carta = await card_catalog.get(item["qrcode"])
+                if not carta:
+                    continue
+                raridade = carta["raridade"]
                 quantidade = item["quantidade"]
                 raridades[raridade] = raridades.get(raridade, 0) + quantidade
             
@@ -209,10 +250,10 @@ class ColecaoModel:
         except Exception as e:
             return {"success": False, "error": str(e)}
     
-    def limpar_colecao(self, usuario: str) -> Dict[str, Any]:
+    async def limpar_colecao(self, usuario: str) -> Dict[str, Any]:
         """Limpar toda a coleção do usuário"""
         try:
-            result = (self.db.table("coleta")
+            result = (await self.db.table("coleta")
                      .delete()
                      .eq("usuario", usuario)
                      .execute())
@@ -220,25 +261,9 @@ class ColecaoModel:
             if hasattr(result, 'error') and result.error:
                 raise Exception(f"Erro ao limpar coleção: {result.error}")
             
-            # Atualizar contador de cartas do usuário
-            self._atualizar_contador_cartas(usuario)
+            # qtdcartas é atualizado pelo trigger de coleta
+            forget("usuario.nickname", usuario)
             
             return {"success": True, "data": result.data}
         except Exception as e:
             return {"success": False, "error": str(e)}
-    
-    def _atualizar_contador_cartas(self, usuario: str) -> None:
-        """Atualizar o contador QtdCartas na tabela Usuario"""
-        try:
-            # Calcular total de cartas
-            total_result = (self.db.table("coleta")
-                           .select("quantidade")
-                           .eq("usuario", usuario)
-                           .execute())
-            
-            total_cartas = sum(item["quantidade"] for item in total_result.data)
-            
-            # Atualizar na tabela usuario
-            self.db.table("usuario").update({"qtdcartas": total_cartas}).eq("nickname", usuario).execute()
-        except Exception as e:
-            print(f"Erro ao atualizar contador de cartas: {e}")
@@ -1,27 +1,44 @@
-from typing import List, Optional, Dict, Any
-from config.database import get_database
+from typing import List, Optional, Dict, Any, Tuple
+from config.database import get_async_database, get_direct_repository
+from services.catalog import card_catalog, nome_padrao
+from services.realtime import publicar
 from datetime import datetime
 
+
+def _valor_filtro(valor: str) -> str:
+    """Valor entre aspas para filtros do PostgREST (escapa aspas e barras)"""
+    return '"' + valor.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
 class MensagemModel:
     def __init__(self):
-        self.db = get_database()
+        self.db = get_async_database()
+        self.direct = get_direct_repository("mensagem")
     
-    def create(self, mensagem_data: Dict[str, Any]) -> Dict[str, Any]:
+    async def _notificar(self, mensagem: Optional[Dict[str, Any]]) -> None:
+        """Entregar a mensagem nova às sessões em tempo real dos dois usuários"""
+        if mensagem:
+            await publicar([mensagem["remetente"], mensagem["destinatario"]], "mensagem", mensagem)
+    
+    async def create(self, mensagem_data: Dict[str, Any]) -> Dict[str, Any]:
         """Criar uma nova mensagem"""
         try:
             # Adicionar timestamp atual
             mensagem_data["datahora"] = datetime.now().isoformat()
             
-            result = self.db.table("mensagem").insert(mensagem_data).execute()
+            result = await self.db.table("mensagem").insert(mensagem_data).execute()
             
             if hasattr(result, 'error') and result.error:
                 raise Exception(f"Erro ao criar mensagem: {result.error}")
             
-            return {"success": True, "data": result.data[0] if result.data else None}
+            mensagem = result.data[0] if result.data else None
+            await self._notificar(mensagem)
+            
+            return {"success": True, "data": mensagem}
         except Exception as e:
             return {"success": False, "error": str(e)}
     
-    def find_by_destinatario(self, destinatario: str, limit: Optional[int] = None) -> Dict[str, Any]:
+    async def find_by_destinatario(self, destinatario: str, limit: Optional[int] = None) -> Dict[str, Any]:
         """Buscar mensagens por destinatário"""
         try:
             query = (self.db.table("mensagem")
@@ -32,13 +49,13 @@ class MensagemModel:
             if limit:
                 query = query.limit(limit)
             
-            result = query.execute()
+            result = await query.execute()
             
             return {"success": True, "data": result.data}
         except Exception as e:
             return {"success": False, "error": str(e)}
     
-    def find_by_remetente(self, remetente: str, limit: Optional[int] = None) -> Dict[str, Any]:
+    async def find_by_remetente(self, remetente: str, limit: Optional[int] = None) -> Dict[str, Any]:
         """Buscar mensagens por remetente"""
         try:
             query = (self.db.table("mensagem")
@@ -49,13 +66,13 @@ class MensagemModel:
             if limit:
                 query = query.limit(limit)
             
-            result = query.execute()
+            result = await query.execute()
             
             return {"success": True, "data": result.data}
         except Exception as e:
             return {"success": False, "error": str(e)}
     
-    def find_conversa(self, usuario1: str, usuario2: str, limit: Optional[int] = None) -> Dict[str, Any]:
+    async def find_conversa(self, usuario1: str, usuario2: str, limit: Optional[int] = None) -> Dict[str, Any]:
         """Buscar conversa entre dois usuários"""
         try:
             query = (self.db.table("mensagem")
@@ -66,13 +83,13 @@ class MensagemModel:
             if limit:
                 query = query.limit(limit)
             
-            result = query.execute()
+            result = await query.execute()
             
             return {"success": True, "data": result.data}
         except Exception as e:
             return {"success": False, "error": str(e)}
     
-    def find_all(self, limit: Optional[int] = None) -> Dict[str, Any]:
+    async def find_all(self, limit: Optional[int] = None) -> Dict[str, Any]:
         """Buscar todas as mensagens"""
         try:
             query = self.db.table("mensagem").select("*").order("datahora", desc=True)
@@ -80,16 +97,16 @@ class MensagemModel:
             if limit:
                 query = query.limit(limit)
             
-            result = query.execute()
+            result = await query.execute()
             
             return {"success": True, "data": result.data}
         except Exception as e:
             return {"success": False, "error": str(e)}
     
-    def delete(self, remetente: str, destinatario: str, datahora: str) -> Dict[str, Any]:
+    async def delete(self, remetente: str, destinatario: str, datahora: str) -> Dict[str, Any]:
         """Deletar mensagem específica"""
         try:
-            result = (self.db.table("mensagem")
+            result = (await self.db.table("mensagem")
                      .delete()
                      .eq("remetente", remetente)
                      .eq("destinatario", destinatario)
@@ -103,28 +120,77 @@ class MensagemModel:
         except Exception as e:
             return {"success": False, "error": str(e)}
     
-    def get_chat_messages(self, usuario1: str, usuario2: str, limit: int = 50) -> Dict[str, Any]:
-        """Buscar mensagens de um chat entre dois usuários"""
+    async def get_chat_messages(self, usuario1: str, usuario2: str, limit: int = 50,
+                                antes: Optional[Tuple[str, str]] = None,
+                                depois: Optional[Tuple[str, str]] = None) -> Dict[str, Any]:
+        """
+        Buscar uma página de mensagens de um chat, da mais nova para a mais
+        antiga, por keyset em (datahora, remetente). `antes`/`depois` são
+        a posição (datahora, remetente) de uma mensagem já recebida.
+        """
         try:
-            result = (self.db.table("mensagem")
-                     .select("""
-                         *,
-                         carta_ref:carta(qrcode, raridade, imagem, localizacao),
-                         troca_ref:trocaid(id, status, cartaoferecida, cartasolicitada)
-                     """)
-                     .or_(f"and(remetente.eq.{usuario1},destinatario.eq.{usuario2}),and(remetente.eq.{usuario2},destinatario.eq.{usuario1})")
-                     .order("datahora", desc=False)
-                     .limit(limit)
-                     .execute())
+            # Um item a mais indica se há outra página no mesmo sentido
+            if self.direct:
+                data = await self.direct.get_chat_messages(usuario1, usuario2, limit + 1, antes, depois)
+            else:
+                u1, u2 = _valor_filtro(usuario1), _valor_filtro(usuario2)
+                conversa = (f"or(and(remetente.eq.{u1},destinatario.eq.{u2}),"
+                            f"and(remetente.eq.{u2},destinatario.eq.{u1}))")
+                cursor = depois or antes
+                if cursor:
+                    if cursor[1] not in (usuario1, usuario2):
+                        raise ValueError("Cursor inválido")
+                    op = "gt" if depois else "lt"
+                    # Só valores já validados: datahora normalizada e um dos participantes
+                    datahora = _valor_filtro(datetime.fromisoformat(cursor[0]).isoformat())
+                    remetente = u1 if cursor[1] == usuario1 else u2
+                    conversa = (f"and({conversa},or(datahora.{op}.{datahora},"
+                                f"and(datahora.eq.{datahora},remetente.{op}.{remetente})))")
+                
+                result = (await self.db.table("mensagem")
+                         .select("*, troca_ref:trocaid(id, status, cartaoferecida, cartasolicitada)")
+                         .or_(conversa)
+                         .order("datahora", desc=not depois)
+                         .order("remetente", desc=not depois)
+                         .limit(limit + 1)
+                         .execute())
+                
+                if hasattr(result, 'error') and result.error:
+                    raise Exception(f"Erro ao buscar mensagens: {result.error}")
+                data = result.data
             
-            if hasattr(result, 'error') and result.error:
-                raise Exception(f"Erro ao buscar mensagens: {result.error}")
+            tem_mais = len(data) > limit
+            data = data[:limit]
+            if depois:
+                data.reverse()
             
-            return {"success": True, "data": result.data}
+            cartas, trocas = await self._referencias(data)
+            return {"success": True, "data": data, "tem_mais": tem_mais, "cartas": cartas, "trocas": trocas}
         except Exception as e:
             return {"success": False, "error": str(e)}
     
-    def send_message(self, remetente: str, destinatario: str, texto: str, 
+    @staticmethod
+    async def _referencias(mensagens: List[Dict[str, Any]]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Tirar a troca embutida de cada mensagem e devolver cartas e trocas
+        da página uma vez só, indexadas por QRCode e por id
+        """
+        trocas = {}
+        qrcodes = set()
+        for mensagem in mensagens:
+            troca = mensagem.pop("troca_ref", None)
+            if troca:
+                trocas[str(troca["id"])] = troca
+                qrcodes.update((troca.get("cartaoferecida"), troca.get("cartasolicitada")))
+            qrcodes.add(mensagem.get("carta"))
+        
+        cartas = {
+            qrcode: {campo: carta.get(campo) for campo in ("qrcode", "nome", "raridade", "imagem", "localizacao")}
+            for qrcode, carta in (await card_catalog.get_many(qrcodes)).items()
+        }
+        return cartas, trocas
+    
+    async def send_message(self, remetente: str, destinatario: str, texto: str, 
                     tipo: str = "texto", carta: str = None, troca_id: int = None) -> Dict[str, Any]:
         """Enviar uma mensagem (texto, carta ou troca)"""
         try:
@@ -142,71 +208,94 @@ class MensagemModel:
             if troca_id:
                 mensagem_data["trocaid"] = troca_id
             
-            result = self.db.table("mensagem").insert(mensagem_data).execute()
+            result = await self.db.table("mensagem").insert(mensagem_data).execute()
             
             if hasattr(result, 'error') and result.error:
                 raise Exception(f"Erro ao enviar mensagem: {result.error}")
             
-            return {"success": True, "data": result.data[0] if result.data else None}
+            mensagem = result.data[0] if result.data else None
+            await self._notificar(mensagem)
+            
+            return {"success": True, "data": mensagem}
         except Exception as e:
             return {"success": False, "error": str(e)}
     
-    def get_user_chats(self, usuario: str) -> Dict[str, Any]:
-        """Buscar lista de chats do usuário com última mensagem"""
+    async def get_user_chats(self, usuario: str, limit: int = 50, offset: int = 0) -> Dict[str, Any]:
+        """Buscar lista de chats do usuário com última mensagem (resumo em chat)"""
         try:
-            # Buscar todas as mensagens do usuário
-            result = (self.db.table("mensagem")
-                     .select("""
-                         remetente,
-                         destinatario,
-                         datahora,
-                         texto,
-                         tipo
-                     """)
-                     .or_(f"remetente.eq.{usuario},destinatario.eq.{usuario}")
-                     .order("datahora", desc=True)
-                     .execute())
-            
-            if hasattr(result, 'error') and result.error:
-                raise Exception(f"Erro ao buscar chats: {result.error}")
-            
-            # Agrupar por contato
-            chats = {}
-            for mensagem in result.data:
-                if mensagem["remetente"] == usuario:
-                    contato = mensagem["destinatario"]
-                else:
-                    contato = mensagem["remetente"]
-                
-                if contato not in chats:
-                    chats[contato] = {
-                        "contato": contato,
-                        "ultima_mensagem": mensagem["texto"],
-                        "ultima_data": mensagem["datahora"],
-                        "tipo": mensagem["tipo"]
+            if self.direct:
+                resumos = await self.direct.get_user_chats(usuario, limit, offset)
+            else:
+                result = await self.db.rpc("chats_usuario", {
+                    "p_usuario": usuario,
+                    "p_limit": limit,
+                    "p_offset": offset
+                }).execute()
+                resumos = result.data or []
+            
+            chat_list = [
+                {
+                    "contato": resumo["contato"],
+                    "ultima_mensagem": resumo["ultima_mensagem"],
+                    "ultima_data": resumo["ultima_data"],
+                    "tipo": resumo["tipo"],
+                    "ultimo_remetente": resumo["ultimo_remetente"],
+                    "nao_lidas": resumo["nao_lidas"],
+                    "contato_lido_em": resumo.get("contato_lido_em"),
+                    "contato_info": {
+                        "nickname": resumo["contato"],
+                        "fotoperfil": resumo["fotoperfil"],
+                        "nivel": resumo["nivel"]
                     }
-            
-            # Buscar informações dos contatos
-            chat_list = []
-            for chat in chats.values():
-                contato_info = (self.db.table("usuario")
-                              .select("nickname, fotoperfil, nivel")
-                              .eq("nickname", chat["contato"])
-                              .single()
-                              .execute())
-                
-                if contato_info.data:
-                    chat["contato_info"] = contato_info.data
-                    chat_list.append(chat)
-            
-            # Ordenar por data da última mensagem
-            chat_list.sort(key=lambda x: x["ultima_data"], reverse=True)
+                }
+                for resumo in resumos
+            ]
             
             return {"success": True, "data": chat_list}
         except Exception as e:
             return {"success": False, "error": str(e)}
     
-    def enviar_mensagem_texto(self, remetente: str, destinatario: str, texto: str) -> Dict[str, Any]:
+    async def marcar_como_lidas(self, usuario: str, contato: str) -> Dict[str, Any]:
+        """Marcar a conversa com o contato como lida (zera as não lidas do par)"""
+        try:
+            if self.direct:
+                leitura = await self.direct.marcar_chat_lido(usuario, contato)
+            else:
+                result = await self.db.rpc("marcar_chat_lido", {
+                    "p_usuario": usuario,
+                    "p_contato": contato
+                }).execute()
+                leitura = result.data[0] if result.data else None
+            
+            if not leitura:
+                raise Exception("Erro ao marcar mensagens como lidas")
+            
+            # Outras sessões do leitor atualizam o badge; o contato vê a confirmação
+            await publicar([usuario, contato], "leitura", {
+                "leitor": usuario,
+                "contato": contato,
+                "lido_em": leitura["lido_em"]
+            })
+            
+            return {"success": True, "data": leitura}
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+    
+    async def get_nao_lidas_total(self, usuario: str) -> Dict[str, Any]:
+        """Total de mensagens não lidas do usuário (contador em usuario)"""
+        try:
+            result = await (self.db.table("usuario")
+                            .select("nao_lidas_total")
+                            .eq("nickname", usuario)
+                            .limit(1)
+                            .execute())
+            
+            total = (result.data[0].get("nao_lidas_total") or 0) if result.data else 0
+            return {"success": True, "data": {"nao_lidas_total": total}}
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+    
+    async def enviar_mensagem_texto(self, remetente: str, destinatario: str, texto: str) -> Dict[str, Any]:
         """Enviar uma mensagem de texto simples"""
         try:
             mensagem_data = {
@@ -217,30 +306,26 @@ class MensagemModel:
                 "datahora": datetime.now().isoformat()
             }
             
-            result = self.db.table("mensagem").insert(mensagem_data).execute()
+            result = await self.db.table("mensagem").insert(mensagem_data).execute()
             
             if hasattr(result, 'error') and result.error:
                 raise Exception(f"Erro ao enviar mensagem: {result.error}")
             
-            return {"success": True, "data": result.data[0] if result.data else None}
+            mensagem = result.data[0] if result.data else None
+            await self._notificar(mensagem)
+            
+            return {"success": True, "data": mensagem}
         except Exception as e:
             return {"success": False, "error": str(e)}
     
-    def enviar_mensagem_troca(self, remetente: str, destinatario: str, troca_id: int, 
+    async def enviar_mensagem_troca(self, remetente: str, destinatario: str, troca_id: int, 
                               carta_oferecida: str, carta_solicitada: str) -> Dict[str, Any]:
         """Enviar uma mensagem com proposta de troca"""
         try:
-            # Buscar nomes das cartas
-            carta_of_result = self.db.table("carta").select("*").eq("qrcode", carta_oferecida).single().execute()
-            carta_sol_result = self.db.table("carta").select("*").eq("qrcode", carta_solicitada).single().execute()
-            
-            carta_of_nome = f"Carta {carta_oferecida}"
-            carta_sol_nome = f"Carta {carta_solicitada}"
-            
-            if carta_of_result.data:
-                carta_of_nome = self._get_nome_carta(carta_oferecida)
-            if carta_sol_result.data:
-                carta_sol_nome = self._get_nome_carta(carta_solicitada)
+            # Nomes das duas cartas numa consulta ao catálogo em memória
+            cartas = await card_catalog.get_many((carta_oferecida, carta_solicitada))
+            carta_of_nome = cartas[carta_oferecida]["nome"] if carta_oferecida in cartas else nome_padrao(carta_oferecida)
+            carta_sol_nome = cartas[carta_solicitada]["nome"] if carta_solicitada in cartas else nome_padrao(carta_solicitada)
             
             texto = f"💱 Proposta de troca: {carta_of_nome} por {carta_sol_nome}"
             
@@ -253,20 +338,23 @@ class MensagemModel:
                 "datahora": datetime.now().isoformat()
             }
             
-            result = self.db.table("mensagem").insert(mensagem_data).execute()
+            result = await self.db.table("mensagem").insert(mensagem_data).execute()
             
             if hasattr(result, 'error') and result.error:
                 raise Exception(f"Erro ao enviar mensagem de troca: {result.error}")
             
-            return {"success": True, "data": result.data[0] if result.data else None}
+            mensagem = result.data[0] if result.data else None
+            await self._notificar(mensagem)
+            
+            return {"success": True, "data": mensagem}
         except Exception as e:
             return {"success": False, "error": str(e)}
     
-    def enviar_mensagem_carta(self, remetente: str, destinatario: str, qrcode: str, 
+    async def enviar_mensagem_carta(self, remetente: str, destinatario: str, qrcode: str, 
                               texto: str = "") -> Dict[str, Any]:
         """Enviar uma mensagem compartilhando uma carta"""
         try:
-            nome_carta = self._get_nome_carta(qrcode)
+            nome_carta = await card_catalog.nome(qrcode)
             texto_final = f"🃏 {nome_carta}" + (f": {texto}" if texto else "")
             
             mensagem_data = {
@@ -278,33 +366,14 @@ class MensagemModel:
                 "datahora": datetime.now().isoformat()
             }
             
-            result = self.db.table("mensagem").insert(mensagem_data).execute()
+            result = await self.db.table("mensagem").insert(mensagem_data).execute()
             
             if hasattr(result, 'error') and result.error:
                 raise Exception(f"Erro ao enviar mensagem com carta: {result.error}")
             
-            return {"success": True, "data": result.data[0] if result.data else None}
+            mensagem = result.data[0] if result.data else None
+            await self._notificar(mensagem)
+            
+            return {"success": True, "data": mensagem}
         except Exception as e:
             return {"success": False, "error": str(e)}
-    
-    def _get_nome_carta(self, qrcode: str) -> str:
-        """Obter nome da carta"""
-        cartas_nomes = {
-            'QR001': 'Framboyant Dourado',
-            'QR002': 'Pau-Brasil Histórico', 
-            'QR003': 'Pau-Formiga Guardião',
-            'QR004': 'Cuieté Majestoso',
-            'QR005': 'Abricó-de-Macaco',
-            'QR006': 'Sol Radiante',
-            'QR007': 'Júpiter Colossal',
-            'QR008': 'Saturno dos Anéis',
-            'QR009': 'Urano Místico',
-            'QR010': 'Netuno Tempestuoso',
-            'QR011': 'Plutão Distante',
-            '1': 'Framboyant Dourado',
-            '2': 'Pau-Brasil Histórico',
-            '3': 'Pau-Formiga Guardião',
-            '4': 'Cuieté Majestoso',
-            '5': 'Abricó-de-Macaco'
-        }
-        return cartas_nomes.get(qrcode, f"Carta {qrcode}")
@@ -1,24 +1,24 @@
 from typing import Dict, Any
-from config.database import get_database
+from config.database import get_async_database
 
 class ParticipaQuantidadeModel:
     def __init__(self):
-        self.db = get_database()
+        self.db = get_async_database()
 
-    def create(self, data: Dict[str, Any]) -> Dict[str, Any]:
+    async def create(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Criar nova participação (quantidade)"""
         try:
-            result = self.db.table("participaquantidade").insert(data).execute()
+            result = await self.db.table("participaquantidade").insert(data).execute()
             if hasattr(result, 'error') and result.error:
                 raise Exception(f"Erro ao criar participação: {result.error}")
             return {"success": True, "data": result.data[0] if result.data else None}
         except Exception as e:
             return {"success": False, "error": str(e)}
 
-    def find_by_usuario_codigo(self, usuario: str, codigo: int) -> Dict[str, Any]:
+    async def find_by_usuario_codigo(self, usuario: str, codigo: int) -> Dict[str, Any]:
         """Buscar participação por usuário e código"""
         try:
-            result = self.db.table("participaquantidade").select("*") \
+            result = await self.db.table("participaquantidade").select("*") \
                 .eq("usuario", usuario).eq("codigo", codigo).single().execute()
             if not result.data:
                 return {"success": False, "error": "Participação não encontrada"}
@@ -26,18 +26,18 @@ class ParticipaQuantidadeModel:
         except Exception as e:
             return {"success": False, "error": str(e)}
 
-    def find_all(self) -> Dict[str, Any]:
+    async def find_all(self) -> Dict[str, Any]:
         """Buscar todas as participações"""
         try:
-            result = self.db.table("participaquantidade").select("*").execute()
+            result = await self.db.table("participaquantidade").select("*").execute()
             return {"success": True, "data": result.data}
         except Exception as e:
             return {"success": False, "error": str(e)}
 
-    def update(self, usuario: str, codigo: int, update_data: Dict[str, Any]) -> Dict[str, Any]:
+    async def update(self, usuario: str, codigo: int, update_data: Dict[str, Any]) -> Dict[str, Any]:
         """Atualizar participação"""
         try:
-            result = self.db.table("participaquantidade").update(update_data) \
+            result = await self.db.table("participaquantidade").update(update_data) \
                 .eq("usuario", usuario).eq("codigo", codigo).execute()
             if hasattr(result, 'error') and result.error:
                 raise Exception(f"Erro ao atualizar participação: {result.error}")
@@ -47,10 +47,10 @@ class ParticipaQuantidadeModel:
         except Exception as e:
             return {"success": False, "error": str(e)}
 
-    def delete(self, usuario: str, codigo: int) -> Dict[str, Any]:
+    async def delete(self, usuario: str, codigo: int) -> Dict[str, Any]:
         """Deletar participação"""
         try:
-            result = self.db.table("participaquantidade").delete() \
+            result = await self.db.table("participaquantidade").delete() \
                 .eq("usuario", usuario).eq("codigo", codigo).execute()
             if hasattr(result, 'error') and result.error:
                 raise Exception(f"Erro ao deletar participação: {result.error}")
@@ -1,76 +1,95 @@
 from typing import List, Optional, Dict, Any
-from config.database import get_database
+from config.database import get_async_database
+from services.identity import identity_cache
+from services.dataloader import load, forget
 
 class PessoaModel:
     def __init__(self):
-        self.db = get_database()
+        self.db = get_async_database()
     
-    def create(self, pessoa_data: Dict[str, Any]) -> Dict[str, Any]:
+    async def create(self, pessoa_data: Dict[str, Any]) -> Dict[str, Any]:
         """Criar uma nova pessoa"""
         try:
-            result = self.db.table("pessoa").insert(pessoa_data).execute()
+            result = await self.db.table("pessoa").insert(pessoa_data).execute()
             
             if hasattr(result, 'error') and result.error:
                 raise Exception(f"Erro ao criar pessoa: {result.error}")
             
+            forget("pessoa.nickname", pessoa_data.get("nickname"))
+            forget("pessoa.email", pessoa_data.get("email"))
+            
             return {"success": True, "data": result.data[0] if result.data else None}
         except Exception as e:
             return {"success": False, "error": str(e)}
     
-    def find_by_nickname(self, nickname: str) -> Dict[str, Any]:
+    async def find_by_nickname(self, nickname: str) -> Dict[str, Any]:
         """Buscar pessoa por nickname"""
         try:
-            result = self.db.table("pessoa").select("*").eq("nickname", nickname).single().execute()
+            data = await load("pessoa.nickname", self._find_by_nicknames, nickname)
             
-            if not result.data:
+            if not data:
                 return {"success": False, "error": "Pessoa não encontrada"}
             
-            return {"success": True, "data": result.data}
+            return {"success": True, "data": dict(data)}
         except Exception as e:
             return {"success": False, "error": str(e)}
     
-    def find_all(self, limit: Optional[int] = None) -> Dict[str, Any]:
+    async def find_all(self, limit: Optional[int] = None) -> Dict[str, Any]:
         """Buscar todas as pessoas"""
         try:
             query = self.db.table("pessoa").select("*")
             if limit:
                 query = query.limit(limit)
             
-            result = query.execute()
+            result = await query.execute()
             
             return {"success": True, "data": result.data}
         except Exception as e:
             return {"success": False, "error": str(e)}
     
-    def find_by_email(self, email: str) -> Dict[str, Any]:
+    async def find_by_email(self, email: str) -> Dict[str, Any]:
         """Buscar pessoa por email"""
         try:
-            result = self.db.table("pessoa").select("*").eq("email", email).single().execute()
+            data = await load("pessoa.email", self._find_by_emails, email)
             
-            if not result.data:
+            if not data:
                 return {"success": False, "error": "Pessoa não encontrada"}
             
-            return {"success": True, "data": result.data}
+            return {"success": True, "data": dict(data)}
         except Exception as e:
             return {"success": False, "error": str(e)}
     
-    def find_by_tipo(self, tipo: str) -> Dict[str, Any]:
+    async def _find_by_nicknames(self, nicknames: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Buscar várias pessoas por nickname numa única consulta (DataLoader do request)"""
+        result = await self.db.table("pessoa").select("*").in_("nickname", nicknames).execute()
+        return {row["nickname"]: row for row in result.data}
+    
+    async def _find_by_emails(self, emails: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Buscar várias pessoas por email numa única consulta (DataLoader do request)"""
+        result = await self.db.table("pessoa").select("*").in_("email", emails).execute()
+        return {row["email"]: row for row in result.data}
+    
+    async def find_by_tipo(self, tipo: str) -> Dict[str, Any]:
         """Buscar pessoas por tipo"""
         try:
-            result = self.db.table("pessoa").select("*").eq("tipo", tipo).execute()
+            result = await self.db.table("pessoa").select("*").eq("tipo", tipo).execute()
             
             return {"success": True, "data": result.data}
         except Exception as e:
             return {"success": False, "error": str(e)}
     
-    def update(self, nickname: str, update_data: Dict[str, Any]) -> Dict[str, Any]:
+    async def update(self, nickname: str, update_data: Dict[str, Any]) -> Dict[str, Any]:
         """Atualizar pessoa"""
         try:
-            result = self.db.table("pessoa").update(update_data).eq("nickname", nickname).execute()
+            result = await self.db.table("pessoa").update(update_data).eq("nickname", nickname).execute()
             
             if hasattr(result, 'error') and result.error:
                 raise Exception(f"Erro ao atualizar pessoa: {result.error}")
             
+            identity_cache.invalidate_nickname(nickname)
+            forget("pessoa.nickname", nickname)
+            forget("pessoa.email")
+            
             if not result.data:
                 return {"success": False, "error": "Pessoa não encontrada"}
             
@@ -78,14 +97,18 @@ class PessoaModel:
         except Exception as e:
             return {"success": False, "error": str(e)}
     
-    def delete(self, nickname: str) -> Dict[str, Any]:
+    async def delete(self, nickname: str) -> Dict[str, Any]:
         """Deletar pessoa"""
         try:
-            result = self.db.table("pessoa").delete().eq("nickname", nickname).execute()
+            result = await self.db.table("pessoa").delete().eq("nickname", nickname).execute()
             
             if hasattr(result, 'error') and result.error:
                 raise Exception(f"Erro ao deletar pessoa: {result.error}")
             
+            identity_cache.invalidate_nickname(nickname)
+            forget("pessoa.nickname", nickname)
+            forget("pessoa.email")
+            
             return {"success": True, "message": "Pessoa deletada com sucesso"}
         except Exception as e:
             return {"success": False, "error": str(e)}
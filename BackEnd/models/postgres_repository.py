@@ -0,0 +1,171 @@
+import json
+import time
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Dict, List, Optional
+from config.postgres_pool import get_pool
+from services.db_metrics import record_query
+
+
+def _to_json(value: Any) -> Any:
+    """Converter tipos do asyncpg para o mesmo formato devolvido pelo PostgREST"""
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def _row(record, prefix: str = "") -> Optional[Dict[str, Any]]:
+    """Extrair colunas (opcionalmente com prefixo) de um registro"""
+    if prefix:
+        data = {k[len(prefix):]: _to_json(v) for k, v in record.items() if k.startswith(prefix)}
+        return data if any(v is not None for v in data.values()) else None
+    return {k: _to_json(v) for k, v in record.items()}
+
+
+class PostgresRepository:
+    """
+    Consultas das rotas mais acessadas executadas direto no Postgres via pool.
+
+    Devolve os mesmos formatos (inclusive os objetos embutidos) que as
+    consultas equivalentes do PostgREST, para que os models possam alternar
+    entre os dois backends por tabela.
+    """
+
+    COLETA_USUARIO = """
+        SELECT qrcode, quantidade
+        FROM coleta
+        WHERE usuario = $1
+    """
+
+    LEADERBOARD = """
+        SELECT nickname, ranking, xp, nivel, qtdcartas
+        FROM usuario
+        ORDER BY xp DESC, nickname
+        LIMIT $1
+    """
+
+    COLETAR_CARTA = """
+        SELECT * FROM coletar_carta($1, $2, $3, $4)
+    """
+
+    COLETAR_CARTAS_LOTE = """
+        SELECT coletar_cartas_lote($1, $2::jsonb) AS resultado
+    """
+
+    XP_USUARIOS = """
+        SELECT nickname, xp
+        FROM usuario
+    """
+
+    # Página de mensagens por keyset (datahora, remetente): cada sentido da
+    # conversa percorre a chave primária (remetente, destinatario, datahora).
+    # Como o remetente é fixo em cada ramo, o cursor ($4, $5) vira um limite
+    # em datahora, usado como condição de índice; o desempate pelo remetente
+    # é uma constante do ramo.
+    CHAT_MENSAGENS = """
+        WITH pagina AS (
+            (SELECT * FROM mensagem
+             WHERE remetente = $1 AND destinatario = $2{cursor1}
+             ORDER BY datahora {ordem}
+             LIMIT $3)
+            UNION ALL
+            (SELECT * FROM mensagem
+             WHERE remetente = $2 AND destinatario = $1 AND $1 <> $2{cursor2}
+             ORDER BY datahora {ordem}
+             LIMIT $3)
+        )
+        SELECT m.*,
+               t.id AS troca_ref__id, t.status AS troca_ref__status,
+               t.cartaoferecida AS troca_ref__cartaoferecida,
+               t.cartasolicitada AS troca_ref__cartasolicitada
+        FROM pagina m
+        LEFT JOIN trocacarta t ON t.id = m.trocaid
+        ORDER BY m.datahora {ordem}, m.remetente {ordem}
+        LIMIT $3
+    """
+    _CURSOR = """
+               AND datahora {c}= $4::timestamp
+               AND (datahora {c} $4::timestamp OR {remetente}::varchar {c} $5::varchar)"""
+    CHAT_MENSAGENS_RECENTES = CHAT_MENSAGENS.format(cursor1="", cursor2="", ordem="DESC")
+    CHAT_MENSAGENS_ANTES = CHAT_MENSAGENS.format(
+        cursor1=_CURSOR.format(c="<", remetente="$1"), cursor2=_CURSOR.format(c="<", remetente="$2"), ordem="DESC")
+    CHAT_MENSAGENS_DEPOIS = CHAT_MENSAGENS.format(
+        cursor1=_CURSOR.format(c=">", remetente="$1"), cursor2=_CURSOR.format(c=">", remetente="$2"), ordem="ASC")
+
+    CHATS_USUARIO = """
+        SELECT * FROM chats_usuario($1, $2, $3)
+    """
+
+    MARCAR_CHAT_LIDO = """
+        SELECT * FROM marcar_chat_lido($1, $2)
+    """
+
+    async def _fetch(self, nome: str, query: str, *args) -> List[Any]:
+        inicio = time.perf_counter()
+        try:
+            pool = await get_pool()
+            async with pool.acquire() as conn:
+                return await conn.fetch(query, *args)
+        finally:
+            record_query(f"SQL {nome}", time.perf_counter() - inicio)
+
+    async def get_coleta_usuario(self, usuario: str) -> List[Dict[str, Any]]:
+        """Buscar QRCodes e quantidades coletadas pelo usuário"""
+        rows = await self._fetch("COLETA_USUARIO", self.COLETA_USUARIO, usuario)
+        return [_row(r) for r in rows]
+
+    async def coletar_carta(self, usuario: str, qrcode: str, quantidade: int, xp: int) -> Optional[Dict[str, Any]]:
+        """Executar a coleta atômica e devolver o estado final do usuário"""
+        rows = await self._fetch("COLETAR_CARTA", self.COLETAR_CARTA, usuario, qrcode, quantidade, xp)
+        return _row(rows[0]) if rows else None
+
+    async def coletar_cartas_lote(self, usuario: str, itens: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Executar a coleta em lote e devolver itens gravados e estado do usuário"""
+        rows = await self._fetch("COLETAR_CARTAS_LOTE", self.COLETAR_CARTAS_LOTE, usuario, json.dumps(itens))
+        return json.loads(rows[0]["resultado"]) if rows and rows[0]["resultado"] else None
+
+    async def get_leaderboard(self, limit: int) -> List[Dict[str, Any]]:
+        """Buscar usuários ordenados por XP"""
+        rows = await self._fetch("LEADERBOARD", self.LEADERBOARD, limit)
+        return [_row(r) for r in rows]
+
+    async def get_xp_usuarios(self) -> List[Dict[str, Any]]:
+        """Buscar o XP de todos os usuários (carga do índice de ranking)"""
+        rows = await self._fetch("XP_USUARIOS", self.XP_USUARIOS)
+        return [_row(r) for r in rows]
+
+    async def get_user_chats(self, usuario: str, limit: int, offset: int) -> List[Dict[str, Any]]:
+        """Buscar resumos de conversa do usuário com dados do contato"""
+        rows = await self._fetch("CHATS_USUARIO", self.CHATS_USUARIO, usuario, limit, offset)
+        return [_row(r) for r in rows]
+
+    async def marcar_chat_lido(self, usuario: str, contato: str) -> Optional[Dict[str, Any]]:
+        """Zerar as não lidas da conversa e devolver o total restante do usuário"""
+        rows = await self._fetch("MARCAR_CHAT_LIDO", self.MARCAR_CHAT_LIDO, usuario, contato)
+        return _row(rows[0]) if rows else None
+
+    async def get_chat_messages(self, usuario1: str, usuario2: str, limit: int,
+                                antes: Optional[tuple] = None, depois: Optional[tuple] = None) -> List[Dict[str, Any]]:
+        """
+        Buscar mensagens entre dois usuários com a troca embutida.
+
+        Sem `depois`, devolve as mais recentes (anteriores a `antes`, se dado)
+        da mais nova para a mais antiga; com `depois`, as seguintes ao cursor
+        em ordem crescente.
+        """
+        if depois:
+            nome, query, cursor = "CHAT_MENSAGENS_DEPOIS", self.CHAT_MENSAGENS_DEPOIS, depois
+        elif antes:
+            nome, query, cursor = "CHAT_MENSAGENS_ANTES", self.CHAT_MENSAGENS_ANTES, antes
+        else:
+            nome, query, cursor = "CHAT_MENSAGENS_RECENTES", self.CHAT_MENSAGENS_RECENTES, None
+        args = (datetime.fromisoformat(cursor[0]), cursor[1]) if cursor else ()
+        rows = await self._fetch(nome, query, usuario1, usuario2, limit, *args)
+        mensagens = []
+        for r in rows:
+            mensagem = {k: _to_json(v) for k, v in r.items() if "__" not in k}
+            mensagem["troca_ref"] = _row(r, "troca_ref__")
+            mensagens.append(mensagem)
+        return mensagens
@@ -1,23 +1,24 @@
+import asyncio
 from typing import Dict, Any, List
-from config.database import get_database
+from config.database import get_async_database
 
 class TrocaModel:
     def __init__(self):
-        self.db = get_database()
+        self.db = get_async_database()
     
-    def criar_proposta_troca(self, solicitante: str, destinatario: str, 
+    async def criar_proposta_troca(self, solicitante: str, destinatario: str, 
                             carta_oferecida: str, carta_solicitada: str) -> Dict[str, Any]:
         """Criar uma nova proposta de troca"""
         try:
-            # Verificar se o solicitante possui a carta oferecida
-            coleta_result = self.db.table("coleta").select("quantidade").eq("usuario", solicitante).eq("qrcode", carta_oferecida).execute()
+            # Verificar em paralelo se cada lado possui a carta envolvida
+            coleta_result, coleta_destinatario = await asyncio.gather(
+                self.db.table("coleta").select("quantidade").eq("usuario", solicitante).eq("qrcode", carta_oferecida).execute(),
+                self.db.table("coleta").select("quantidade").eq("usuario", destinatario).eq("qrcode", carta_solicitada).execute()
+            )
             
             if not coleta_result.data or coleta_result.data[0]["quantidade"] < 1:
                 return {"success": False, "error": "Você não possui esta carta para trocar"}
             
-            # Verificar se o destinatário possui a carta solicitada
-            coleta_destinatario = self.db.table("coleta").select("quantidade").eq("usuario", destinatario).eq("qrcode", carta_solicitada).execute()
-            
             if not coleta_destinatario.data or coleta_destinatario.data[0]["quantidade"] < 1:
                 return {"success": False, "error": "O destinatário não possui a carta solicitada"}
             
@@ -31,7 +32,7 @@ class TrocaModel:
                 "datasolicitacao": "now()"
             }
             
-            result = self.db.table("trocacarta").insert(troca_data).execute()
+            result = await self.db.table("trocacarta").insert(troca_data).execute()
             
             if hasattr(result, 'error') and result.error:
                 raise Exception(f"Erro ao criar proposta de troca: {result.error}")
@@ -40,14 +41,14 @@ class TrocaModel:
         except Exception as e:
             return {"success": False, "error": str(e)}
     
-    def responder_troca(self, troca_id: int, resposta: str, usuario: str) -> Dict[str, Any]:
+    async def responder_troca(self, troca_id: int, resposta: str, usuario: str) -> Dict[str, Any]:
         """Aceitar ou rejeitar uma proposta de troca"""
         try:
             if resposta not in ["aceita", "rejeitada"]:
                 return {"success": False, "error": "Resposta deve ser 'aceita' ou 'rejeitada'"}
             
             # Buscar detalhes da troca
-            troca_result = self.db.table("trocacarta").select("*").eq("id", troca_id).single().execute()
+            troca_result = await self.db.table("trocacarta").select("*").eq("id", troca_id).single().execute()
             
             if not troca_result.data:
                 return {"success": False, "error": "Proposta de troca não encontrada"}
@@ -63,7 +64,7 @@ class TrocaModel:
                 return {"success": False, "error": "Esta troca já foi respondida"}
             
             # Atualizar status da troca
-            update_result = self.db.table("trocacarta").update({
+            update_result = await self.db.table("trocacarta").update({
                 "status": resposta,
                 "dataresposta": "now()"
             }).eq("id", troca_id).execute()
@@ -73,14 +74,14 @@ class TrocaModel:
             
             # Se aceita, executar a troca
             if resposta == "aceita":
-                return self._executar_troca(troca)
+                return await self._executar_troca(troca)
             
             return {"success": True, "data": update_result.data[0] if update_result.data else None}
             
         except Exception as e:
             return {"success": False, "error": str(e)}
     
-    def _executar_troca(self, troca: Dict[str, Any]) -> Dict[str, Any]:
+    async def _executar_troca(self, troca: Dict[str, Any]) -> Dict[str, Any]:
         """Executar a troca das cartas entre os usuários"""
         try:
             solicitante = troca["solicitante"]
@@ -89,42 +90,42 @@ class TrocaModel:
             carta_solicitada = troca["cartasolicitada"]
             
             # Remover carta oferecida do solicitante
-            self.db.table("coleta").update({
+            await self.db.table("coleta").update({
                 "quantidade": "quantidade - 1"
             }).eq("usuario", solicitante).eq("qrcode", carta_oferecida).execute()
             
             # Remover carta solicitada do destinatário
-            self.db.table("coleta").update({
+            await self.db.table("coleta").update({
                 "quantidade": "quantidade - 1"
             }).eq("usuario", destinatario).eq("qrcode", carta_solicitada).execute()
             
             # Adicionar carta solicitada ao solicitante
-            coleta_solicitante = self.db.table("coleta").select("quantidade").eq("usuario", solicitante).eq("qrcode", carta_solicitada).execute()
+            coleta_solicitante = await self.db.table("coleta").select("quantidade").eq("usuario", solicitante).eq("qrcode", carta_solicitada).execute()
             
             if coleta_solicitante.data:
                 # Já possui, incrementar quantidade
-                self.db.table("coleta").update({
+                await self.db.table("coleta").update({
                     "quantidade": "quantidade + 1"
                 }).eq("usuario", solicitante).eq("qrcode", carta_solicitada).execute()
             else:
                 # Não possui, criar nova entrada
-                self.db.table("coleta").insert({
+                await self.db.table("coleta").insert({
                     "usuario": solicitante,
                     "qrcode": carta_solicitada,
                     "quantidade": 1
                 }).execute()
             
             # Adicionar carta oferecida ao destinatário
-            coleta_destinatario = self.db.table("coleta").select("quantidade").eq("usuario", destinatario).eq("qrcode", carta_oferecida).execute()
+            coleta_destinatario = await self.db.table("coleta").select("quantidade").eq("usuario", destinatario).eq("qrcode", carta_oferecida).execute()
             
             if coleta_destinatario.data:
                 # Já possui, incrementar quantidade
-                self.db.table("coleta").update({
+                await self.db.table("coleta").update({
                     "quantidade": "quantidade + 1"
                 }).eq("usuario", destinatario).eq("qrcode", carta_oferecida).execute()
             else:
                 # Não possui, criar nova entrada
-                self.db.table("coleta").insert({
+                await self.db.table("coleta").insert({
                     "usuario": destinatario,
                     "qrcode": carta_oferecida,
                     "quantidade": 1
@@ -135,10 +136,10 @@ class TrocaModel:
         except Exception as e:
             return {"success": False, "error": f"Erro ao executar troca: {str(e)}"}
     
-    def listar_trocas_pendentes(self, usuario: str) -> Dict[str, Any]:
+    async def listar_trocas_pendentes(self, usuario: str) -> Dict[str, Any]:
         """Listar trocas pendentes para um usuário"""
         try:
-            result = self.db.table("trocacarta").select("""
+            result = await self.db.table("trocacarta").select("""
                 *,
                 carta_oferecida:cartaoferecida(qrcode, raridade, imagem, localizacao),
                 carta_solicitada:cartasolicitada(qrcode, raridade, imagem, localizacao),
@@ -155,11 +156,11 @@ class TrocaModel:
         except Exception as e:
             return {"success": False, "error": str(e)}
     
-    def cancelar_troca(self, troca_id: int, usuario: str) -> Dict[str, Any]:
+    async def cancelar_troca(self, troca_id: int, usuario: str) -> Dict[str, Any]:
         """Cancelar uma proposta de troca"""
         try:
             # Buscar detalhes da troca
-            troca_result = self.db.table("trocacarta").select("*").eq("id", troca_id).single().execute()
+            troca_result = await self.db.table("trocacarta").select("*").eq("id", troca_id).single().execute()
             
             if not troca_result.data:
                 return {"success": False, "error": "Proposta de troca não encontrada"}
@@ -175,7 +176,7 @@ class TrocaModel:
                 return {"success": False, "error": "Esta troca não pode ser cancelada"}
             
             # Atualizar status para cancelada
-            result = self.db.table("trocacarta").update({
+            result = await self.db.table("trocacarta").update({
                 "status": "cancelada",
                 "dataresposta": "now()"
             }).eq("id", troca_id).execute()
@@ -188,10 +189,10 @@ class TrocaModel:
         except Exception as e:
             return {"success": False, "error": str(e)}
     
-    def historico_trocas(self, usuario: str, limite: int = 20) -> Dict[str, Any]:
+    async def historico_trocas(self, usuario: str, limite: int = 20) -> Dict[str, Any]:
         """Buscar histórico de trocas de um usuário"""
         try:
-            result = self.db.table("trocacarta").select("""
+            result = await self.db.table("trocacarta").select("""
                 *,
                 carta_oferecida:cartaoferecida(qrcode, raridade, imagem, localizacao),
                 carta_solicitada:cartasolicitada(qrcode, raridade, imagem, localizacao),
@@ -1,42 +1,53 @@
 from typing import List, Optional, Dict, Any
-from config.database import get_database
+from config.database import get_async_database
+from services.dataloader import load, forget
+from services.xp_events import xp_alterado
 
 class UsuarioModel:
     def __init__(self):
-        self.db = get_database()
+        self.db = get_async_database()
     
-    def create(self, usuario_data: Dict[str, Any]) -> Dict[str, Any]:
+    async def create(self, usuario_data: Dict[str, Any]) -> Dict[str, Any]:
         """Criar uma nova pessoa"""
         try:
-            result = self.db.table("usuario").insert(usuario_data).execute()
+            result = await self.db.table("usuario").insert(usuario_data).execute()
             
             if hasattr(result, 'error') and result.error:
                 raise Exception(f"Erro ao criar pessoa: {result.error}")
             
+            forget("usuario.nickname", usuario_data.get("nickname"))
+            if result.data:
+                xp_alterado(result.data[0]["nickname"], result.data[0].get("xp"))
+            
             return {"success": True, "data": result.data[0] if result.data else None}
         except Exception as e:
             return {"success": False, "error": str(e)}
     
-    def find_by_nickname(self, nickname: str) -> Dict[str, Any]:
+    async def find_by_nickname(self, nickname: str) -> Dict[str, Any]:
         """Buscar pessoa por nickname"""
         try:
-            result = self.db.table("usuario").select("*").eq("nickname", nickname).single().execute()
+            data = await load("usuario.nickname", self._find_by_nicknames, nickname)
             
-            if not result.data:
+            if not data:
                 return {"success": False, "error": "Pessoa não encontrada"}
             
-            return {"success": True, "data": result.data}
+            return {"success": True, "data": dict(data)}
         except Exception as e:
             return {"success": False, "error": str(e)}
     
-    def find_all(self, limit: Optional[int] = None) -> Dict[str, Any]:
+    async def _find_by_nicknames(self, nicknames: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Buscar vários usuários numa única consulta (usado pelo DataLoader do request)"""
+        result = await self.db.table("usuario").select("*").in_("nickname", nicknames).execute()
+        return {row["nickname"]: row for row in result.data}
+    
+    async def find_all(self, limit: Optional[int] = None) -> Dict[str, Any]:
         """Buscar todas as pessoas"""
         try:
             query = self.db.table("usuario").select("*").order('xp', desc=True)
             if limit:
                 query = query.limit(limit)
             
-            result = query.execute()
+            result = await query.execute()
             
             return {"success": True, "data": result.data}
         except Exception as e:
@@ -50,42 +61,89 @@ class UsuarioModel:
     # Use PessoaModel.find_by_tipo() ao invés deste método
     # def find_by_tipo(self, tipo: str) -> Dict[str, Any]:
     
-    def update(self, nickname: str, update_data: Dict[str, Any]) -> Dict[str, Any]:
+    async def update(self, nickname: str, update_data: Dict[str, Any]) -> Dict[str, Any]:
         """Atualizar pessoa"""
         try:
-            result = self.db.table("usuario").update(update_data).eq("nickname", nickname).execute()
+            result = await self.db.table("usuario").update(update_data).eq("nickname", nickname).execute()
             
             if hasattr(result, 'error') and result.error:
                 raise Exception(f"Erro ao atualizar pessoa: {result.error}")
             
+            forget("usuario.nickname", nickname)
+            
+            if not result.data:
+                return {"success": False, "error": "Pessoa não encontrada"}
+            
+            if "xp" in update_data:
+                xp_alterado(nickname, result.data[0].get("xp"))
+            
+            return {"success": True, "data": result.data[0]}
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+        
+    async def conceder_xp(self, nickname: str, quantidade: int, origem: str = "manual",
+                          referencia: Optional[str] = None) -> Dict[str, Any]:
+        """Somar XP atomicamente no banco e devolver xp, nível e ranking antes e depois"""
+        try:
+            result = await self.db.rpc("conceder_xp", {
+                "p_usuario": nickname,
+                "p_quantidade": quantidade,
+                "p_origem": origem,
+                "p_referencia": referencia
+            }).execute()
+            
             if not result.data:
                 return {"success": False, "error": "Pessoa não encontrada"}
             
+            forget("usuario.nickname", nickname)
+            xp_alterado(nickname, result.data[0]["xp"])
+            
             return {"success": True, "data": result.data[0]}
         except Exception as e:
             return {"success": False, "error": str(e)}
+    
+    async def conceder_xp_lote(self, itens: List[Dict[str, Any]], origem: str = "manual",
+                               referencia: Optional[str] = None) -> Dict[str, Any]:
+        """Somar XP de vários usuários numa única transação (itens: usuario, quantidade)"""
+        try:
+            result = await self.db.rpc("conceder_xp_lote", {
+                "p_itens": itens,
+                "p_origem": origem,
+                "p_referencia": referencia
+            }).execute()
+            
+            for usuario in result.data:
+                forget("usuario.nickname", usuario["nickname"])
+                xp_alterado(usuario["nickname"], usuario["xp"])
+            
+            return {"success": True, "data": result.data}
+        except Exception as e:
+            return {"success": False, "error": str(e)}
         
-    def get_leaderboard(self, limit: Optional[int] = None) -> Dict[str, Any]:
+    async def get_leaderboard(self, limit: Optional[int] = None) -> Dict[str, Any]:
         """Buscar leaderboard de pessoas"""
         try:
             query = self.db.table("usuario").select("*").order("xp", desc=True)
             if limit:
                 query = query.limit(limit)
             
-            result = query.execute()
+            result = await query.execute()
             
             return {"success": True, "data": result.data}
         except Exception as e:
             return {"success": False, "error": str(e)}
         
-    def delete(self, nickname: str) -> Dict[str, Any]:
+    async def delete(self, nickname: str) -> Dict[str, Any]:
         """Deletar pessoa"""
         try:
-            result = self.db.table("usuario").delete().eq("nickname", nickname).execute()
+            result = await self.db.table("usuario").delete().eq("nickname", nickname).execute()
             
             if hasattr(result, 'error') and result.error:
                 raise Exception(f"Erro ao deletar pessoa: {result.error}")
             
+            forget("usuario.nickname", nickname)
+            xp_alterado(nickname, None)
+            
             return {"success": True, "message": "Pessoa deletada com sucesso"}
         except Exception as e:
             return {"success": False, "error": str(e)}
@@ -0,0 +1,25 @@
+from typing import Dict, Any
+from config.database import get_async_database
+
+# Origens aceitas pelo ledger de XP
+ORIGENS_XP = ("coleta", "missao", "troca", "manual")
+
+class XpEventoModel:
+    def __init__(self):
+        self.db = get_async_database()
+
+    async def get_ranking_janela(self, janela: str, limit: int) -> Dict[str, Any]:
+        """Ranking da janela corrente ('dia' ou 'semana'), lido dos rollups"""
+        try:
+            result = await self.db.rpc("ranking_janela", {"p_janela": janela, "p_limit": limit}).execute()
+            return {"success": True, "data": result.data}
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+
+    async def get_ranking_missao(self, codigo: int, limit: int) -> Dict[str, Any]:
+        """Ranking do XP ganho durante o período de uma missão"""
+        try:
+            result = await self.db.rpc("ranking_janela_missao", {"p_codigo": codigo, "p_limit": limit}).execute()
+            return {"success": True, "data": result.data}
+        except Exception as e:
+            return {"success": False, "error": str(e)}
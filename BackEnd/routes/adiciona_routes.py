@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Query, Depends, HTTPException, status
 from typing import Optional, Dict, Any
-from auth.auth_dependency import get_current_user
+from auth.auth_dependency import get_current_user, get_current_principal, Principal
 from controllers.adiciona_controller import (
     AdicionaController, 
     AdicionaCreate, 
@@ -24,9 +24,9 @@ controller = AdicionaController()
         404: {"description": "Usuário não encontrado"}
     }
 )
-def create_solicitacao(
+async def create_solicitacao(
     adiciona_data: AdicionaCreate,
-    current_user: Dict[str, Any] = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ):
     """
     **Enviar solicitação de amizade**
@@ -34,18 +34,9 @@ def create_solicitacao(
     - **usuario2**: Nickname do usuário que receberá a solicitação
     - **status**: Status inicial da solicitação (padrão: "pendente")
     """
-    # Buscar o nickname do usuário atual
-    result = controller.get_user_nickname_by_email(current_user.email)
-    
-    if not result["success"]:
-        raise HTTPException(
-            status_code=404,
-            detail="Usuário autenticado não encontrado na tabela pessoa"
-        )
+    usuario1_nickname = current_user.nickname
     
-    usuario1_nickname = result["data"]["nickname"]
-    
-    result = controller.create_solicitacao(adiciona_data, usuario1_nickname)
+    result = await controller.create_solicitacao(adiciona_data, usuario1_nickname)
     
     if not result["success"]:
         raise HTTPException(
@@ -67,27 +58,18 @@ def create_solicitacao(
         500: {"description": "Erro interno do servidor"}
     }
 )
-def get_solicitacoes_enviadas(
+async def get_solicitacoes_enviadas(
     limit: Optional[int] = Query(None, description="Limite de resultados a retornar", ge=1, le=100),
-    current_user: Dict[str, Any] = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ):
     """
     **Buscar solicitações enviadas**
     
     Retorna todas as solicitações de amizade enviadas pelo usuário autenticado.
     """
-    # Buscar o nickname do usuário atual
-    result = controller.get_user_nickname_by_email(current_user.email)
-    
-    if not result["success"]:
-        raise HTTPException(
-            status_code=404,
-            detail="Usuário autenticado não encontrado na tabela pessoa"
-        )
-    
-    usuario_nickname = result["data"]["nickname"]
+    usuario_nickname = current_user.nickname
     
-    result = controller.get_solicitacoes_enviadas(usuario_nickname, limit)
+    result = await controller.get_solicitacoes_enviadas(usuario_nickname, limit)
     
     if not result["success"]:
         raise HTTPException(
@@ -109,27 +91,18 @@ def get_solicitacoes_enviadas(
         500: {"description": "Erro interno do servidor"}
     }
 )
-def get_solicitacoes_recebidas(
+async def get_solicitacoes_recebidas(
     limit: Optional[int] = Query(None, description="Limite de resultados a retornar", ge=1, le=100),
-    current_user: Dict[str, Any] = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ):
     """
     **Buscar solicitações recebidas**
     
     Retorna todas as solicitações de amizade recebidas pelo usuário autenticado.
     """
-    # Buscar o nickname do usuário atual
-    result = controller.get_user_nickname_by_email(current_user.email)
-    
-    if not result["success"]:
-        raise HTTPException(
-            status_code=404,
-            detail="Usuário autenticado não encontrado na tabela pessoa"
-        )
-    
-    usuario_nickname = result["data"]["nickname"]
+    usuario_nickname = current_user.nickname
     
-    result = controller.get_solicitacoes_recebidas(usuario_nickname, limit)
+    result = await controller.get_solicitacoes_recebidas(usuario_nickname, limit)
     
     if not result["success"]:
         raise HTTPException(
@@ -151,7 +124,7 @@ def get_solicitacoes_recebidas(
         404: {"description": "Solicitação não encontrada"}
     }
 )
-def update_status_solicitacao(
+async def update_status_solicitacao(
     usuario1: str,
     usuario2: str,
     status_data: AdicionaUpdate,
@@ -164,7 +137,7 @@ def update_status_solicitacao(
     - **usuario2**: Nickname do usuário que recebeu a solicitação
     - **status**: Novo status ("pendente", "aceita", "rejeitada")
     """
-    result = controller.update_status_solicitacao(usuario1, usuario2, status_data)
+    result = await controller.update_status_solicitacao(usuario1, usuario2, status_data)
     
     if not result["success"]:
         raise HTTPException(
@@ -185,7 +158,7 @@ def update_status_solicitacao(
         404: {"description": "Solicitação não encontrada"}
     }
 )
-def delete_solicitacao(
+async def delete_solicitacao(
     usuario1: str,
     usuario2: str,
     current_user: Dict[str, Any] = Depends(get_current_user)
@@ -198,7 +171,7 @@ def delete_solicitacao(
     
     ⚠️ **Atenção**: Esta operação é irreversível!
     """
-    result = controller.delete_solicitacao(usuario1, usuario2)
+    result = await controller.delete_solicitacao(usuario1, usuario2)
     
     if not result["success"]:
         raise HTTPException(
@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Query, Depends, HTTPException, Path
 from typing import Optional, Dict, Any
-from auth.auth_dependency import get_current_user
+from auth.auth_dependency import get_current_user, get_current_principal, Principal
 from controllers.amizade_controller import (
     AmizadeController,
     SolicitacaoAmizadeRequest,
@@ -23,26 +23,18 @@ controller = AmizadeController()
         404: {"description": "Usuário destinatário não encontrado"}
     }
 )
-def enviar_solicitacao(
+async def enviar_solicitacao(
     solicitacao_data: SolicitacaoAmizadeRequest,
-    current_user: Dict[str, Any] = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ):
     """
     **Enviar solicitação de amizade**
     
     - **destinatario**: Nickname do usuário para quem enviar a solicitação
     """
-    # Buscar nickname do usuário atual pelo email
-    nickname_result = controller._get_nickname_from_email(current_user.email)
-    if not nickname_result["success"]:
-        raise HTTPException(
-            status_code=nickname_result.get("status_code", 404),
-            detail=nickname_result["error"]
-        )
-    
-    solicitante_nickname = nickname_result["data"]
+    solicitante_nickname = current_user.nickname
     print(f"Solicitante: {solicitante_nickname} - Destinatário: {solicitacao_data.destinatario}")
-    result = controller.enviar_solicitacao(solicitante_nickname, solicitacao_data)
+    result = await controller.enviar_solicitacao(solicitante_nickname, solicitacao_data)
     
     if not result["success"]:
         raise HTTPException(
@@ -63,7 +55,7 @@ def enviar_solicitacao(
         401: {"description": "Token de autenticação inválido ou ausente"}
     }
 )
-def aceitar_solicitacao(
+async def aceitar_solicitacao(
     solicitacao_id: int = Path(..., description="ID da solicitação de amizade"),
     current_user: Dict[str, Any] = Depends(get_current_user)
 ):
@@ -72,7 +64,7 @@ def aceitar_solicitacao(
     
     - **solicitacao_id**: ID da solicitação a ser aceita
     """
-    result = controller.aceitar_solicitacao(solicitacao_id)
+    result = await controller.aceitar_solicitacao(solicitacao_id)
     
     if not result["success"]:
         raise HTTPException(
@@ -93,7 +85,7 @@ def aceitar_solicitacao(
         401: {"description": "Token de autenticação inválido ou ausente"}
     }
 )
-def recusar_solicitacao(
+async def recusar_solicitacao(
     solicitacao_id: int = Path(..., description="ID da solicitação de amizade"),
     current_user: Dict[str, Any] = Depends(get_current_user)
 ):
@@ -102,7 +94,7 @@ def recusar_solicitacao(
     
     - **solicitacao_id**: ID da solicitação a ser recusada
     """
-    result = controller.recusar_solicitacao(solicitacao_id)
+    result = await controller.recusar_solicitacao(solicitacao_id)
     
     if not result["success"]:
         raise HTTPException(
@@ -123,25 +115,17 @@ def recusar_solicitacao(
         401: {"description": "Token de autenticação inválido ou ausente"}
     }
 )
-def remover_amizade(
+async def remover_amizade(
     nickname: str = Path(..., description="Nickname do amigo a ser removido"),
-    current_user: Dict[str, Any] = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ):
     """
     **Remover amizade**
     
     - **nickname**: Nickname do usuário a ser removido da lista de amigos
     """
-    # Buscar nickname do usuário atual pelo email
-    nickname_result = controller._get_nickname_from_email(current_user.email)
-    if not nickname_result["success"]:
-        raise HTTPException(
-            status_code=nickname_result.get("status_code", 404),
-            detail=nickname_result["error"]
-        )
-    
-    usuario_atual = nickname_result["data"]
-    result = controller.remover_amizade(usuario_atual, nickname)
+    usuario_atual = current_user.nickname
+    result = await controller.remover_amizade(usuario_atual, nickname)
     
     if not result["success"]:
         raise HTTPException(
@@ -162,24 +146,16 @@ def remover_amizade(
         500: {"description": "Erro interno do servidor"}
     }
 )
-def listar_meus_amigos(
-    current_user: Dict[str, Any] = Depends(get_current_user)
+async def listar_meus_amigos(
+    current_user: Principal = Depends(get_current_principal)
 ):
     """
     **Listar meus amigos**
     
     Retorna a lista completa de amigos do usuário atual
     """
-    # Buscar nickname do usuário atual pelo email
-    nickname_result = controller._get_nickname_from_email(current_user.email)
-    if not nickname_result["success"]:
-        raise HTTPException(
-            status_code=nickname_result.get("status_code", 404),
-            detail=nickname_result["error"]
-        )
-    
-    usuario_atual = nickname_result["data"]
-    result = controller.listar_amigos(usuario_atual)
+    usuario_atual = current_user.nickname
+    result = await controller.listar_amigos(usuario_atual)
     
     if not result["success"]:
         raise HTTPException(
@@ -200,24 +176,16 @@ def listar_meus_amigos(
         500: {"description": "Erro interno do servidor"}
     }
 )
-def listar_solicitacoes_pendentes(
-    current_user: Dict[str, Any] = Depends(get_current_user)
+async def listar_solicitacoes_pendentes(
+    current_user: Principal = Depends(get_current_principal)
 ):
     """
     **Listar solicitações pendentes**
     
     Retorna todas as solicitações de amizade que foram enviadas para o usuário atual
     """
-    # Buscar nickname do usuário atual pelo email
-    nickname_result = controller._get_nickname_from_email(current_user.email)
-    if not nickname_result["success"]:
-        raise HTTPException(
-            status_code=nickname_result.get("status_code", 404),
-            detail=nickname_result["error"]
-        )
-    
-    usuario_atual = nickname_result["data"]
-    result = controller.listar_solicitacoes_pendentes(usuario_atual)
+    usuario_atual = current_user.nickname
+    result = await controller.listar_solicitacoes_pendentes(usuario_atual)
     
     if not result["success"]:
         raise HTTPException(
@@ -239,10 +207,10 @@ def listar_solicitacoes_pendentes(
         500: {"description": "Erro interno do servidor"}
     }
 )
-def buscar_usuarios(
+async def buscar_usuarios(
     q: str = Query(..., description="Termo de busca (nickname)", min_length=2),
     limit: int = Query(20, description="Limite de resultados", ge=1, le=50),
-    current_user: Dict[str, Any] = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ):
     """
     **Buscar usuários**
@@ -250,16 +218,8 @@ def buscar_usuarios(
     - **q**: Termo de busca (deve ter pelo menos 2 caracteres)
     - **limit**: Número máximo de resultados (1-50)
     """
-    # Buscar nickname do usuário atual pelo email
-    nickname_result = controller._get_nickname_from_email(current_user.email)
-    if not nickname_result["success"]:
-        raise HTTPException(
-            status_code=nickname_result.get("status_code", 404),
-            detail=nickname_result["error"]
-        )
-    
-    usuario_atual = nickname_result["data"]
-    result = controller.buscar_usuarios(q, usuario_atual, limit)
+    usuario_atual = current_user.nickname
+    result = await controller.buscar_usuarios(q, usuario_atual, limit)
     
     if not result["success"]:
         raise HTTPException(
@@ -280,9 +240,9 @@ def buscar_usuarios(
         500: {"description": "Erro interno do servidor"}
     }
 )
-def verificar_status_amizade(
+async def verificar_status_amizade(
     nickname: str = Path(..., description="Nickname do usuário"),
-    current_user: Dict[str, Any] = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ):
     """
     **Verificar status de amizade**
@@ -291,16 +251,8 @@ def verificar_status_amizade(
     
     Retorna possíveis status: "nenhum", "pendente", "aceito", "recusado"
     """
-    # Buscar nickname do usuário atual pelo email
-    nickname_result = controller._get_nickname_from_email(current_user.email)
-    if not nickname_result["success"]:
-        raise HTTPException(
-            status_code=nickname_result.get("status_code", 404),
-            detail=nickname_result["error"]
-        )
-    
-    usuario_atual = nickname_result["data"]
-    result = controller.verificar_status_amizade(usuario_atual, nickname)
+    usuario_atual = current_user.nickname
+    result = await controller.verificar_status_amizade(usuario_atual, nickname)
     
     if not result["success"]:
         raise HTTPException(
@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Query, Depends, HTTPException, status
 from typing import Optional, Dict, Any
-from auth.auth_dependency import get_current_user
+from auth.auth_dependency import get_current_user, get_current_principal, Principal
+from services.geo_index import GEO_MAX_RAIO_M
 from controllers.carta_controller import (
     CartaController, 
     CartaCreate, 
@@ -23,7 +24,7 @@ controller = CartaController()
         401: {"description": "Token de autenticação inválido ou ausente"}
     }
 )
-def create_carta(
+async def create_carta(
     carta_data: CartaCreate,
     current_user: Dict[str, Any] = Depends(get_current_user)
 ) :
@@ -36,7 +37,7 @@ def create_carta(
     - **audio**: URL do áudio da carta (opcional)
     - **localizacao**: Localização da carta no campus (opcional)
     """
-    result = controller.create_carta(carta_data)
+    result = await controller.create_carta(carta_data)
     
     if not result["success"]:
         raise HTTPException(
@@ -57,7 +58,7 @@ def create_carta(
         500: {"description": "Erro interno do servidor"}
     }
 )
-def get_all_cartas(
+async def get_all_cartas(
     limit: Optional[int] = Query(None, description="Limite de resultados a retornar", ge=1, le=100),
     raridade: Optional[str] = Query(None, description="Filtrar por raridade", enum=["comum", "rara", "épica", "lendária"]),
     localizacao: Optional[str] = Query(None, description="Filtrar por localização (busca parcial)"),
@@ -71,7 +72,7 @@ def get_all_cartas(
     - **raridade**: Filtra por raridade específica
     - **localizacao**: Busca por localização (permite busca parcial)
     """
-    result = controller.get_all_cartas(limit=limit, raridade=raridade, localizacao=localizacao)
+    result = await controller.get_all_cartas(limit=limit, raridade=raridade, localizacao=localizacao)
     
     if not result["success"]:
         raise HTTPException(
@@ -92,7 +93,7 @@ def get_all_cartas(
         500: {"description": "Erro interno do servidor"}
     }
 )
-def get_cartas_raras(
+async def get_cartas_raras(
     current_user: Dict[str, Any] = Depends(get_current_user)
 ):
     """
@@ -100,7 +101,52 @@ def get_cartas_raras(
     
     Retorna cartas raras que possuem informações históricas adicionais.
     """
-    result = controller.get_cartas_raras()
+    result = await controller.get_cartas_raras()
+    
+    if not result["success"]:
+        raise HTTPException(
+            status_code=result.get("status_code", 500),
+            detail=result["error"]
+        )
+    
+    return result
+
+@router.get(
+    "/proximas",
+    response_model=Dict[str, Any],
+    summary="Buscar cartas próximas",
+    description="Busca as cartas mais próximas de um ponto ou dentro de um raio, usando um índice espacial em memória. Requer autenticação.",
+    responses={
+        200: {"description": "Cartas próximas retornadas com sucesso, ordenadas por distância"},
+        401: {"description": "Token de autenticação inválido ou ausente"},
+        500: {"description": "Erro interno do servidor"}
+    }
+)
+async def get_cartas_proximas(
+    lat: float = Query(..., description="Latitude do ponto de referência", ge=-90, le=90),
+    lon: float = Query(..., description="Longitude do ponto de referência", ge=-180, le=180),
+    raio: Optional[float] = Query(None, description="Raio máximo em metros; sem raio, retorna os k mais próximos", gt=0, le=GEO_MAX_RAIO_M),
+    limit: int = Query(10, description="Número máximo de cartas (k)", ge=1, le=100),
+    excluir_coletadas: bool = Query(False, description="Omitir cartas que o usuário já possui"),
+    current_user: Principal = Depends(get_current_principal)
+):
+    """
+    **Buscar cartas próximas**
+    
+    - **lat** / **lon**: Ponto de referência (posição do jogador)
+    - **raio**: Raio em metros; sem ele, retorna as `limit` cartas mais próximas
+    - **limit**: Máximo de cartas retornadas (1-100)
+    - **excluir_coletadas**: Se verdadeiro, ignora cartas que já estão na coleção do usuário
+    
+    Cada carta inclui o campo `distancia` (metros).
+    """
+    result = await controller.get_cartas_proximas(
+        latitude=lat,
+        longitude=lon,
+        raio=raio,
+        limit=limit,
+        usuario=current_user.nickname if excluir_coletadas else None
+    )
     
     if not result["success"]:
         raise HTTPException(
@@ -121,7 +167,7 @@ def get_cartas_raras(
         404: {"description": "Carta não encontrada"}
     }
 )
-def get_carta_by_qrcode(
+async def get_carta_by_qrcode(
     qrcode: str,
     current_user: Dict[str, Any] = Depends(get_current_user)
 ):
@@ -130,7 +176,7 @@ def get_carta_by_qrcode(
     
     - **qrcode**: Código QR único da carta a ser buscada
     """
-    result = controller.get_carta_by_qrcode(qrcode)
+    result = await controller.get_carta_by_qrcode(qrcode)
     
     if not result["success"]:
         raise HTTPException(
@@ -152,7 +198,7 @@ def get_carta_by_qrcode(
         404: {"description": "Carta não encontrada"}
     }
 )
-def update_carta(
+async def update_carta(
     qrcode: str, 
     update_data: CartaUpdate,
     current_user: Dict[str, Any] = Depends(get_current_user)
@@ -167,7 +213,7 @@ def update_carta(
       - **audio**: Nova URL do áudio
       - **localizacao**: Nova localização
     """
-    result = controller.update_carta(qrcode, update_data)
+    result = await controller.update_carta(qrcode, update_data)
     
     if not result["success"]:
         raise HTTPException(
@@ -188,7 +234,7 @@ def update_carta(
         404: {"description": "Carta não encontrada"}
     }
 )
-def delete_carta(
+async def delete_carta(
     qrcode: str,
     current_user: Dict[str, Any] = Depends(get_current_user)
 ):
@@ -199,7 +245,7 @@ def delete_carta(
     
     ⚠️ **Atenção**: Esta operação é irreversível!
     """
-    result = controller.delete_carta(qrcode)
+    result = await controller.delete_carta(qrcode)
     
     if not result["success"]:
         raise HTTPException(
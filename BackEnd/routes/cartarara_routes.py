@@ -23,7 +23,7 @@ controller = CartaRaraController()
         401: {"description": "Token de autenticação inválido ou ausente"}
     }
 )
-def create_cartarara(
+async def create_cartarara(
     cartarara_data: CartaRaraCreate,
     current_user: Dict[str, Any] = Depends(get_current_user)
 ):
@@ -33,7 +33,7 @@ def create_cartarara(
     - **qrcode**: Código QR único da carta (obrigatório)
     - **historia**: Texto com a história da carta (obrigatório)
     """
-    result = controller.create_cartarara(cartarara_data)
+    result = await controller.create_cartarara(cartarara_data)
 
     if not result["success"]:
         raise HTTPException(
@@ -54,7 +54,7 @@ def create_cartarara(
         500: {"description": "Erro interno do servidor"}
     }
 )
-def get_all_cartararas(
+async def get_all_cartararas(
     limit: Optional[int] = Query(None, description="Limite de resultados a retornar", ge=1, le=100),
     current_user: Dict[str, Any] = Depends(get_current_user)
 ):
@@ -64,7 +64,7 @@ def get_all_cartararas(
     Parâmetro opcional:
     - **limit**: Número máximo de resultados (1-100)
     """
-    result = controller.get_all_cartararas(limit)
+    result = await controller.get_all_cartararas(limit)
 
     if not result["success"]:
         raise HTTPException(
@@ -85,7 +85,7 @@ def get_all_cartararas(
         404: {"description": "CartaRara não encontrada"}
     }
 )
-def get_cartarara_by_qrcode(
+async def get_cartarara_by_qrcode(
     qrcode: str,
     current_user: Dict[str, Any] = Depends(get_current_user)
 ):
@@ -94,7 +94,7 @@ def get_cartarara_by_qrcode(
     
     - **qrcode**: Código QR da carta rara
     """
-    result = controller.get_cartarara_by_qrcode(qrcode)
+    result = await controller.get_cartarara_by_qrcode(qrcode)
 
     if not result["success"]:
         raise HTTPException(
@@ -116,7 +116,7 @@ def get_cartarara_by_qrcode(
         404: {"description": "CartaRara não encontrada"}
     }
 )
-def update_cartarara(
+async def update_cartarara(
     qrcode: str,
     update_data: CartaRaraUpdate,
     current_user: Dict[str, Any] = Depends(get_current_user)
@@ -128,7 +128,7 @@ def update_cartarara(
     - Campos opcionais:
       - **historia**: Novo texto da história
     """
-    result = controller.update_cartarara(qrcode, update_data)
+    result = await controller.update_cartarara(qrcode, update_data)
 
     if not result["success"]:
         raise HTTPException(
@@ -149,7 +149,7 @@ def update_cartarara(
         404: {"description": "CartaRara não encontrada"}
     }
 )
-def delete_cartarara(
+async def delete_cartarara(
     qrcode: str,
     current_user: Dict[str, Any] = Depends(get_current_user)
 ):
@@ -160,7 +160,7 @@ def delete_cartarara(
     
     ⚠️ **Atenção**: Esta operação é irreversível!
     """
-    result = controller.delete_cartarara(qrcode)
+    result = await controller.delete_cartarara(qrcode)
 
     if not result["success"]:
         raise HTTPException(
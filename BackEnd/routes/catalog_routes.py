@@ -0,0 +1,88 @@
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from typing import Dict, Any
+from auth.auth_dependency import get_current_user
+from controllers.catalog_controller import CatalogController
+
+router = APIRouter(prefix="/catalog", tags=["Catálogo"])
+controller = CatalogController()
+
+def _codificacoes_aceitas(accept_encoding: str) -> Dict[str, float]:
+    """Codificações do Accept-Encoding com seus q-values (q=0 recusa)"""
+    aceitas = {}
+    for item in accept_encoding.split(","):
+        partes = [p.strip() for p in item.split(";")]
+        if not partes[0]:
+            continue
+        q = 1.0
+        for parametro in partes[1:]:
+            nome, _, valor = parametro.partition("=")
+            if nome.strip().lower() == "q":
+                try:
+                    q = float(valor)
+                except ValueError:
+                    q = 0.0
+        aceitas[partes[0].lower()] = q
+    return aceitas
+
+def _q(aceitas: Dict[str, float], encoding: str) -> float:
+    return aceitas.get(encoding, aceitas.get("*", 0.0))
+
+@router.get(
+    "/bundle",
+    summary="Baixar catálogo completo",
+    description="Retorna um snapshot comprimido de cartas, histórias das cartas raras e missões, com ETag para GET condicional. Requer autenticação.",
+    responses={
+        200: {"description": "Catálogo retornado com sucesso"},
+        304: {"description": "Catálogo não mudou desde o ETag enviado em If-None-Match"},
+        401: {"description": "Token de autenticação inválido ou ausente"},
+        500: {"description": "Erro interno do servidor"}
+    }
+)
+async def get_catalog_bundle(
+    request: Request,
+    current_user: Dict[str, Any] = Depends(get_current_user)
+):
+    """
+    **Baixar o catálogo para uso offline**
+    
+    O corpo é `{"success": true, "version": "<digest>", "data": {"cartas": [...], "historias": {...}, "missoes": [...]}}`,
+    servido com gzip (ou brotli, se disponível) conforme o `Accept-Encoding`.
+    
+    - Guarde o `ETag` da resposta e envie-o em `If-None-Match` na próxima sessão
+    - Se o catálogo não mudou, a resposta é `304 Not Modified` sem corpo
+    - O header `X-Catalog-Version` traz a versão do snapshot (digest do conteúdo, igual em todos os servidores)
+    """
+    result = await controller.get_bundle()
+    
+    if not result["success"]:
+        raise HTTPException(
+            status_code=result.get("status_code", 500),
+            detail=result["error"]
+        )
+    
+    snapshot = result["data"]
+    aceitas = _codificacoes_aceitas(request.headers.get("accept-encoding", ""))
+    q_br = _q(aceitas, "br") if snapshot.brotli is not None else 0.0
+    q_gzip = _q(aceitas, "gzip")
+    
+    if q_br > 0 and q_br >= q_gzip:
+        encoding, body = "br", snapshot.brotli
+    elif q_gzip > 0:
+        encoding, body = "gzip", snapshot.gzip
+    else:
+        encoding, body = None, snapshot.body
+    
+    headers = {
+        "ETag": snapshot.etag(encoding),
+        "X-Catalog-Version": str(snapshot.version),
+        "Cache-Control": "private, no-cache",
+        "Vary": "Accept-Encoding, Authorization"
+    }
+    
+    if snapshot.matches(request.headers.get("if-none-match")):
+        return Response(status_code=304, headers=headers)
+    
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    
+    return Response(content=body, media_type="application/json", headers=headers)
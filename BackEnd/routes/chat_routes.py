@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Query, Depends, HTTPException, status
 from typing import Optional, Dict, Any
-from auth.auth_dependency import get_current_user
+from auth.auth_dependency import get_current_user, get_current_principal, Principal
 from controllers.chat_controller import (
     ChatController, 
     ChatCreate, 
@@ -23,27 +23,18 @@ controller = ChatController()
         404: {"description": "Usuário não encontrado"}
     }
 )
-def create_chat(
+async def create_chat(
     chat_data: ChatCreate,
-    current_user: Dict[str, Any] = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ):
     """
     **Criar novo chat**
     
     - **usuario2**: Nickname do usuário com quem criar o chat
     """
-    # Buscar o nickname do usuário atual
-    result = controller.get_user_nickname_by_email(current_user.email)
-    
-    if not result["success"]:
-        raise HTTPException(
-            status_code=404,
-            detail="Usuário autenticado não encontrado na tabela pessoa"
-        )
-    
-    usuario1_nickname = result["data"]["nickname"]
+    usuario1_nickname = current_user.nickname
     
-    result = controller.create_chat(chat_data, usuario1_nickname)
+    result = await controller.create_chat(chat_data, usuario1_nickname)
     
     if not result["success"]:
         raise HTTPException(
@@ -65,27 +56,18 @@ def create_chat(
         500: {"description": "Erro interno do servidor"}
     }
 )
-def get_meus_chats(
+async def get_meus_chats(
     limit: Optional[int] = Query(None, description="Limite de resultados a retornar", ge=1, le=100),
-    current_user: Dict[str, Any] = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ):
     """
     **Buscar meus chats**
     
     Retorna todos os chats onde o usuário autenticado participa.
     """
-    # Buscar o nickname do usuário atual
-    result = controller.get_user_nickname_by_email(current_user.email)
-    
-    if not result["success"]:
-        raise HTTPException(
-            status_code=404,
-            detail="Usuário autenticado não encontrado na tabela pessoa"
-        )
-    
-    usuario_nickname = result["data"]["nickname"]
+    usuario_nickname = current_user.nickname
     
-    result = controller.get_chats_by_usuario(usuario_nickname, limit)
+    result = await controller.get_chats_by_usuario(usuario_nickname, limit)
     
     if not result["success"]:
         raise HTTPException(
@@ -106,7 +88,7 @@ def get_meus_chats(
         404: {"description": "Chat não encontrado"}
     }
 )
-def get_chat_by_usuarios(
+async def get_chat_by_usuarios(
     usuario1: str,
     usuario2: str,
     current_user: Dict[str, Any] = Depends(get_current_user)
@@ -117,7 +99,7 @@ def get_chat_by_usuarios(
     - **usuario1**: Nickname do primeiro usuário
     - **usuario2**: Nickname do segundo usuário
     """
-    result = controller.get_chat_by_usuarios(usuario1, usuario2)
+    result = await controller.get_chat_by_usuarios(usuario1, usuario2)
     
     if not result["success"]:
         raise HTTPException(
@@ -138,7 +120,7 @@ def get_chat_by_usuarios(
         404: {"description": "Chat não encontrado"}
     }
 )
-def delete_chat(
+async def delete_chat(
     usuario1: str,
     usuario2: str,
     current_user: Dict[str, Any] = Depends(get_current_user)
@@ -151,7 +133,7 @@ def delete_chat(
     
     ⚠️ **Atenção**: Esta operação é irreversível e apagará todas as mensagens do chat!
     """
-    result = controller.delete_chat(usuario1, usuario2)
+    result = await controller.delete_chat(usuario1, usuario2)
     
     if not result["success"]:
         raise HTTPException(
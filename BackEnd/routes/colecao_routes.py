@@ -1,9 +1,10 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from typing import Dict, Any
-from auth.auth_dependency import get_current_user
+from typing import Dict, Any, List
+from auth.auth_dependency import get_current_principal, Principal
 from controllers.colecao_controller import (
     ColecaoController, 
     AdicionarCartaRequest, 
+    ItemLoteRequest,
     RemoverCartaRequest
 )
 
@@ -21,8 +22,8 @@ controller = ColecaoController()
         500: {"description": "Erro interno do servidor"}
     }
 )
-def get_minha_colecao(
-    current_user: Dict[str, Any] = Depends(get_current_user)
+async def get_minha_colecao(
+    current_user: Principal = Depends(get_current_principal)
 ):
     """
     **Buscar minha coleção de cartas**
@@ -31,7 +32,7 @@ def get_minha_colecao(
     - Informações básicas da carta (QRCode, raridade, imagem, etc.)
     - Quantidade de cada carta possuída
     """
-    result = controller.get_minha_colecao(current_user)
+    result = await controller.get_minha_colecao(current_user)
     
     if not result["success"]:
         raise HTTPException(
@@ -54,9 +55,9 @@ def get_minha_colecao(
         404: {"description": "Carta não encontrada"}
     }
 )
-def adicionar_carta_colecao(
+async def adicionar_carta_colecao(
     request: AdicionarCartaRequest,
-    current_user: Dict[str, Any] = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ):
     """
     **Adicionar carta à coleção**
@@ -64,7 +65,44 @@ def adicionar_carta_colecao(
     - **carta_id**: QRCode da carta a ser adicionada
     - **quantidade**: Quantidade a adicionar (padrão: 1)
     """
-    result = controller.adicionar_carta(current_user, request)
+    result = await controller.adicionar_carta(current_user, request)
+    
+    if not result["success"]:
+        raise HTTPException(
+            status_code=result.get("status_code", 400),
+            detail=result["error"]
+        )
+    
+    return result
+
+@router.post(
+    "/colecao/adicionar-lote", 
+    response_model=Dict[str, Any],
+    summary="Adicionar lote de cartas à coleção",
+    description="Adiciona de uma vez os scans feitos offline pelo usuário autenticado.",
+    responses={
+        200: {"description": "Lote processado; veja o resultado de cada item"},
+        400: {"description": "Lote vazio, grande demais ou dados inválidos"},
+        401: {"description": "Token de autenticação inválido ou ausente"}
+    }
+)
+async def adicionar_cartas_lote(
+    itens: List[ItemLoteRequest],
+    current_user: Principal = Depends(get_current_principal)
+):
+    """
+    **Adicionar lote de cartas (fila offline)**
+    
+    Corpo: lista de itens com
+    - **carta_id**: QRCode da carta escaneada
+    - **quantidade**: Quantidade a adicionar (padrão: 1)
+    - **scanned_at**: Momento do scan no aparelho (opcional)
+    - **client_id**: Identificador do item na fila do app, devolvido no resultado (opcional)
+    
+    Cada item recebe seu próprio resultado; QRCodes inexistentes não impedem
+    a gravação dos demais.
+    """
+    result = await controller.adicionar_cartas_lote(current_user, itens)
     
     if not result["success"]:
         raise HTTPException(
@@ -86,9 +124,9 @@ def adicionar_carta_colecao(
         404: {"description": "Carta não encontrada na coleção"}
     }
 )
-def remover_carta_colecao(
+async def remover_carta_colecao(
     request: RemoverCartaRequest,
-    current_user: Dict[str, Any] = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ):
     """
     **Remover carta da coleção**
@@ -98,7 +136,7 @@ def remover_carta_colecao(
     
     Se a quantidade for igual ou maior que a possuída, a carta será removida completamente.
     """
-    result = controller.remover_carta(current_user, request)
+    result = await controller.remover_carta(current_user, request)
     
     if not result["success"]:
         raise HTTPException(
@@ -119,8 +157,8 @@ def remover_carta_colecao(
         500: {"description": "Erro interno do servidor"}
     }
 )
-def get_estatisticas_colecao(
-    current_user: Dict[str, Any] = Depends(get_current_user)
+async def get_estatisticas_colecao(
+    current_user: Principal = Depends(get_current_principal)
 ):
     """
     **Estatísticas da coleção**
@@ -130,7 +168,7 @@ def get_estatisticas_colecao(
     - Número de cartas únicas
     - Distribuição por raridade
     """
-    result = controller.get_estatisticas(current_user)
+    result = await controller.get_estatisticas(current_user)
     
     if not result["success"]:
         raise HTTPException(
@@ -151,16 +189,16 @@ def get_estatisticas_colecao(
         404: {"description": "Carta não encontrada na coleção"}
     }
 )
-def verificar_carta_colecao(
+async def verificar_carta_colecao(
     carta_id: str,
-    current_user: Dict[str, Any] = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ):
     """
     **Verificar se possui carta**
     
     - **carta_id**: QRCode da carta a ser verificada
     """
-    result = controller.verificar_carta(current_user, carta_id)
+    result = await controller.verificar_carta(current_user, carta_id)
     
     if not result["success"]:
         raise HTTPException(
@@ -181,15 +219,15 @@ def verificar_carta_colecao(
         400: {"description": "Erro ao limpar coleção"}
     }
 )
-def limpar_colecao(
-    current_user: Dict[str, Any] = Depends(get_current_user)
+async def limpar_colecao(
+    current_user: Principal = Depends(get_current_principal)
 ):
     """
     **Limpar toda a coleção**
     
     Atenção: Esta operação remove todas as cartas da coleção e é irreversível!
     """
-    result = controller.limpar_colecao(current_user)
+    result = await controller.limpar_colecao(current_user)
     
     if not result["success"]:
         raise HTTPException(
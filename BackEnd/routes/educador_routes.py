@@ -23,11 +23,11 @@ controller = EducadorController()
         401: {"description": "Token de autenticação inválido ou ausente"}
     }
 )
-def create_educador(
+async def create_educador(
     educador_data: EducadorCreate,
     current_user: Dict[str, Any] = Depends(get_current_user)
 ):
-    result = controller.create_educador(educador_data)
+    result = await controller.create_educador(educador_data)
     if not result["success"]:
         raise HTTPException(
             status_code=result.get("status_code", 400),
@@ -46,11 +46,11 @@ def create_educador(
         404: {"description": "Educador não encontrado"}
     }
 )
-def get_educador_by_nickname(
+async def get_educador_by_nickname(
     nickname: str,
     current_user: Dict[str, Any] = Depends(get_current_user)
 ):
-    result = controller.get_educador_by_nickname(nickname)
+    result = await controller.get_educador_by_nickname(nickname)
     if not result["success"]:
         raise HTTPException(
             status_code=result.get("status_code", 404),
@@ -69,11 +69,11 @@ def get_educador_by_nickname(
         500: {"description": "Erro interno"}
     }
 )
-def get_all_educadores(
+async def get_all_educadores(
     cargo: str = None,
     current_user: Dict[str, Any] = Depends(get_current_user)
 ):
-    result = controller.get_all_educadores(cargo=cargo)
+    result = await controller.get_all_educadores(cargo=cargo)
     if not result["success"]:
         raise HTTPException(
             status_code=result.get("status_code", 500),
@@ -93,12 +93,12 @@ def get_all_educadores(
         404: {"description": "Educador não encontrado"}
     }
 )
-def update_educador(
+async def update_educador(
     nickname: str,
     update_data: EducadorUpdate,
     current_user: Dict[str, Any] = Depends(get_current_user)
 ):
-    result = controller.update_educador(nickname, update_data)
+    result = await controller.update_educador(nickname, update_data)
     if not result["success"]:
         raise HTTPException(
             status_code=result.get("status_code", 400),
@@ -117,11 +117,11 @@ def update_educador(
         404: {"description": "Educador não encontrado"}
     }
 )
-def delete_educador(
+async def delete_educador(
     nickname: str,
     current_user: Dict[str, Any] = Depends(get_current_user)
 ):
-    result = controller.delete_educador(nickname)
+    result = await controller.delete_educador(nickname)
     if not result["success"]:
         raise HTTPException(
             status_code=result.get("status_code", 400),
@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Query, Depends, HTTPException, status
 from typing import Optional, Dict, Any
-from auth.auth_dependency import get_current_user
+from auth.auth_dependency import get_current_principal, Principal
 from controllers.mensagem_controller import (
     MensagemController, 
     MensagemCreate, 
@@ -22,9 +22,9 @@ controller = MensagemController()
         404: {"description": "Usuário não encontrado na tabela pessoa"}
     }
 )
-def create_mensagem(
+async def create_mensagem(
     mensagem_data: MensagemCreate,
-    current_user: Dict[str, Any] = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ):
     """
     **Criar uma nova mensagem**
@@ -35,19 +35,10 @@ def create_mensagem(
     - **texto**: Conteúdo da mensagem (obrigatório)
     - **carta**: QRCode da carta anexada (opcional)
     """
-    # Buscar o nickname do usuário atual na tabela pessoa
-    result = controller.get_user_nickname_by_email(current_user.email)
-    
-    if not result["success"]:
-        raise HTTPException(
-            status_code=404,
-            detail="Usuário autenticado não encontrado na tabela pessoa"
-        )
-    
-    destinatario_nickname = result["data"]["nickname"]
+    destinatario_nickname = current_user.nickname
     
     # Criar mensagem com o destinatário sendo o usuário atual
-    result = controller.create_mensagem(mensagem_data, destinatario_nickname)
+    result = await controller.create_mensagem(mensagem_data, destinatario_nickname)
     
     if not result["success"]:
         raise HTTPException(
@@ -69,9 +60,9 @@ def create_mensagem(
         500: {"description": "Erro interno do servidor"}
     }
 )
-def get_mensagens_recebidas(
+async def get_mensagens_recebidas(
     limit: Optional[int] = Query(None, description="Limite de resultados a retornar", ge=1, le=100),
-    current_user: Dict[str, Any] = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ):
     """
     **Buscar mensagens recebidas**
@@ -81,19 +72,10 @@ def get_mensagens_recebidas(
     Parâmetros opcionais:
     - **limit**: Limita o número de resultados (1-100)
     """
-    # Buscar o nickname do usuário atual na tabela pessoa
-    result = controller.get_user_nickname_by_email(current_user.email)
-    
-    if not result["success"]:
-        raise HTTPException(
-            status_code=404,
-            detail="Usuário autenticado não encontrado na tabela pessoa"
-        )
-    
-    destinatario_nickname = result["data"]["nickname"]
+    destinatario_nickname = current_user.nickname
     
     # Buscar mensagens recebidas
-    result = controller.get_mensagens_by_destinatario(destinatario_nickname, limit)
+    result = await controller.get_mensagens_by_destinatario(destinatario_nickname, limit)
     
     if not result["success"]:
         raise HTTPException(
@@ -115,9 +97,9 @@ def get_mensagens_recebidas(
         500: {"description": "Erro interno do servidor"}
     }
 )
-def get_mensagens_enviadas(
+async def get_mensagens_enviadas(
     limit: Optional[int] = Query(None, description="Limite de resultados a retornar", ge=1, le=100),
-    current_user: Dict[str, Any] = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ):
     """
     **Buscar mensagens enviadas**
@@ -127,19 +109,151 @@ def get_mensagens_enviadas(
     Parâmetros opcionais:
     - **limit**: Limita o número de resultados (1-100)
     """
-    # Buscar o nickname do usuário atual na tabela pessoa
-    result = controller.get_user_nickname_by_email(current_user.email)
+    remetente_nickname = current_user.nickname
+    
+    # Buscar mensagens enviadas
+    result = await controller.get_mensagens_by_remetente(remetente_nickname, limit)
     
     if not result["success"]:
         raise HTTPException(
-            status_code=404,
-            detail="Usuário autenticado não encontrado na tabela pessoa"
+            status_code=result.get("status_code", 500),
+            detail=result["error"]
         )
     
-    remetente_nickname = result["data"]["nickname"]
+    return result
+
+@router.get(
+    "/chats", 
+    response_model=Dict[str, Any],
+    summary="Listar meus chats",
+    description="Lista as conversas do usuário autenticado com a última mensagem, mais recentes primeiro.",
+    responses={
+        200: {"description": "Lista de chats retornada com sucesso"},
+        401: {"description": "Token de autenticação inválido ou ausente"},
+        404: {"description": "Usuário não encontrado na tabela pessoa"},
+        500: {"description": "Erro interno do servidor"}
+    }
+)
+async def get_meus_chats(
+    limit: int = Query(50, description="Quantidade de chats por página", ge=1, le=100),
+    offset: int = Query(0, description="Quantidade de chats a pular", ge=0),
+    current_user: Principal = Depends(get_current_principal)
+):
+    """
+    **Listar meus chats**
     
-    # Buscar mensagens enviadas
-    result = controller.get_mensagens_by_remetente(remetente_nickname, limit)
+    Retorna uma página de conversas do usuário autenticado, cada uma com a
+    última mensagem, o número de não lidas e os dados do contato.
+    
+    Parâmetros opcionais:
+    - **limit**: Chats por página (1-100)
+    - **offset**: Chats a pular (paginação)
+    """
+    result = await controller.get_user_chats(current_user.nickname, limit, offset)
+    
+    if not result["success"]:
+        raise HTTPException(
+            status_code=result.get("status_code", 500),
+            detail=result["error"]
+        )
+    
+    return result
+
+@router.get(
+    "/nao-lidas", 
+    response_model=Dict[str, Any],
+    summary="Total de mensagens não lidas",
+    description="Retorna o total de mensagens não lidas do usuário autenticado, somando todas as conversas.",
+    responses={
+        200: {"description": "Total retornado com sucesso"},
+        401: {"description": "Token de autenticação inválido ou ausente"},
+        500: {"description": "Erro interno do servidor"}
+    }
+)
+async def get_nao_lidas_total(
+    current_user: Principal = Depends(get_current_principal)
+):
+    """
+    **Total de mensagens não lidas**
+    
+    Contador mantido a cada mensagem recebida e a cada conversa lida, para o
+    badge da home sem buscar conversas nem mensagens.
+    """
+    result = await controller.get_nao_lidas_total(current_user.nickname)
+    
+    if not result["success"]:
+        raise HTTPException(
+            status_code=result.get("status_code", 500),
+            detail=result["error"]
+        )
+    
+    return result
+
+@router.post(
+    "/{contato}/lidas", 
+    response_model=Dict[str, Any],
+    summary="Marcar conversa como lida",
+    description="Zera as mensagens não lidas da conversa com o contato e registra a leitura.",
+    responses={
+        200: {"description": "Conversa marcada como lida"},
+        401: {"description": "Token de autenticação inválido ou ausente"},
+        500: {"description": "Erro interno do servidor"}
+    }
+)
+async def marcar_como_lidas(
+    contato: str,
+    current_user: Principal = Depends(get_current_principal)
+):
+    """
+    **Marcar conversa como lida**
+    
+    Retorna quantas mensagens foram lidas, o total de não lidas restante do
+    usuário e o horário da leitura, que aparece para o contato na lista de
+    chats (`contato_lido_em`).
+    
+    - **contato**: Nickname do outro usuário
+    """
+    result = await controller.marcar_como_lidas(current_user.nickname, contato)
+    
+    if not result["success"]:
+        raise HTTPException(
+            status_code=result.get("status_code", 500),
+            detail=result["error"]
+        )
+    
+    return result
+
+@router.get(
+    "/chat/{contato}", 
+    response_model=Dict[str, Any],
+    summary="Página de mensagens de um chat",
+    description="Busca mensagens trocadas com um contato, das mais novas para as mais antigas, paginadas por cursor.",
+    responses={
+        200: {"description": "Página de mensagens retornada com sucesso"},
+        400: {"description": "Cursor inválido"},
+        401: {"description": "Token de autenticação inválido ou ausente"},
+        500: {"description": "Erro interno do servidor"}
+    }
+)
+async def get_chat_mensagens(
+    contato: str,
+    limit: int = Query(50, description="Mensagens por página", ge=1, le=100),
+    antes: Optional[str] = Query(None, description="Cursor: mensagens mais antigas que esta posição"),
+    depois: Optional[str] = Query(None, description="Cursor: mensagens mais novas que esta posição"),
+    current_user: Principal = Depends(get_current_principal)
+):
+    """
+    **Página de mensagens de um chat**
+    
+    Sem cursor, retorna as mensagens mais recentes. Para carregar o histórico,
+    envie `antes` com `cursores.antes` da página anterior; para buscar
+    mensagens novas, envie `depois` com `cursores.depois`. Cartas e trocas
+    citadas na página vêm uma vez só em `cartas` (por QRCode) e `trocas` (por id).
+    
+    - **contato**: Nickname do outro usuário
+    - **limit**: Mensagens por página (1-100)
+    """
+    result = await controller.get_chat_messages(current_user.nickname, contato, limit, antes, depois)
     
     if not result["success"]:
         raise HTTPException(
@@ -161,10 +275,10 @@ def get_mensagens_enviadas(
         500: {"description": "Erro interno do servidor"}
     }
 )
-def get_conversa(
+async def get_conversa(
     outro_usuario: str,
     limit: Optional[int] = Query(None, description="Limite de resultados a retornar", ge=1, le=100),
-    current_user: Dict[str, Any] = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ):
     """
     **Buscar conversa com outro usuário**
@@ -176,19 +290,10 @@ def get_conversa(
     Parâmetros opcionais:
     - **limit**: Limita o número de resultados (1-100)
     """
-    # Buscar o nickname do usuário atual na tabela pessoa
-    result = controller.get_user_nickname_by_email(current_user.email)
-    
-    if not result["success"]:
-        raise HTTPException(
-            status_code=404,
-            detail="Usuário autenticado não encontrado na tabela pessoa"
-        )
-    
-    usuario_atual = result["data"]["nickname"]
+    usuario_atual = current_user.nickname
     
     # Buscar conversa entre os dois usuários
-    result = controller.get_conversa(usuario_atual, outro_usuario, limit)
+    result = await controller.get_conversa(usuario_atual, outro_usuario, limit)
     
     if not result["success"]:
         raise HTTPException(
@@ -23,7 +23,7 @@ controller = MissaoQtdController()
         401: {"description": "Token de autenticação inválido ou ausente"}
     }
 )
-def create_missaoqtd(
+async def create_missaoqtd(
     missaoqtd_data: MissaoQtdCreate,
     current_user: Dict[str, Any] = Depends(get_current_user)
 ):
@@ -33,7 +33,7 @@ def create_missaoqtd(
     - **Codigo**: Código da missão (obrigatório, chave primária)
     - **QuantidadeTotal**: Quantidade total da missão (obrigatório)
     """
-    result = controller.create_missaoqtd(missaoqtd_data)
+    result = await controller.create_missaoqtd(missaoqtd_data)
     
     if not result["success"]:
         raise HTTPException(
@@ -54,7 +54,7 @@ def create_missaoqtd(
         500: {"description": "Erro interno do servidor"}
     }
 )
-def get_all_missaoqtd(
+async def get_all_missaoqtd(
     limit: Optional[int] = Query(None, description="Limite de resultados a retornar", ge=1, le=100),
     current_user: Dict[str, Any] = Depends(get_current_user)
 ):
@@ -64,7 +64,7 @@ def get_all_missaoqtd(
     Parâmetro opcional:
     - **limit**: Número máximo de resultados (1-100)
     """
-    result = controller.get_all_missaoqtd(limit)
+    result = await controller.get_all_missaoqtd(limit)
     
     if not result["success"]:
         raise HTTPException(
@@ -85,7 +85,7 @@ def get_all_missaoqtd(
         404: {"description": "MissaoQtd não encontrada"}
     }
 )
-def get_missaoqtd_by_codigo(
+async def get_missaoqtd_by_codigo(
     codigo: int,
     current_user: Dict[str, Any] = Depends(get_current_user)
 ):
@@ -94,7 +94,7 @@ def get_missaoqtd_by_codigo(
     
     - **codigo**: Código da missão
     """
-    result = controller.get_missaoqtd_by_codigo(codigo)
+    result = await controller.get_missaoqtd_by_codigo(codigo)
     
     if not result["success"]:
         raise HTTPException(
@@ -116,7 +116,7 @@ def get_missaoqtd_by_codigo(
         404: {"description": "MissaoQtd não encontrada"}
     }
 )
-def update_missaoqtd(
+async def update_missaoqtd(
     codigo: int,
     update_data: MissaoQtdUpdate,
     current_user: Dict[str, Any] = Depends(get_current_user)
@@ -128,7 +128,7 @@ def update_missaoqtd(
     - Campos opcionais:
       - **QuantidadeTotal**: Novo valor da quantidade total
     """
-    result = controller.update_missaoqtd(codigo, update_data)
+    result = await controller.update_missaoqtd(codigo, update_data)
     
     if not result["success"]:
         raise HTTPException(
@@ -149,7 +149,7 @@ def update_missaoqtd(
         404: {"description": "MissaoQtd não encontrada"}
     }
 )
-def delete_missaoqtd(
+async def delete_missaoqtd(
     codigo: int,
     current_user: Dict[str, Any] = Depends(get_current_user)
 ):
@@ -160,7 +160,7 @@ def delete_missaoqtd(
     
     ⚠️ **Atenção**: Esta operação é irreversível!
     """
-    result = controller.delete_missaoqtd(codigo)
+    result = await controller.delete_missaoqtd(codigo)
     
     if not result["success"]:
         raise HTTPException(
@@ -23,7 +23,7 @@ controller = PessoaController()
         401: {"description": "Token de autenticação inválido ou ausente"}
     }
 )
-def create_pessoa(
+async def create_pessoa(
     pessoa_data: PessoaCreate,
     current_user: Dict[str, Any] = Depends(get_current_user)
 ):
@@ -34,7 +34,7 @@ def create_pessoa(
     - **email**: Email válido (obrigatório)
     - **tipo**: Tipo de usuário - 'usuario' ou 'educador' (obrigatório)
     """
-    result = controller.create_pessoa(pessoa_data)
+    result = await controller.create_pessoa(pessoa_data)
     
     if not result["success"]:
         raise HTTPException(
@@ -55,7 +55,7 @@ def create_pessoa(
         500: {"description": "Erro interno do servidor"}
     }
 )
-def get_all_pessoas(
+async def get_all_pessoas(
     limit: Optional[int] = Query(None, description="Limite de resultados a retornar", ge=1, le=100),
     tipo: Optional[str] = Query(None, description="Filtrar por tipo de usuário", enum=["usuario", "educador"]),
     current_user: Dict[str, Any] = Depends(get_current_user)
@@ -67,7 +67,7 @@ def get_all_pessoas(
     - **limit**: Limita o número de resultados (1-100)
     - **tipo**: Filtra por tipo de usuário ('usuario' ou 'educador')
     """
-    result = controller.get_all_pessoas(limit=limit, tipo=tipo)
+    result = await controller.get_all_pessoas(limit=limit, tipo=tipo)
     
     if not result["success"]:
         raise HTTPException(
@@ -88,7 +88,7 @@ def get_all_pessoas(
         404: {"description": "Pessoa não encontrada"}
     }
 )
-def get_pessoa_by_nickname(
+async def get_pessoa_by_nickname(
     nickname: str,
     current_user: Dict[str, Any] = Depends(get_current_user)
 ):
@@ -97,7 +97,7 @@ def get_pessoa_by_nickname(
     
     - **nickname**: Nome único do usuário a ser buscado
     """
-    result = controller.get_pessoa_by_nickname(nickname)
+    result = await controller.get_pessoa_by_nickname(nickname)
     
     if not result["success"]:
         raise HTTPException(
@@ -119,7 +119,7 @@ def get_pessoa_by_nickname(
         404: {"description": "Pessoa não encontrada"}
     }
 )
-def update_pessoa(
+async def update_pessoa(
     nickname: str, 
     update_data: PessoaUpdate,
     current_user: Dict[str, Any] = Depends(get_current_user)
@@ -132,7 +132,7 @@ def update_pessoa(
       - **email**: Novo email válido
       - **tipo**: Novo tipo ('usuario' ou 'educador')
     """
-    result = controller.update_pessoa(nickname, update_data)
+    result = await controller.update_pessoa(nickname, update_data)
     
     if not result["success"]:
         raise HTTPException(
@@ -153,7 +153,7 @@ def update_pessoa(
         404: {"description": "Pessoa não encontrada"}
     }
 )
-def delete_pessoa(
+async def delete_pessoa(
     nickname: str,
     current_user: Dict[str, Any] = Depends(get_current_user)
 ):
@@ -164,7 +164,7 @@ def delete_pessoa(
     
     ⚠️ **Atenção**: Esta operação é irreversível!
     """
-    result = controller.delete_pessoa(nickname)
+    result = await controller.delete_pessoa(nickname)
     
     if not result["success"]:
         raise HTTPException(
@@ -0,0 +1,93 @@
+import asyncio
+import json
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Request, WebSocket, WebSocketDisconnect, status
+from fastapi.responses import StreamingResponse
+from fastapi.security import HTTPAuthorizationCredentials
+from auth.auth_dependency import get_current_user, get_current_principal, Principal
+from services.realtime import hub, REALTIME_HEARTBEAT_SECONDS
+
+router = APIRouter(prefix="/realtime", tags=["Tempo real"])
+
+
+async def _principal_do_token(token: str) -> Principal:
+    """Autenticar o token como nas rotas HTTP (mesmo cache de tokens e identidades)"""
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+    return await get_current_principal(await get_current_user(credentials))
+
+
+@router.websocket("/ws")
+async def realtime_ws(websocket: WebSocket, token: Optional[str] = None):
+    """
+    Canal WebSocket do usuário autenticado.
+
+    O token vai no header Authorization ou no parâmetro `token`. Cada evento
+    chega como JSON {tipo, dados, enviado_em}; tipos: mensagem, leitura,
+    troca, amizade. Sem eventos, um {"tipo": "ping"} é enviado a cada heartbeat.
+    """
+    autorizacao = websocket.headers.get("authorization", "")
+    if not token and autorizacao.lower().startswith("bearer "):
+        token = autorizacao[7:]
+    try:
+        if not token:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED)
+        principal = await _principal_do_token(token)
+    except HTTPException:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    await websocket.accept()
+    sessao = hub.conectar(principal.nickname)
+
+    async def enviar():
+        while True:
+            evento = await sessao.proximo()
+            await websocket.send_text(json.dumps(evento or {"tipo": "ping"}, default=str, ensure_ascii=False))
+
+    async def receber():
+        # Mensagens do cliente só servem para detectar a desconexão
+        while True:
+            await websocket.receive_text()
+
+    tarefas = [asyncio.create_task(enviar()), asyncio.create_task(receber())]
+    try:
+        feitas, _ = await asyncio.wait(tarefas, return_when=asyncio.FIRST_COMPLETED)
+        for tarefa in feitas:
+            erro = tarefa.exception()
+            if erro and not isinstance(erro, WebSocketDisconnect):
+                print(f"Erro na sessão realtime de {principal.nickname}: {erro}")
+    finally:
+        for tarefa in tarefas:
+            tarefa.cancel()
+        hub.desconectar(sessao)
+
+
+@router.get(
+    "/eventos",
+    summary="Eventos em tempo real (SSE)",
+    description="Fallback do WebSocket: stream text/event-stream com as mensagens, trocas e solicitações de amizade do usuário autenticado.",
+    responses={
+        200: {"description": "Stream de eventos aberto"},
+        401: {"description": "Token de autenticação inválido ou ausente"}
+    }
+)
+async def realtime_sse(request: Request, current_user: Principal = Depends(get_current_principal)):
+    async def stream():
+        sessao = hub.conectar(current_user.nickname)
+        try:
+            yield f"retry: {int(REALTIME_HEARTBEAT_SECONDS * 1000)}\n\n"
+            while not await request.is_disconnected():
+                evento = await sessao.proximo()
+                if evento is None:
+                    yield ": ping\n\n"
+                    continue
+                dados = json.dumps(evento, default=str, ensure_ascii=False)
+                yield f"event: {evento['tipo']}\ndata: {dados}\n\n"
+        finally:
+            hub.desconectar(sessao)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -1,6 +1,6 @@
-from fastapi import APIRouter, Query, Depends, HTTPException, status
-from typing import Optional, Dict, Any
-from auth.auth_dependency import get_current_user
+from fastapi import APIRouter, Query, Depends, HTTPException, Request, Response, status
+from typing import Optional, Dict, Any, Literal
+from auth.auth_dependency import get_current_user, get_current_principal, Principal
 from controllers.usuario_controller import (
     UsuarioController, 
     UsuarioCreate, 
@@ -8,7 +8,8 @@ from controllers.usuario_controller import (
     UsuarioResponse,
     ProfileStatsResponse,
     PhotoUploadRequest,
-    XpRequest
+    XpRequest,
+    XpLoteRequest
 )
 
 router = APIRouter(prefix="/usuarios", tags=["Usuários"])
@@ -27,7 +28,7 @@ controller = UsuarioController()
         404: {"description": "Pessoa não encontrada"}
     }
 )
-def create_usuario(
+async def create_usuario(
     usuario_data: UsuarioCreate,
     current_user: Dict[str, Any] = Depends(get_current_user)
 ):
@@ -38,7 +39,7 @@ def create_usuario(
     - **ranking**: Ranking inicial do usuário (padrão: "Iniciante")
     - **qtdcartas**: Quantidade inicial de cartas (padrão: 0)
     """
-    result = controller.create_usuario(usuario_data)
+    result = await controller.create_usuario(usuario_data)
     
     if not result["success"]:
         raise HTTPException(
@@ -59,7 +60,7 @@ def create_usuario(
         500: {"description": "Erro interno do servidor"}
     }
 )
-def get_all_usuarios(
+async def get_all_usuarios(
     limit: Optional[int] = Query(None, description="Limite de resultados a retornar", ge=1, le=100),
     current_user: Dict[str, Any] = Depends(get_current_user)
 ):
@@ -69,7 +70,7 @@ def get_all_usuarios(
     Parâmetros opcionais:
     - **limit**: Limita o número de resultados (1-100)
     """
-    result = controller.get_all_usuarios(limit=limit)
+    result = await controller.get_all_usuarios(limit=limit)
     
     if not result["success"]:
         raise HTTPException(
@@ -79,6 +80,173 @@ def get_all_usuarios(
     
     return result
 
+@router.get(
+    "/leaderboard",
+    response_model=Dict[str, Any],
+    summary="Obter ranking dos usuários",
+    description="Retorna o topo do ranking dos usuários ordenados por XP, com ETag para GET condicional",
+    responses={
+        200: {"description": "Ranking retornado com sucesso"},
+        304: {"description": "Ranking não mudou desde o ETag enviado em If-None-Match"},
+        500: {"description": "Erro interno do servidor"}
+    }
+)
+async def get_leaderboard(
+    request: Request,
+    response: Response,
+    limit: Optional[int] = Query(10, description="Limite de usuários no ranking", ge=1, le=100)
+):
+    """
+    **Obter ranking dos usuários**
+    
+    Parâmetros opcionais:
+    - **limit**: Limite de usuários a retornar (1-100, padrão: 10)
+    
+    Usuários com o mesmo XP dividem a mesma **posicao**. Envie o `ETag`
+    recebido em `If-None-Match` para receber `304` quando nada mudou.
+    """
+    result = await controller.get_leaderboard(limit)
+    
+    if not result["success"]:
+        raise HTTPException(
+            status_code=result.get("status_code", 500),
+            detail=result["error"]
+        )
+    
+    etag = result.pop("etag")
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag in [tag.strip() for tag in request.headers.get("if-none-match", "").split(",")]:
+        return Response(status_code=304, headers=headers)
+    
+    response.headers.update(headers)
+    return result
+
+@router.get(
+    "/leaderboard/amigos",
+    response_model=Dict[str, Any],
+    summary="Obter ranking entre amigos",
+    description="Retorna o ranking do usuário autenticado entre seus amigos, com a posição dele no grupo",
+    responses={
+        200: {"description": "Ranking retornado com sucesso"},
+        401: {"description": "Token de autenticação inválido ou ausente"},
+        500: {"description": "Erro interno do servidor"}
+    }
+)
+async def get_leaderboard_amigos(
+    current_user: Principal = Depends(get_current_principal)
+):
+    """
+    **Obter ranking entre amigos**
+    
+    Retorna o usuário autenticado e seus amigos ordenados por XP, com
+    **posicao** de cada um, **minha_posicao** e **total** de participantes.
+    """
+    result = await controller.get_leaderboard_amigos(current_user.nickname)
+    
+    if not result["success"]:
+        raise HTTPException(
+            status_code=result.get("status_code", 500),
+            detail=result["error"]
+        )
+    
+    return result
+
+@router.get(
+    "/leaderboard/periodo/{janela}",
+    response_model=Dict[str, Any],
+    summary="Obter ranking do dia ou da semana",
+    description="Retorna o ranking do XP ganho no dia ou na semana corrente",
+    responses={
+        200: {"description": "Ranking retornado com sucesso"},
+        422: {"description": "Janela inválida"},
+        500: {"description": "Erro interno do servidor"}
+    }
+)
+async def get_leaderboard_periodo(
+    janela: Literal["dia", "semana"],
+    limit: Optional[int] = Query(10, description="Limite de usuários no ranking", ge=1, le=100)
+):
+    """
+    **Obter ranking do período corrente**
+    
+    - **janela**: `dia` ou `semana` (fuso de São Paulo)
+    - **limit**: Limite de usuários a retornar (1-100, padrão: 10)
+    
+    Cada item traz **nickname**, **xp** ganho na janela e **posicao**.
+    """
+    result = await controller.get_leaderboard_janela(janela, limit)
+    
+    if not result["success"]:
+        raise HTTPException(
+            status_code=result.get("status_code", 500),
+            detail=result["error"]
+        )
+    
+    return result
+
+@router.get(
+    "/leaderboard/missao/{codigo}",
+    response_model=Dict[str, Any],
+    summary="Obter ranking do período de uma missão",
+    description="Retorna o ranking do XP ganho entre o início e o fim de uma missão",
+    responses={
+        200: {"description": "Ranking retornado com sucesso"},
+        500: {"description": "Erro interno do servidor"}
+    }
+)
+async def get_leaderboard_missao(
+    codigo: int,
+    limit: Optional[int] = Query(10, description="Limite de usuários no ranking", ge=1, le=100)
+):
+    """
+    **Obter ranking do período de uma missão**
+    
+    - **codigo**: Código da missão
+    - **limit**: Limite de usuários a retornar (1-100, padrão: 10)
+    """
+    result = await controller.get_leaderboard_missao(codigo, limit)
+    
+    if not result["success"]:
+        raise HTTPException(
+            status_code=result.get("status_code", 500),
+            detail=result["error"]
+        )
+    
+    return result
+
+@router.post(
+    "/xp/lote",
+    response_model=Dict[str, Any],
+    summary="Conceder XP em lote",
+    description="Concede XP a vários usuários numa única operação atômica. Apenas educadores.",
+    responses={
+        200: {"description": "XP concedido; usuários inexistentes são listados em nao_encontrados"},
+        401: {"description": "Token de autenticação inválido ou ausente"},
+        403: {"description": "Usuário autenticado não é educador"},
+        500: {"description": "Erro interno do servidor"}
+    }
+)
+async def add_xp_lote(
+    request: XpLoteRequest,
+    current_user: Principal = Depends(get_current_principal)
+):
+    """
+    **Conceder XP a uma turma**
+    
+    - **itens**: Lista de `{nickname, xp_amount}` (até 500)
+    - **origem**: Origem do XP no histórico (coleta, missao, troca ou manual; padrão: manual)
+    - **referencia**: Referência opcional da origem (ex.: código da missão)
+    """
+    result = await controller.add_xp_lote(current_user, request)
+    
+    if not result["success"]:
+        raise HTTPException(
+            status_code=result.get("status_code", 400),
+            detail=result["error"]
+        )
+    
+    return result
+
 @router.get(
     "/{nickname}", 
     response_model=Dict[str, Any],
@@ -90,7 +258,7 @@ def get_all_usuarios(
         404: {"description": "Usuário não encontrado"}
     }
 )
-def get_usuario_by_nickname(
+async def get_usuario_by_nickname(
     nickname: str,
     current_user: Dict[str, Any] = Depends(get_current_user)
 ):
@@ -99,7 +267,7 @@ def get_usuario_by_nickname(
     
     - **nickname**: Nome único do usuário a ser buscado
     """
-    result = controller.get_usuario_by_nickname(nickname)
+    result = await controller.get_usuario_by_nickname(nickname)
     
     if not result["success"]:
         raise HTTPException(
@@ -121,7 +289,7 @@ def get_usuario_by_nickname(
         404: {"description": "Usuário não encontrado"}
     }
 )
-def update_usuario(
+async def update_usuario(
     nickname: str, 
     update_data: UsuarioUpdate,
     current_user: Dict[str, Any] = Depends(get_current_user)
@@ -134,7 +302,7 @@ def update_usuario(
       - **ranking**: Novo ranking do usuário
       - **qtdcartas**: Nova quantidade de cartas
     """
-    result = controller.update_usuario(nickname, update_data)
+    result = await controller.update_usuario(nickname, update_data)
     
     if not result["success"]:
         raise HTTPException(
@@ -155,7 +323,7 @@ def update_usuario(
         404: {"description": "Usuário não encontrado"}
     }
 )
-def delete_usuario(
+async def delete_usuario(
     nickname: str,
     current_user: Dict[str, Any] = Depends(get_current_user)
 ):
@@ -166,7 +334,7 @@ def delete_usuario(
     
     ⚠️ **Atenção**: Esta operação é irreversível!
     """
-    result = controller.delete_usuario(nickname)
+    result = await controller.delete_usuario(nickname)
     
     if not result["success"]:
         raise HTTPException(
@@ -189,7 +357,7 @@ def delete_usuario(
         500: {"description": "Erro no upload da imagem"}
     }
 )
-def upload_profile_photo(
+async def upload_profile_photo(
     nickname: str,
     photo_request: PhotoUploadRequest,
     current_user: Dict[str, Any] = Depends(get_current_user)
@@ -200,7 +368,7 @@ def upload_profile_photo(
     - **nickname**: Nome único do usuário
     - **photo_data**: Dados da imagem em base64
     """
-    result = controller.upload_profile_photo(nickname, photo_request)
+    result = await controller.upload_profile_photo(nickname, photo_request)
     
     if not result["success"]:
         raise HTTPException(
@@ -222,7 +390,7 @@ def upload_profile_photo(
         500: {"description": "Erro interno do servidor"}
     }
 )
-def add_xp(
+async def add_xp(
     nickname: str,
     xp_request: XpRequest,
     current_user: Dict[str, Any] = Depends(get_current_user)
@@ -231,9 +399,11 @@ def add_xp(
     **Adicionar XP ao usuário**
     
     - **nickname**: Nome único do usuário
-    - **xp_amount**: Quantidade de XP a ser adicionada
+    - **xp_amount**: Quantidade de XP a ser adicionada (1 a 10000)
+    - **origem**: Origem do XP no histórico (coleta, missao, troca ou manual; padrão: manual)
+    - **referencia**: Referência opcional da origem (QRCode, código da missão...)
     """
-    result = controller.add_xp(nickname, xp_request)
+    result = await controller.add_xp(nickname, xp_request)
     
     if not result["success"]:
         raise HTTPException(
@@ -255,7 +425,7 @@ def add_xp(
         500: {"description": "Erro interno do servidor"}
     }
 )
-def get_profile_stats(
+async def get_profile_stats(
     nickname: str,
     current_user: Dict[str, Any] = Depends(get_current_user)
 ):
@@ -270,7 +440,7 @@ def get_profile_stats(
     - Posição no ranking geral
     - XP necessário para o próximo nível
     """
-    result = controller.get_profile_stats(nickname)
+    result = await controller.get_profile_stats(nickname)
     
     if not result["success"]:
         raise HTTPException(
@@ -279,34 +449,3 @@ def get_profile_stats(
         )
     
     return result
-
-@router.get(
-    "/leaderboard",
-    response_model=Dict[str, Any],
-    summary="Obter ranking dos usuários",
-    description="Retorna o ranking dos usuários ordenados por XP",
-    responses={
-        200: {"description": "Ranking retornado com sucesso"},
-        401: {"description": "Token de autenticação inválido ou ausente"},
-        500: {"description": "Erro interno do servidor"}
-    }
-)
-def get_leaderboard(
-    limit: Optional[int] = Query(10, description="Limite de usuários no ranking", ge=1, le=100)
-):
-    """
-    **Obter ranking dos usuários**
-    
-    Parâmetros opcionais:
-    - **limit**: Limite de usuários a retornar (1-100, padrão: 10)
-    """
-    print(f"Fetching leaderboard with limit: {limit}")
-    result = controller.get_leaderboard(limit)
-    
-    if not result["success"]:
-        raise HTTPException(
-            status_code=result.get("status_code", 500),
-            detail=result["error"]
-        )
-    
-    return result
@@ -0,0 +1,33 @@
+import os
+from typing import FrozenSet, Optional
+from services.cache import TTLCache
+
+# Validade (s) do conjunto de amigos em cache; cobre mudanças feitas por outros workers
+FRIEND_SET_TTL = float(os.getenv("FRIEND_SET_TTL", "300"))
+
+
+class FriendSetCache:
+    """
+    Conjunto de amigos (amizades aceitas) de cada usuário, em memória.
+
+    AmizadeModel invalida os dois lados a cada amizade aceita, recusada ou
+    removida; o ranking entre amigos combina este conjunto com o índice de
+    XP (services.rank_index), que já acompanha cada mudança de XP.
+    """
+
+    def __init__(self, maxsize: int = 5000, ttl: float = FRIEND_SET_TTL):
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    def get(self, nickname: str) -> Optional[FrozenSet[str]]:
+        return self._cache.get(nickname)
+
+    def set(self, nickname: str, amigos: FrozenSet[str]) -> None:
+        self._cache.set(nickname, amigos)
+
+    def invalidate(self, *nicknames: str) -> None:
+        for nickname in nicknames:
+            if nickname:
+                self._cache.delete(nickname)
+
+
+amigos_cache = FriendSetCache()
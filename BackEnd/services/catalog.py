@@ -0,0 +1,148 @@
+import asyncio
+import os
+import time
+from typing import Any, Dict, Iterable, List, Optional
+from config.database import get_async_database
+
+# Recarregar o catálogo depois deste intervalo (s), para refletir escritas de outros workers
+CATALOG_TTL = float(os.getenv("CATALOG_TTL", "300"))
+# Intervalo mínimo (s) entre recargas provocadas por QRCode desconhecido
+CATALOG_MISS_RELOAD_SECONDS = float(os.getenv("CATALOG_MISS_RELOAD_SECONDS", "30"))
+
+# Nomes fixos das cartas originais (inclui os QRCodes numéricos antigos);
+# as demais cartas usam a coluna nome da tabela carta
+NOMES_CARTAS = {
+    'QR001': 'Framboyant Dourado',
+    'QR002': 'Pau-Brasil Histórico',
+    'QR003': 'Pau-Formiga Guardião',
+    'QR004': 'Cuieté Majestoso',
+    'QR005': 'Abricó-de-Macaco',
+    'QR006': 'Sol Radiante',
+    'QR007': 'Júpiter Colossal',
+    'QR008': 'Saturno dos Anéis',
+    'QR009': 'Urano Místico',
+    'QR010': 'Netuno Tempestuoso',
+    'QR011': 'Plutão Distante',
+    '1': 'Framboyant Dourado',
+    '2': 'Pau-Brasil Histórico',
+    '3': 'Pau-Formiga Guardião',
+    '4': 'Cuieté Majestoso',
+    '5': 'Abricó-de-Macaco'
+}
+
+
+def nome_padrao(qrcode: str) -> str:
+    """Nome exibido para um QRCode sem registro no catálogo"""
+    return NOMES_CARTAS.get(qrcode, f"Carta {qrcode}")
+
+
+class CardCatalog:
+    """
+    Catálogo de cartas (e histórias das cartas raras) mantido em memória.
+
+    Carregado uma vez e servido da memória; escritas em CartaModel e
+    CartaRaraModel chamam invalidate(), e a próxima leitura recarrega e
+    incrementa version. Uma invalidação que chega durante a recarga vale
+    para a recarga seguinte.
+    """
+
+    def __init__(self):
+        self._cartas: Dict[str, Dict[str, Any]] = {}
+        self._historias: Dict[str, str] = {}
+        self._loaded_at: Optional[float] = None
+        self._generation = 0
+        self._lock = asyncio.Lock()
+        self.version = 0
+
+    @property
+    def stale(self) -> bool:
+        return self._loaded_at is None or time.time() - self._loaded_at > CATALOG_TTL
+
+    async def ensure_loaded(self) -> None:
+        """Carregar o catálogo se ainda não carregado, invalidado ou vencido"""
+        if self.stale:
+            async with self._lock:
+                if self.stale:
+                    await self._reload()
+
+    async def _reload(self) -> None:
+        generation = self._generation
+        db = get_async_database()
+        cartas_result, raras_result = await asyncio.gather(
+            db.table("carta").select("*").execute(),
+            db.table("cartarara").select("qrcode, historia").execute()
+        )
+
+        cartas = {}
+        for carta in cartas_result.data:
+            qrcode = carta["qrcode"]
+            carta["nome"] = NOMES_CARTAS.get(qrcode) or carta.get("nome") or f"Carta {qrcode}"
+            if carta.get("latitude") is not None and carta.get("longitude") is not None:
+                carta["coordinates"] = {
+                    "latitude": float(carta["latitude"]),
+                    "longitude": float(carta["longitude"])
+                }
+            cartas[qrcode] = carta
+
+        self._cartas = cartas
+        self._historias = {r["qrcode"]: r["historia"] for r in raras_result.data}
+        self.version += 1
+        # Invalidado durante a consulta: os dados podem não ter a escrita, recarregar de novo
+        if generation == self._generation:
+            self._loaded_at = time.time()
+
+    def invalidate(self) -> None:
+        """Marcar o catálogo para recarga na próxima leitura"""
+        self._generation += 1
+        self._loaded_at = None
+
+    @staticmethod
+    def _copia(carta: Dict[str, Any]) -> Dict[str, Any]:
+        copia = dict(carta)
+        if "coordinates" in copia:
+            copia["coordinates"] = dict(copia["coordinates"])
+        return copia
+
+    async def get(self, qrcode: str) -> Optional[Dict[str, Any]]:
+        """Buscar carta por QRCode (cópia, pode ser alterada pelo chamador)"""
+        await self.ensure_loaded()
+        carta = self._cartas.get(qrcode)
+
+        # QRCode desconhecido: a carta pode ter sido criada em outro worker
+        loaded_at = self._loaded_at or 0
+        if carta is None and time.time() - loaded_at > CATALOG_MISS_RELOAD_SECONDS:
+            self.invalidate()
+            await self.ensure_loaded()
+            carta = self._cartas.get(qrcode)
+
+        return self._copia(carta) if carta else None
+
+    async def get_many(self, qrcodes: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """Buscar várias cartas de uma vez (no máximo uma recarga para o lote)"""
+        await self.ensure_loaded()
+        pedidos = {q for q in qrcodes if q}
+
+        loaded_at = self._loaded_at or 0
+        if any(q not in self._cartas for q in pedidos) and time.time() - loaded_at > CATALOG_MISS_RELOAD_SECONDS:
+            self.invalidate()
+            await self.ensure_loaded()
+
+        return {q: self._copia(self._cartas[q]) for q in pedidos if q in self._cartas}
+
+    async def all(self) -> List[Dict[str, Any]]:
+        """Listar todas as cartas"""
+        await self.ensure_loaded()
+        return [self._copia(carta) for carta in self._cartas.values()]
+
+    async def historias(self) -> Dict[str, str]:
+        """Histórias das cartas raras indexadas por QRCode"""
+        await self.ensure_loaded()
+        return dict(self._historias)
+
+    async def nome(self, qrcode: str) -> str:
+        """Nome de exibição da carta"""
+        carta = await self.get(qrcode)
+        return carta["nome"] if carta else nome_padrao(qrcode)
+
+
+card_catalog = CardCatalog()
@@ -0,0 +1,133 @@
+import asyncio
+import gzip
+import hashlib
+import json
+import time
+from typing import Any, Dict, List, Optional
+from config.database import get_async_database
+from services.catalog import card_catalog, CATALOG_TTL
+
+try:
+    import brotli
+except ImportError:  # compressão brotli é opcional
+    brotli = None
+
+
+class BundleSnapshot:
+    """Bundle serializado e já comprimido, com ETag forte e versão (digest do conteúdo)"""
+
+    def __init__(self, digest: str, body: bytes):
+        self.version = digest
+        self.digest = digest
+        self.body = body
+        self.gzip = gzip.compress(body, compresslevel=9, mtime=0)
+        self.brotli = brotli.compress(body) if brotli else None
+
+    def etag(self, encoding: Optional[str] = None) -> str:
+        # Uma representação por codificação, cada uma com seu ETag forte
+        return f'"{self.digest}-{encoding}"' if encoding else f'"{self.digest}"'
+
+    def matches(self, if_none_match: Optional[str]) -> bool:
+        """Compara o If-None-Match com qualquer codificação deste snapshot"""
+        if not if_none_match:
+            return False
+        for tag in if_none_match.split(","):
+            tag = tag.strip()
+            if tag == "*" or tag.strip('"').split("-", 1)[0] == self.digest:
+                return True
+        return False
+
+
+class CatalogBundle:
+    """
+    Snapshot de cartas, histórias das cartas raras e definições de missões
+    para clientes offline.
+
+    O snapshot é refeito quando o catálogo de cartas muda de versão, quando
+    missões são alteradas (invalidate()) ou após CATALOG_TTL. A versão do
+    bundle é o digest do conteúdo, igual em todos os workers para o mesmo
+    catálogo. Uma invalidação que chega durante a reconstrução vale para a
+    reconstrução seguinte.
+    """
+
+    def __init__(self):
+        self._snapshot: Optional[BundleSnapshot] = None
+        self._missoes: List[Dict[str, Any]] = []
+        self._catalog_version = None
+        self._generation = 0
+        self._built_at = 0.0
+        self._lock = asyncio.Lock()
+
+    def invalidate(self) -> None:
+        """Forçar reconstrução na próxima leitura (escritas em missões)"""
+        self._generation += 1
+        self._catalog_version = None
+
+    def _stale(self) -> bool:
+        return (
+            self._snapshot is None
+            or self._catalog_version != card_catalog.version
+            or time.time() - self._built_at > CATALOG_TTL
+        )
+
+    async def get(self) -> BundleSnapshot:
+        await card_catalog.ensure_loaded()
+        if self._stale():
+            async with self._lock:
+                if self._stale():
+                    await self._rebuild()
+        return self._snapshot
+
+    async def missoes(self) -> List[Dict[str, Any]]:
+        """Definições de missões do snapshot atual (com quantidadetotal e cartas_raras)"""
+        await self.get()
+        return self._missoes
+
+    async def _load_missoes(self):
+        db = get_async_database()
+        missoes, qtds, raridades = await asyncio.gather(
+            db.table("missao").select("*").order("codigo").execute(),
+            db.table("missaoqtd").select("*").execute(),
+            db.table("missaoraridade").select("*").execute()
+        )
+
+        quantidade_por_codigo = {m["codigo"]: m["quantidadetotal"] for m in qtds.data}
+        raras_por_codigo: Dict[int, list] = {}
+        for relacao in raridades.data:
+            raras_por_codigo.setdefault(relacao["codigo"], []).append(relacao["cartarara"])
+
+        for missao in missoes.data:
+            missao["quantidadetotal"] = quantidade_por_codigo.get(missao["codigo"])
+            missao["cartas_raras"] = sorted(raras_por_codigo.get(missao["codigo"], []))
+        return missoes.data
+
+    async def _rebuild(self) -> None:
+        generation = self._generation
+        catalog_version = card_catalog.version
+        cartas, historias, missoes = await asyncio.gather(
+            card_catalog.all(), card_catalog.historias(), self._load_missoes()
+        )
+
+        conteudo: Dict[str, Any] = {
+            "cartas": sorted(cartas, key=lambda c: c["qrcode"]),
+            "historias": historias,
+            "missoes": missoes
+        }
+        serializado = json.dumps(conteudo, sort_keys=True, ensure_ascii=False, default=str)
+        digest = hashlib.sha256(serializado.encode("utf-8")).hexdigest()[:32]
+
+        if self._snapshot is None or self._snapshot.digest != digest:
+            body = json.dumps(
+                {"success": True, "version": digest, "data": conteudo},
+                sort_keys=True, ensure_ascii=False, default=str
+            ).encode("utf-8")
+            self._snapshot = BundleSnapshot(digest, body)
+
+        self._missoes = missoes
+        self._built_at = time.time()
+        # Invalidado durante a consulta: as missões podem não ter a escrita, refazer de novo
+        if generation == self._generation:
+            self._catalog_version = catalog_version
+
+
+catalog_bundle = CatalogBundle()
@@ -0,0 +1,109 @@
+import asyncio
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional
+
+BatchFn = Callable[[List[Hashable]], Awaitable[Dict[Hashable, Any]]]
+
+
+class DataLoader:
+    """
+    Identity map + agrupamento de buscas por chave dentro de um request.
+
+    Chamadas a load() feitas na mesma volta do event loop (ex.: dentro de um
+    asyncio.gather) viram uma única chamada a batch_fn com todas as chaves;
+    chaves já carregadas no request são servidas do mapa sem nova consulta.
+    batch_fn recebe a lista de chaves e devolve um dict chave -> valor
+    (chaves ausentes resultam em None).
+    """
+
+    def __init__(self, batch_fn: BatchFn):
+        self._batch_fn = batch_fn
+        self._cache: Dict[Hashable, asyncio.Future] = {}
+        self._pending: List[Hashable] = []
+
+    async def load(self, key: Hashable) -> Any:
+        future = self._cache.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self._cache[key] = future
+            self._pending.append(key)
+            if len(self._pending) == 1:
+                loop.call_soon(self._dispatch)
+        return await asyncio.shield(future)
+
+    def clear(self, key: Hashable) -> None:
+        """Esquecer uma chave (após escrita)"""
+        self._cache.pop(key, None)
+
+    def clear_all(self) -> None:
+        self._cache.clear()
+
+    def _dispatch(self) -> None:
+        keys, self._pending = self._pending, []
+        asyncio.ensure_future(self._run_batch(keys))
+
+    async def _run_batch(self, keys: List[Hashable]) -> None:
+        try:
+            values = await self._batch_fn(keys)
+        except Exception as e:
+            for key in keys:
+                future = self._cache.pop(key, None)
+                if future is not None and not future.done():
+                    future.set_exception(e)
+            return
+
+        for key in keys:
+            future = self._cache.get(key)
+            if future is not None and not future.done():
+                future.set_result(values.get(key))
+
+
+_request_loaders: ContextVar[Optional[Dict[str, DataLoader]]] = ContextVar("request_loaders", default=None)
+
+
+def get_loader(name: str, batch_fn: BatchFn) -> Optional[DataLoader]:
+    """DataLoader do request atual para este nome; None fora de um request"""
+    loaders = _request_loaders.get()
+    if loaders is None:
+        return None
+    loader = loaders.get(name)
+    if loader is None:
+        loader = loaders[name] = DataLoader(batch_fn)
+    return loader
+
+
+def forget(name: str, key: Optional[Hashable] = None) -> None:
+    """Invalidar uma chave (ou o loader inteiro) no request atual"""
+    loaders = _request_loaders.get()
+    if loaders and name in loaders:
+        if key is None:
+            loaders[name].clear_all()
+        else:
+            loaders[name].clear(key)
+
+
+async def load(name: str, batch_fn: BatchFn, key: Hashable) -> Any:
+    """Carregar pelo DataLoader do request ou, fora de um request, direto via batch_fn"""
+    loader = get_loader(name, batch_fn)
+    if loader is None:
+        return (await batch_fn([key])).get(key)
+    return await loader.load(key)
+
+
+class DataLoaderMiddleware:
+    """Middleware ASGI que abre um conjunto novo de DataLoaders por request"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        token = _request_loaders.set({})
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _request_loaders.reset(token)
@@ -0,0 +1,133 @@
+import logging
+import os
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+# Quantas repetições do mesmo formato de consulta num request disparam o aviso de N+1
+DB_REPEAT_WARNING_THRESHOLD = int(os.getenv("DB_REPEAT_WARNING_THRESHOLD", "5"))
+
+# Parâmetros do PostgREST que não são filtros e não entram no formato da consulta
+_PARAMS_IGNORADOS = {"select", "order", "limit", "offset", "on_conflict", "columns"}
+
+
+class RequestDBStats:
+    """Contadores de consultas ao banco feitas durante um request"""
+
+    def __init__(self):
+        self.calls = 0
+        self.elapsed = 0.0
+        self.shapes: Counter = Counter()
+
+    def record(self, shape: str, elapsed: float) -> None:
+        self.calls += 1
+        self.elapsed += elapsed
+        self.shapes[shape] += 1
+
+
+_request_stats: ContextVar[Optional[RequestDBStats]] = ContextVar("request_db_stats", default=None)
+
+
+def record_query(shape: str, elapsed: float) -> None:
+    """Registrar uma consulta no request atual (ignorado fora de um request)"""
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.record(shape, elapsed)
+
+
+def _shape(request) -> str:
+    """Formato da consulta: método, tabela e colunas filtradas, sem os valores"""
+    tabela = str(request.path).rstrip("/").rsplit("/", 1)[-1]
+    filtros = sorted(
+        f"{chave}.{valor.split('.', 1)[0]}" if chave not in ("or", "and") else chave
+        for chave, valor in request.params.multi_items()
+        if chave not in _PARAMS_IGNORADOS
+    )
+    return f"{request.http_method} {tabela} [{', '.join(filtros)}]"
+
+
+class _InstrumentedQuery:
+    """Proxy de um builder do PostgREST que mede o tempo de execute()"""
+
+    def __init__(self, builder):
+        self._builder = builder
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._builder, name)
+        if not callable(attr):
+            return attr
+
+        def wrapper(*args, **kwargs):
+            result = attr(*args, **kwargs)
+            return _InstrumentedQuery(result) if hasattr(result, "execute") else result
+        return wrapper
+
+    async def execute(self):
+        inicio = time.perf_counter()
+        try:
+            return await self._builder.execute()
+        finally:
+            record_query(_shape(self._builder.request), time.perf_counter() - inicio)
+
+
+class InstrumentedClient:
+    """
+    Envolve o cliente Supabase assíncrono contando e cronometrando cada
+    execute() feito a partir de table()/from_()/rpc()
+    """
+
+    def __init__(self, client):
+        self._client = client
+
+    def table(self, name: str) -> _InstrumentedQuery:
+        return _InstrumentedQuery(self._client.table(name))
+
+    def from_(self, name: str) -> _InstrumentedQuery:
+        return _InstrumentedQuery(self._client.from_(name))
+
+    def rpc(self, fn: str, *args, **kwargs) -> _InstrumentedQuery:
+        return _InstrumentedQuery(self._client.rpc(fn, *args, **kwargs))
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._client, name)
+
+
+class DBMetricsMiddleware:
+    """
+    Middleware ASGI que expõe X-DB-Calls e X-DB-Time (ms) em cada resposta e
+    avisa no log quando o mesmo formato de consulta se repete demais (N+1)
+    """
+
+    def __init__(self, app, threshold: int = DB_REPEAT_WARNING_THRESHOLD):
+        self.app = app
+        self.threshold = threshold
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestDBStats()
+        token = _request_stats.set(stats)
+
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"x-db-calls", str(stats.calls).encode()))
+                headers.append((b"x-db-time", f"{stats.elapsed * 1000:.1f}".encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_headers)
+        finally:
+            _request_stats.reset(token)
+            for shape, vezes in stats.shapes.items():
+                if vezes > self.threshold:
+                    logger.warning(
+                        "Possível N+1 em %s %s: '%s' executada %d vezes (%d consultas no total)",
+                        scope.get("method"), scope.get("path"), shape, vezes, stats.calls
+                    )
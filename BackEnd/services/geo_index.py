@@ -0,0 +1,144 @@
+import heapq
+import math
+import os
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from services.catalog import card_catalog
+
+# Tamanho da célula da grade em graus (~0,001° ≈ 110 m de latitude)
+GEO_CELL_DEGREES = float(os.getenv("GEO_CELL_DEGREES", "0.001"))
+# Maior raio (m) aceito na busca por raio; o jogo é na escala do campus
+GEO_MAX_RAIO_M = float(os.getenv("GEO_MAX_RAIO_M", "20000"))
+
+RAIO_TERRA_M = 6371000.0
+METROS_POR_GRAU = math.pi * RAIO_TERRA_M / 180
+
+
+def haversine(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Distância em metros entre dois pontos"""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * RAIO_TERRA_M * math.asin(math.sqrt(a))
+
+
+class GeoIndex:
+    """
+    Índice espacial em grade (buckets de GEO_CELL_DEGREES graus) sobre as
+    cartas do catálogo que têm coordenadas.
+
+    Busca por raio visita só as células que cobrem o círculo; k-vizinhos
+    expande anéis de células a partir do ponto até que nenhuma célula ainda
+    não visitada possa conter algo mais perto que o k-ésimo encontrado.
+    Quando as células a visitar passam do número de buckets ocupados, as
+    duas buscas percorrem os buckets ocupados, limitando o custo a O(cartas).
+    """
+
+    def __init__(self, cell: float = GEO_CELL_DEGREES):
+        self.cell = cell
+        self._buckets: Dict[Tuple[int, int], List[Tuple[float, float, str]]] = {}
+        self.catalog_version: Optional[int] = None
+
+    def _key(self, lat: float, lon: float) -> Tuple[int, int]:
+        return (math.floor(lat / self.cell), math.floor(lon / self.cell))
+
+    def build(self, cartas: Iterable[Dict[str, Any]], catalog_version: int) -> None:
+        buckets: Dict[Tuple[int, int], List[Tuple[float, float, str]]] = {}
+        for carta in cartas:
+            coords = carta.get("coordinates")
+            if not coords:
+                continue
+            lat, lon = coords["latitude"], coords["longitude"]
+            buckets.setdefault(self._key(lat, lon), []).append((lat, lon, carta["qrcode"]))
+        self._buckets = buckets
+        self.catalog_version = catalog_version
+
+    def _ring(self, centro: Tuple[int, int], r: int) -> Iterable[Tuple[int, int]]:
+        ci, cj = centro
+        if r == 0:
+            yield centro
+            return
+        for dj in range(-r, r + 1):
+            yield (ci - r, cj + dj)
+            yield (ci + r, cj + dj)
+        for di in range(-r + 1, r):
+            yield (ci + di, cj - r)
+            yield (ci + di, cj + r)
+
+    def _celulas(self, i0: int, j0: int, i1: int, j1: int) -> Iterable[Tuple[int, int]]:
+        """Células ocupadas no retângulo [i0, i1] x [j0, j1]"""
+        if (i1 - i0 + 1) * (j1 - j0 + 1) > len(self._buckets):
+            return [(i, j) for i, j in self._buckets if i0 <= i <= i1 and j0 <= j <= j1]
+        return ((i, j) for i in range(i0, i1 + 1) for j in range(j0, j1 + 1))
+
+    def within(self, lat: float, lon: float, raio: float,
+               excluir: Optional[Set[str]] = None) -> List[Tuple[float, str]]:
+        """Cartas a até `raio` metros, ordenadas por distância"""
+        dlat = raio / METROS_POR_GRAU
+        dlon = raio / (METROS_POR_GRAU * max(math.cos(math.radians(lat)), 1e-6))
+        i0, j0 = self._key(lat - dlat, lon - dlon)
+        i1, j1 = self._key(lat + dlat, lon + dlon)
+
+        encontradas = []
+        for key in self._celulas(i0, j0, i1, j1):
+            for plat, plon, qrcode in self._buckets.get(key, ()):
+                if excluir and qrcode in excluir:
+                    continue
+                distancia = haversine(lat, lon, plat, plon)
+                if distancia <= raio:
+                    encontradas.append((distancia, qrcode))
+        encontradas.sort()
+        return encontradas
+
+    def nearest(self, lat: float, lon: float, k: int,
+                excluir: Optional[Set[str]] = None) -> List[Tuple[float, str]]:
+        """As k cartas mais próximas, ordenadas por distância"""
+        if not self._buckets or k <= 0:
+            return []
+
+        centro = self._key(lat, lon)
+        def anel(key: Tuple[int, int]) -> int:
+            return max(abs(key[0] - centro[0]), abs(key[1] - centro[1]))
+
+        # Quantos anéis cobrem todas as células ocupadas; além de r_limite
+        # (anéis com mais células que buckets ocupados) percorre os buckets
+        max_r = max(anel(key) for key in self._buckets)
+        r_limite = min(max_r, math.isqrt(len(self._buckets)))
+        # Depois do anel r, qualquer célula não visitada está a pelo menos r * cell_m
+        cell_m = self.cell * METROS_POR_GRAU * max(math.cos(math.radians(lat)), 1e-6)
+
+        heap: List[Tuple[float, str]] = []  # max-heap via distância negativa
+
+        def visitar(key: Tuple[int, int]) -> None:
+            for plat, plon, qrcode in self._buckets.get(key, ()):
+                if excluir and qrcode in excluir:
+                    continue
+                distancia = haversine(lat, lon, plat, plon)
+                if len(heap) < k:
+                    heapq.heappush(heap, (-distancia, qrcode))
+                elif distancia < -heap[0][0]:
+                    heapq.heapreplace(heap, (-distancia, qrcode))
+
+        for r in range(r_limite + 1):
+            for key in self._ring(centro, r):
+                visitar(key)
+            if len(heap) == k and -heap[0][0] <= r * cell_m:
+                break
+        else:
+            for key in self._buckets:
+                if anel(key) > r_limite:
+                    visitar(key)
+
+        return sorted((-d, qrcode) for d, qrcode in heap)
+
+
+_geo_index = GeoIndex()
+
+
+async def get_geo_index() -> GeoIndex:
+    """Índice espacial atualizado com a versão corrente do catálogo"""
+    await card_catalog.ensure_loaded()
+    if _geo_index.catalog_version != card_catalog.version:
+        version = card_catalog.version
+        _geo_index.build(await card_catalog.all(), version)
+    return _geo_index
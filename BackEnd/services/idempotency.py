@@ -0,0 +1,198 @@
+import base64
+import hashlib
+import json
+import os
+from typing import Any, Dict, Optional
+from services.cache import TTLCache
+
+try:
+    import redis.asyncio as redis_asyncio
+except ImportError:  # backend compartilhado (Redis) é opcional
+    redis_asyncio = None
+
+# Por quanto tempo (s) uma resposta fica disponível para replay
+IDEMPOTENCY_TTL = float(os.getenv("IDEMPOTENCY_TTL", "86400"))
+# Máximo de respostas guardadas em memória por worker
+IDEMPOTENCY_MAX_ENTRIES = int(os.getenv("IDEMPOTENCY_MAX_ENTRIES", "10000"))
+# Tempo máximo (s) que uma chave fica reservada enquanto o primeiro request roda
+IDEMPOTENCY_LOCK_TTL = float(os.getenv("IDEMPOTENCY_LOCK_TTL", "60"))
+# Se definido, as respostas são compartilhadas entre workers via Redis
+IDEMPOTENCY_REDIS_URL = os.getenv("IDEMPOTENCY_REDIS_URL")
+
+IDEMPOTENCY_HEADER = b"idempotency-key"
+_METODOS_ESCRITA = {"POST", "PUT", "PATCH", "DELETE"}
+_TAMANHO_MAX_CHAVE = 255
+
+
+class MemoryIdempotencyStore:
+    """Respostas guardadas em memória (LRU limitado + TTL), por worker"""
+
+    def __init__(self, maxsize: int = IDEMPOTENCY_MAX_ENTRIES):
+        self._cache = TTLCache(maxsize=maxsize)
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        return self._cache.get(key)
+
+    async def reserve(self, key: str, fingerprint: str, ttl: float) -> bool:
+        # get + set sem await entre eles: atômico dentro do event loop
+        if self._cache.get(key) is not None:
+            return False
+        self._cache.set(key, {"fingerprint": fingerprint, "status": None}, ttl=ttl)
+        return True
+
+    async def set(self, key: str, record: Dict[str, Any], ttl: float) -> None:
+        self._cache.set(key, record, ttl=ttl)
+
+    async def release(self, key: str) -> None:
+        self._cache.delete(key)
+
+
+class RedisIdempotencyStore:
+    """Respostas guardadas no Redis, compartilhadas entre workers"""
+
+    PREFIX = "idempotency:"
+
+    def __init__(self, url: str):
+        self._redis = redis_asyncio.from_url(url)
+
+    @staticmethod
+    def _encode(record: Dict[str, Any]) -> str:
+        record = dict(record)
+        if record.get("body") is not None:
+            record["body"] = base64.b64encode(record["body"]).decode("ascii")
+        record["headers"] = [[k.decode("latin-1"), v.decode("latin-1")] for k, v in record.get("headers", [])]
+        return json.dumps(record)
+
+    @staticmethod
+    def _decode(raw: bytes) -> Dict[str, Any]:
+        record = json.loads(raw)
+        if record.get("body") is not None:
+            record["body"] = base64.b64decode(record["body"])
+        record["headers"] = [[k.encode("latin-1"), v.encode("latin-1")] for k, v in record.get("headers", [])]
+        return record
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        raw = await self._redis.get(self.PREFIX + key)
+        return self._decode(raw) if raw else None
+
+    async def reserve(self, key: str, fingerprint: str, ttl: float) -> bool:
+        marcador = self._encode({"fingerprint": fingerprint, "status": None})
+        return bool(await self._redis.set(self.PREFIX + key, marcador, nx=True, ex=max(int(ttl), 1)))
+
+    async def set(self, key: str, record: Dict[str, Any], ttl: float) -> None:
+        await self._redis.set(self.PREFIX + key, self._encode(record), ex=max(int(ttl), 1))
+
+    async def release(self, key: str) -> None:
+        await self._redis.delete(self.PREFIX + key)
+
+
+def create_store():
+    """Redis quando configurado e disponível; senão, memória do worker"""
+    if IDEMPOTENCY_REDIS_URL and redis_asyncio is not None:
+        return RedisIdempotencyStore(IDEMPOTENCY_REDIS_URL)
+    if IDEMPOTENCY_REDIS_URL:
+        print("Aviso: IDEMPOTENCY_REDIS_URL definido mas o pacote redis não está instalado; usando memória")
+    return MemoryIdempotencyStore()
+
+
+def _json_response(status: int, detail: str):
+    body = json.dumps({"detail": detail}, ensure_ascii=False).encode("utf-8")
+    return status, [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())], body
+
+
+class IdempotencyMiddleware:
+    """
+    Middleware ASGI que honra o header Idempotency-Key em escritas
+    (POST/PUT/PATCH/DELETE).
+
+    A primeira resposta (status < 500) para uma chave é guardada por
+    IDEMPOTENCY_TTL e repetida, sem tocar no banco, nos retries com a mesma
+    chave, o mesmo token e o mesmo corpo. A chave é escopada pelo header
+    Authorization; reutilizá-la com outro corpo devolve 422, e um retry que
+    chega enquanto o original ainda roda devolve 409.
+    """
+
+    def __init__(self, app, store=None, ttl: float = IDEMPOTENCY_TTL):
+        self.app = app
+        self.store = store or create_store()
+        self.ttl = ttl
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in _METODOS_ESCRITA:
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope.get("headers", []))
+        chave = headers.get(IDEMPOTENCY_HEADER)
+        if chave is None:
+            await self.app(scope, receive, send)
+            return
+
+        if not chave or len(chave) > _TAMANHO_MAX_CHAVE:
+            await self._send(send, *_json_response(400, "Idempotency-Key inválida"))
+            return
+
+        # O corpo é lido inteiro para compor a impressão digital do request
+        corpo = b""
+        while True:
+            message = await receive()
+            corpo += message.get("body", b"")
+            if not message.get("more_body"):
+                break
+
+        escopo = hashlib.sha256(headers.get(b"authorization", b"")).hexdigest()[:32]
+        store_key = f"{escopo}:{chave.decode('latin-1')}"
+        fingerprint = hashlib.sha256(
+            scope["method"].encode() + b" " + scope["path"].encode() + b"?"
+            + scope.get("query_string", b"") + b"\n" + corpo
+        ).hexdigest()
+
+        if not await self.store.reserve(store_key, fingerprint, IDEMPOTENCY_LOCK_TTL):
+            registro = await self.store.get(store_key)
+            if registro is None:
+                # Reserva expirou entre as duas chamadas; o cliente pode tentar de novo
+                await self._send(send, *_json_response(409, "Request com esta Idempotency-Key em andamento"))
+            elif registro["fingerprint"] != fingerprint:
+                await self._send(send, *_json_response(422, "Idempotency-Key já usada com outro request"))
+            elif registro["status"] is None:
+                await self._send(send, *_json_response(409, "Request com esta Idempotency-Key em andamento"))
+            else:
+                replay_headers = [tuple(h) for h in registro["headers"]]
+                replay_headers.append((b"idempotent-replayed", b"true"))
+                await self._send(send, registro["status"], replay_headers, registro["body"])
+            return
+
+        enviado = False
+
+        async def replay_receive():
+            nonlocal enviado
+            if not enviado:
+                enviado = True
+                return {"type": "http.request", "body": corpo, "more_body": False}
+            return await receive()
+
+        resposta: Dict[str, Any] = {"fingerprint": fingerprint, "status": None, "headers": [], "body": b""}
+
+        async def capture_send(message):
+            if message["type"] == "http.response.start":
+                resposta["status"] = message["status"]
+                resposta["headers"] = [[k, v] for k, v in message.get("headers", [])]
+            elif message["type"] == "http.response.body":
+                resposta["body"] += message.get("body", b"")
+            await send(message)
+
+        try:
+            await self.app(scope, replay_receive, capture_send)
+        except Exception:
+            await self.store.release(store_key)
+            raise
+
+        if resposta["status"] is not None and resposta["status"] < 500:
+            await self.store.set(store_key, resposta, self.ttl)
+        else:
+            await self.store.release(store_key)
+
+    @staticmethod
+    async def _send(send, status: int, headers, body: bytes) -> None:
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,47 @@
+import os
+import threading
+from typing import Any, Dict, Optional
+from services.cache import TTLCache
+
+
+class IdentityCache:
+    """
+    Cache email -> pessoa usado para resolver o nickname do usuário autenticado.
+
+    Mantém um índice nickname -> email para que PessoaModel possa invalidar a
+    entrada a partir do nickname quando a pessoa é atualizada ou removida.
+    """
+
+    def __init__(self, maxsize: int = 5000, ttl: float = 300):
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._emails_por_nickname: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def get(self, email: str) -> Optional[Dict[str, Any]]:
+        """Buscar pessoa em cache pelo email"""
+        return self._cache.get(email)
+
+    def set(self, pessoa: Dict[str, Any]) -> None:
+        """Guardar pessoa resolvida"""
+        with self._lock:
+            self._emails_por_nickname[pessoa["nickname"]] = pessoa["email"]
+        self._cache.set(pessoa["email"], pessoa)
+
+    def invalidate_nickname(self, nickname: str) -> None:
+        """Descartar a pessoa com este nickname"""
+        with self._lock:
+            email = self._emails_por_nickname.pop(nickname, None)
+        if email is not None:
+            self._cache.delete(email)
+
+    def clear(self) -> None:
+        """Esvaziar o cache"""
+        with self._lock:
+            self._emails_por_nickname.clear()
+        self._cache.clear()
+
+
+identity_cache = IdentityCache(
+    maxsize=int(os.getenv("IDENTITY_CACHE_SIZE", "5000")),
+    ttl=float(os.getenv("IDENTITY_CACHE_TTL", "300"))
+)
@@ -0,0 +1,115 @@
+import asyncio
+import hashlib
+import json
+import os
+import time
+from typing import Any, Dict, List, Optional
+from config.database import get_async_database, get_direct_repository
+from services.xp_events import ao_mudar_xp
+
+# Quantos usuários o snapshot do topo do ranking guarda
+LEADERBOARD_SIZE = int(os.getenv("LEADERBOARD_SIZE", "100"))
+# Idade máxima (s) do snapshot antes de uma nova consulta
+LEADERBOARD_REFRESH_SECONDS = float(os.getenv("LEADERBOARD_REFRESH_SECONDS", "30"))
+
+
+def numerar_posicoes(usuarios: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Preencher posicao numa lista já ordenada por XP (empates dividem a posição)"""
+    posicao = 0
+    anterior = None
+    for i, usuario in enumerate(usuarios, 1):
+        usuario["xp"] = usuario.get("xp") or 0
+        if usuario["xp"] != anterior:
+            posicao, anterior = i, usuario["xp"]
+        usuario["posicao"] = posicao
+    return usuarios
+
+
+class LeaderboardSnapshot:
+    """Topo do ranking já ordenado e numerado, com digest para ETag"""
+
+    def __init__(self, usuarios: List[Dict[str, Any]]):
+        self.usuarios = usuarios
+        self.digest = hashlib.sha256(
+            json.dumps(usuarios, sort_keys=True, default=str).encode("utf-8")
+        ).hexdigest()[:32]
+        self.built_at = time.time()
+
+    def etag(self, limit: int) -> str:
+        return f'"{self.digest}-{limit}"'
+
+    def top(self, limit: int) -> List[Dict[str, Any]]:
+        return [dict(u) for u in self.usuarios[:limit]]
+
+    def corte(self) -> Optional[int]:
+        """XP do último colocado do snapshot (None se o snapshot não está cheio)"""
+        if len(self.usuarios) < LEADERBOARD_SIZE:
+            return None
+        return self.usuarios[-1]["xp"]
+
+
+class Leaderboard:
+    """
+    Snapshot dos LEADERBOARD_SIZE primeiros do ranking por XP.
+
+    Refeito depois de LEADERBOARD_REFRESH_SECONDS ou quando uma mudança de
+    XP pode alterar o topo (services.xp_events). Uma rajada de leituras com
+    o snapshot vencido dispara uma única consulta (single-flight). Empates no
+    XP são ordenados por nickname e dividem a mesma posição.
+    """
+
+    def __init__(self):
+        self._snapshot: Optional[LeaderboardSnapshot] = None
+        self._dirty = True
+        self._lock = asyncio.Lock()
+
+    def _stale(self) -> bool:
+        return (
+            self._dirty
+            or self._snapshot is None
+            or time.time() - self._snapshot.built_at > LEADERBOARD_REFRESH_SECONDS
+        )
+
+    def invalidate(self) -> None:
+        self._dirty = True
+
+    def notify_xp(self, nickname: str, xp: Optional[int]) -> None:
+        """Invalidar só se a mudança pode entrar, sair ou mexer no topo"""
+        snapshot = self._snapshot
+        if snapshot is None:
+            return
+        corte = snapshot.corte()
+        if corte is None or (xp is not None and xp >= corte) or any(
+            u["nickname"] == nickname for u in snapshot.usuarios
+        ):
+            self._dirty = True
+
+    async def get(self) -> LeaderboardSnapshot:
+        if self._stale():
+            async with self._lock:
+                if self._stale():
+                    # Mudanças que chegarem durante a consulta marcam de novo
+                    self._dirty = False
+                    self._snapshot = LeaderboardSnapshot(numerar_posicoes(await self._load()))
+        return self._snapshot
+
+    async def _load(self) -> List[Dict[str, Any]]:
+        direct = get_direct_repository("usuario")
+        if direct:
+            return await direct.get_leaderboard(LEADERBOARD_SIZE)
+
+        result = await (get_async_database().table("usuario")
+                        .select("nickname, ranking, xp, nivel, qtdcartas")
+                        .order("xp", desc=True)
+                        .order("nickname")
+                        .limit(LEADERBOARD_SIZE)
+                        .execute())
+        return result.data
+
+
+leaderboard = Leaderboard()
+
+
+@ao_mudar_xp
+def _invalidar_leaderboard(nickname: str, xp: Optional[int]) -> None:
+    leaderboard.notify_xp(nickname, xp)
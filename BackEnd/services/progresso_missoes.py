@@ -0,0 +1,279 @@
+import unicodedata
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional
+from config.database import get_async_database
+from services.catalog import card_catalog
+from services.catalog_bundle import catalog_bundle
+from services.dataloader import forget
+from services.xp_events import xp_alterado
+
+RARIDADES_RARAS = {"rara", "epica", "lendaria"}
+
+# XP concedido ao concluir, por tipo de missão
+XP_CONCLUSAO = {"raridade": 200, "evento": 300}
+XP_CONCLUSAO_PADRAO = 100
+
+_DETALHES_QUANTIDADE = {
+    "Coletor Iniciante": ("Colete suas primeiras {meta} cartas", "🌱"),
+    "Explorador": ("Colete {meta} cartas diferentes", "🗺️"),
+    "Veterano": ("Colete {meta} cartas no total", "🏆"),
+}
+
+
+def _normalizar(texto: Optional[str]) -> str:
+    """'Lendária' -> 'lendaria' (o banco grava raridades com acento)"""
+    sem_acento = unicodedata.normalize("NFKD", texto or "").encode("ascii", "ignore").decode("ascii")
+    return sem_acento.lower()
+
+
+def _parse_data(valor: Any) -> Optional[datetime]:
+    if not valor:
+        return None
+    if isinstance(valor, datetime):
+        data = valor
+    else:
+        data = datetime.fromisoformat(str(valor))
+    return data if data.tzinfo else data.replace(tzinfo=timezone.utc)
+
+
+def missao_ativa(missao: Dict[str, Any], agora: datetime) -> bool:
+    """Missão já começou e ainda não terminou"""
+    inicio = _parse_data(missao.get("datainicio"))
+    fim = _parse_data(missao.get("datafim"))
+    return (inicio is None or inicio <= agora) and (fim is None or agora <= fim)
+
+
+class ResumoColecao:
+    """Contagens da coleção do usuário usadas pelas regras das missões"""
+
+    def __init__(self, colecao: Iterable[Dict[str, Any]]):
+        self.qrcodes = set()
+        self.total = 0
+        self.raras = 0
+        self.lendarias = 0
+        for item in colecao:
+            self.qrcodes.add(item["qrcode"])
+            self.total += item.get("quantidade") or 0
+            raridade = _normalizar((item.get("carta") or {}).get("raridade"))
+            if raridade in RARIDADES_RARAS:
+                self.raras += 1
+            if raridade == "lendaria":
+                self.lendarias += 1
+
+    @property
+    def unicas(self) -> int:
+        return len(self.qrcodes)
+
+
+def definir_missao(missao: Dict[str, Any], agora: datetime) -> Dict[str, Any]:
+    """
+    Regra de uma missão: meta, descrição, ícone e qual contador mede o
+    progresso ('total', 'raras', 'lendarias', 'unicas' ou 'vinculadas').
+    `missao` vem com quantidadetotal (None sem missaoqtd) e cartas_raras.
+    """
+    tipo = missao.get("tipo") or "Missão"
+    cartas_raras = missao.get("cartas_raras") or []
+    definicao = {
+        "codigo": missao.get("codigo"),
+        "tipo": tipo,
+        "educador": missao.get("educador"),
+        "datainicio": missao.get("datainicio"),
+        "datafim": missao.get("datafim"),
+        "icone": "🎯",
+        "cartas_raras": cartas_raras,
+    }
+
+    if missao.get("quantidadetotal") is not None:
+        meta = missao["quantidadetotal"] or 5
+        descricao, icone = _DETALHES_QUANTIDADE.get(tipo, ("Colete {meta} cartas", "📦"))
+        definicao.update(tipoMissao="quantidade", contador="total", meta=meta,
+                         descricao=descricao.format(meta=meta), icone=icone)
+    elif tipo == "Caçador de Raras":
+        definicao.update(tipoMissao="raridade", contador="raras", meta=3,
+                         descricao="Encontre 3 cartas raras", icone="⭐")
+    elif tipo == "Lenda Viva":
+        definicao.update(tipoMissao="raridade", contador="lendarias", meta=1,
+                         descricao="Encontre uma carta lendária", icone="👑")
+    elif tipo == "Evento Especial":
+        definicao.update(tipoMissao="evento", contador="unicas", meta=15,
+                         descricao="Colete 15 cartas durante o evento", icone="🎉")
+        fim = _parse_data(missao.get("datafim"))
+        if fim and agora > fim:
+            definicao.update(descricao=definicao["descricao"] + " (Evento encerrado)", icone="⏰")
+    elif cartas_raras:
+        # Missão de raridade: encontrar as cartas raras ligadas a ela
+        definicao.update(tipoMissao="raridade", contador="vinculadas", meta=len(cartas_raras),
+                         descricao=f"Complete a missão {tipo}")
+    else:
+        definicao.update(tipoMissao="geral", contador="unicas", meta=5,
+                         descricao=f"Complete a missão {tipo}")
+
+    definicao["recompensa_xp"] = XP_CONCLUSAO.get(definicao["tipoMissao"], XP_CONCLUSAO_PADRAO)
+    return definicao
+
+
+def contar(definicao: Dict[str, Any], colecao: ResumoColecao) -> int:
+    """Valor do contador da missão calculado a partir da coleção inteira"""
+    contador = definicao["contador"]
+    if contador == "vinculadas":
+        return sum(1 for qrcode in definicao["cartas_raras"] if qrcode in colecao.qrcodes)
+    return getattr(colecao, contador)
+
+
+def qualifica(definicao: Dict[str, Any], coleta: Dict[str, Any]) -> bool:
+    """A carta coletada {qrcode, raridade} conta para uma missão de cartas distintas"""
+    contador = definicao["contador"]
+    raridade = _normalizar(coleta.get("raridade"))
+    if contador == "raras":
+        return raridade in RARIDADES_RARAS
+    if contador == "lendarias":
+        return raridade == "lendaria"
+    if contador == "vinculadas":
+        return coleta["qrcode"] in definicao["cartas_raras"]
+    return True
+
+
+def item_avanco(definicao: Dict[str, Any], coletas: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """
+    Item de avancar_missoes para as coletas {qrcode, quantidade, raridade},
+    ou None se nenhuma conta para a missão. Missões de cartas distintas
+    mandam os QRCodes (creditados uma única vez no banco), não um incremento.
+    """
+    contador = definicao["contador"]
+    item = {
+        "codigo": definicao["codigo"],
+        "meta": definicao["meta"],
+        "xp": definicao["recompensa_xp"],
+        "raridade": definicao["tipoMissao"] == "raridade",
+        "distintas": contador != "total",
+    }
+    if contador == "total":
+        passo = sum(coleta["quantidade"] for coleta in coletas)
+        return dict(item, incremento=passo) if passo > 0 else None
+
+    qrcodes = sorted({coleta["qrcode"] for coleta in coletas if qualifica(definicao, coleta)})
+    if not qrcodes:
+        return None
+    return dict(
+        item,
+        qrcodes=qrcodes,
+        raridades={"raras": sorted(RARIDADES_RARAS), "lendarias": ["lendaria"]}.get(contador),
+        cartas=definicao["cartas_raras"] if contador == "vinculadas" else None,
+    )
+
+
+def avaliar_missao(definicao: Dict[str, Any], atual: int) -> Dict[str, Any]:
+    """Progresso, meta, conclusão e recompensa de uma missão para o usuário"""
+    meta = definicao["meta"]
+    atual = min(atual, meta)
+    concluida = atual >= meta
+    porcentagem = round(atual / meta * 100) if meta else 0
+
+    if concluida:
+        recompensa = f"{definicao['recompensa_xp']} XP"
+        if definicao["tipoMissao"] == "evento":
+            recompensa += " + Carta Especial"
+    elif porcentagem >= 75:
+        recompensa = "75 XP"
+    elif porcentagem >= 50:
+        recompensa = "50 XP"
+    else:
+        recompensa = "25 XP"
+
+    progresso = {k: v for k, v in definicao.items() if k not in ("contador", "cartas_raras")}
+    progresso.update(
+        progresso=atual,
+        concluida=concluida,
+        porcentagem=porcentagem,
+        recompensa=recompensa,
+    )
+    return progresso
+
+
+class ProgressoMissoes:
+    """
+    Progresso incremental das missões por usuário.
+
+    Cada coleta (scan, lote ou troca aceita) avança os contadores das
+    missões ativas em participaquantidade pela função avancar_missoes, que
+    cria a participação se preciso, credita cada carta distinta uma única
+    vez, detecta a conclusão e concede o XP na mesma transação. A leitura é
+    um lookup nesses contadores, sem escrita; missões ainda sem participação
+    do usuário mostram o valor calculado da coleção.
+    """
+
+    async def definicoes(self, incluir_encerradas: bool = False,
+                         agora: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """Regras das missões (ativas, por padrão), a partir do bundle em cache"""
+        agora = agora or datetime.now(timezone.utc)
+        return [
+            definir_missao(missao, agora)
+            for missao in sorted(await catalog_bundle.missoes(), key=lambda m: m.get("codigo") or 0)
+            if incluir_encerradas or missao_ativa(missao, agora)
+        ]
+
+    async def registrar_coletas(self, usuario: str, coletas: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Avançar as missões ativas do usuário com coletas {qrcode, quantidade}.
+        Devolve as missões concluídas agora; uma falha aqui não desfaz a
+        coleta, que já foi gravada.
+        """
+        try:
+            for coleta in coletas:
+                if "raridade" not in coleta:
+                    carta = await card_catalog.get(coleta["qrcode"])
+                    coleta["raridade"] = carta.get("raridade") if carta else None
+
+            itens = [item for item in (item_avanco(d, coletas) for d in await self.definicoes()) if item]
+            if not itens:
+                return []
+            return await self._avancar(usuario, itens)
+        except Exception as e:
+            print(f"ERROR ProgressoMissoes: {str(e)}")
+            return []
+
+    async def get_progresso(self, usuario: str, incluir_encerradas: bool = False) -> List[Dict[str, Any]]:
+        """Progresso do usuário em cada missão (ativas, por padrão)"""
+        agora = datetime.now(timezone.utc)
+        db = get_async_database()
+        definicoes = await self.definicoes(incluir_encerradas, agora)
+        result = await (db.table("participaquantidade")
+                        .select("codigo, qtdcoletadas")
+                        .eq("usuario", usuario)
+                        .execute())
+        contadores = {p["codigo"]: p.get("qtdcoletadas") or 0 for p in result.data}
+
+        faltando = [d for d in definicoes if d["codigo"] not in contadores]
+        if faltando:
+            # Sem participação ainda: mostra o valor da coleção (gravado na próxima coleta)
+            coleta = await (db.table("coleta")
+                            .select("qrcode, quantidade")
+                            .eq("usuario", usuario)
+                            .execute())
+            for item in coleta.data:
+                carta = await card_catalog.get(item["qrcode"])
+                item["carta"] = {"raridade": carta.get("raridade")} if carta else None
+            resumo = ResumoColecao(coleta.data)
+            for definicao in faltando:
+                contadores[definicao["codigo"]] = contar(definicao, resumo)
+
+        return [avaliar_missao(d, contadores[d["codigo"]]) for d in definicoes]
+
+    async def _avancar(self, usuario: str, itens: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        result = await get_async_database().rpc("avancar_missoes", {
+            "p_usuario": usuario,
+            "p_itens": itens
+        }).execute()
+
+        concluidas = [m for m in result.data or [] if m["nova_conclusao"]]
+        xp_final = [m["xp"] for m in concluidas if m.get("xp") is not None]
+        if xp_final:
+            forget("usuario.nickname", usuario)
+            xp_alterado(usuario, max(xp_final))
+        return [
+            {"codigo": m["codigo"], "meta": m["meta"], "xp_ganho": m["xp_ganho"]}
+            for m in concluidas
+        ]
+
+
+progresso_missoes = ProgressoMissoes()
@@ -0,0 +1,171 @@
+import asyncio
+import bisect
+import os
+import time
+from typing import Any, Dict, Iterable, List, Optional
+from config.database import get_async_database, get_direct_repository
+from services.xp_events import ao_mudar_xp
+
+# Reconstruir o índice a partir do banco depois deste intervalo (s), corrigindo
+# divergências com escritas feitas por outros workers
+RANK_INDEX_REBUILD_SECONDS = float(os.getenv("RANK_INDEX_REBUILD_SECONDS", "300"))
+
+# Tamanho da página ao carregar usuários pelo PostgREST (max_rows do projeto)
+_PAGINA = 1000
+
+
+class _Fenwick:
+    """Árvore de Fenwick com contagens por posição (0..size-1)"""
+
+    def __init__(self, counts: List[int]):
+        # Construção em O(n) a partir das contagens
+        self.tree = [0] + counts
+        for i in range(1, len(self.tree)):
+            pai = i + (i & -i)
+            if pai < len(self.tree):
+                self.tree[pai] += self.tree[i]
+
+    def add(self, posicao: int, delta: int) -> None:
+        i = posicao + 1
+        while i < len(self.tree):
+            self.tree[i] += delta
+            i += i & -i
+
+    def soma(self, k: int) -> int:
+        """Soma das contagens nas posições 0..k-1"""
+        i = min(k, len(self.tree) - 1)
+        total = 0
+        while i > 0:
+            total += self.tree[i]
+            i -= i & -i
+        return total
+
+
+class RankIndex:
+    """
+    Índice de posições no ranking geral por XP, em memória.
+
+    Posição e percentil saem de uma árvore de Fenwick sobre os valores
+    distintos de XP em ordem (compressão de coordenadas), em O(log n): a
+    memória depende do número de usuários, não do maior XP. Um valor de XP
+    ainda não visto reindexa a árvore em O(valores distintos). Empates:
+    usuários com o mesmo XP dividem a mesma posição (1 + quantos têm XP
+    estritamente maior), como na consulta SQL do ranking.
+
+    Carregado na subida, atualizado a cada mudança de XP feita por este
+    worker (services.xp_events) e reconstruído do zero a cada
+    RANK_INDEX_REBUILD_SECONDS.
+    """
+
+    def __init__(self):
+        self._xp: Dict[str, int] = {}
+        self._contagem: Dict[int, int] = {}
+        self._valores: List[int] = []
+        self._fenwick = _Fenwick([])
+        self._loaded_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def stale(self) -> bool:
+        return self._loaded_at is None or time.time() - self._loaded_at > RANK_INDEX_REBUILD_SECONDS
+
+    @property
+    def total(self) -> int:
+        return len(self._xp)
+
+    async def ensure_loaded(self) -> None:
+        """Carregar ou reconstruir o índice se ainda não carregado ou vencido"""
+        if self.stale:
+            async with self._lock:
+                if self.stale:
+                    self.build(await self._load())
+
+    async def _load(self) -> List[Dict[str, Any]]:
+        direct = get_direct_repository("usuario")
+        if direct:
+            return await direct.get_xp_usuarios()
+
+        db = get_async_database()
+        usuarios: List[Dict[str, Any]] = []
+        while True:
+            result = await (db.table("usuario")
+                            .select("nickname, xp")
+                            .order("nickname")
+                            .range(len(usuarios), len(usuarios) + _PAGINA - 1)
+                            .execute())
+            usuarios.extend(result.data)
+            if len(result.data) < _PAGINA:
+                return usuarios
+
+    def build(self, usuarios: Iterable[Dict[str, Any]]) -> None:
+        """Reconstruir o índice a partir de linhas {nickname, xp}"""
+        self._xp = {u["nickname"]: max(u.get("xp") or 0, 0) for u in usuarios}
+        self._contagem = {}
+        for xp in self._xp.values():
+            self._contagem[xp] = self._contagem.get(xp, 0) + 1
+        self._rebuild()
+        self._loaded_at = time.time()
+
+    def _rebuild(self) -> None:
+        """Reindexar a árvore pelos valores de XP com usuários"""
+        self._contagem = {xp: n for xp, n in self._contagem.items() if n}
+        self._valores = sorted(self._contagem)
+        self._fenwick = _Fenwick([self._contagem[xp] for xp in self._valores])
+
+    def _add(self, xp: int, delta: int) -> None:
+        self._contagem[xp] = self._contagem.get(xp, 0) + delta
+        i = bisect.bisect_left(self._valores, xp)
+        if i < len(self._valores) and self._valores[i] == xp:
+            self._fenwick.add(i, delta)
+        else:
+            self._rebuild()
+
+    def _ate(self, xp: int) -> int:
+        """Quantidade de usuários com XP <= xp"""
+        return self._fenwick.soma(bisect.bisect_right(self._valores, xp))
+
+    def update(self, nickname: str, xp: Optional[int]) -> None:
+        """Registrar o XP atual de um usuário (novo ou existente)"""
+        xp = max(xp or 0, 0)
+        anterior = self._xp.get(nickname)
+        if anterior == xp:
+            return
+        if anterior is not None:
+            self._add(anterior, -1)
+        self._xp[nickname] = xp
+        self._add(xp, 1)
+
+    def remove(self, nickname: str) -> None:
+        """Tirar um usuário do índice"""
+        anterior = self._xp.pop(nickname, None)
+        if anterior is not None:
+            self._add(anterior, -1)
+
+    def xp(self, nickname: str) -> Optional[int]:
+        return self._xp.get(nickname)
+
+    def position(self, nickname: str) -> Optional[int]:
+        """Posição no ranking geral (empates dividem a posição)"""
+        xp = self._xp.get(nickname)
+        if xp is None:
+            return None
+        return 1 + self.total - self._ate(xp)
+
+    def percentile(self, nickname: str) -> Optional[float]:
+        """Percentual de usuários com XP estritamente menor"""
+        xp = self._xp.get(nickname)
+        if xp is None:
+            return None
+        abaixo = self._fenwick.soma(bisect.bisect_left(self._valores, xp))
+        return round(100 * abaixo / self.total, 1)
+
+
+rank_index = RankIndex()
+
+
+@ao_mudar_xp
+def _atualizar_rank_index(nickname: str, xp: Optional[int]) -> None:
+    if xp is None:
+        rank_index.remove(nickname)
+    else:
+        rank_index.update(nickname, xp)
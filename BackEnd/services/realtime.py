@@ -0,0 +1,148 @@
+import asyncio
+import json
+import os
+import time
+from typing import Any, Dict, Iterable, Optional, Set
+
+try:
+    import redis.asyncio as redis_asyncio
+except ImportError:  # broker compartilhado (Redis) é opcional
+    redis_asyncio = None
+
+# Se definido, os eventos são repassados entre workers via Redis pub/sub
+REALTIME_REDIS_URL = os.getenv("REALTIME_REDIS_URL")
+# Eventos pendentes por sessão; além disso os mais antigos são descartados
+REALTIME_QUEUE_SIZE = int(os.getenv("REALTIME_QUEUE_SIZE", "100"))
+# Intervalo (s) do heartbeat enviado às sessões ociosas
+REALTIME_HEARTBEAT_SECONDS = float(os.getenv("REALTIME_HEARTBEAT_SECONDS", "25"))
+
+
+class Sessao:
+    """Fila de eventos de uma conexão (WebSocket ou SSE) de um usuário"""
+
+    def __init__(self, nickname: str):
+        self.nickname = nickname
+        self.fila: asyncio.Queue = asyncio.Queue(maxsize=REALTIME_QUEUE_SIZE)
+
+    def entregar(self, evento: Dict[str, Any]) -> None:
+        if self.fila.full():
+            # Cliente lento: perde o evento mais antigo, não trava o publicador
+            self.fila.get_nowait()
+        self.fila.put_nowait(evento)
+
+    async def proximo(self, timeout: float = REALTIME_HEARTBEAT_SECONDS) -> Optional[Dict[str, Any]]:
+        """Próximo evento, ou None se nada chegou dentro do timeout"""
+        try:
+            return await asyncio.wait_for(self.fila.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class RealtimeHub:
+    """Sessões conectadas a este worker, indexadas por usuário"""
+
+    def __init__(self):
+        self._sessoes: Dict[str, Set[Sessao]] = {}
+
+    def conectar(self, nickname: str) -> Sessao:
+        sessao = Sessao(nickname)
+        self._sessoes.setdefault(nickname, set()).add(sessao)
+        return sessao
+
+    def desconectar(self, sessao: Sessao) -> None:
+        sessoes = self._sessoes.get(sessao.nickname)
+        if sessoes is not None:
+            sessoes.discard(sessao)
+            if not sessoes:
+                del self._sessoes[sessao.nickname]
+
+    def conectados(self, nickname: str) -> int:
+        return len(self._sessoes.get(nickname, ()))
+
+    def entregar(self, nickname: str, evento: Dict[str, Any]) -> int:
+        """Colocar o evento na fila de cada sessão do usuário neste worker"""
+        sessoes = self._sessoes.get(nickname, ())
+        for sessao in sessoes:
+            sessao.entregar(evento)
+        return len(sessoes)
+
+
+class LocalBroker:
+    """Entrega direta às sessões deste worker (deploy com um único processo)"""
+
+    def __init__(self, hub: RealtimeHub):
+        self.hub = hub
+
+    async def start(self) -> None:
+        pass
+
+    async def stop(self) -> None:
+        pass
+
+    async def publish(self, destinatarios: Iterable[str], evento: Dict[str, Any]) -> None:
+        for nickname in destinatarios:
+            self.hub.entregar(nickname, evento)
+
+
+class RedisBroker:
+    """Eventos publicados num canal Redis; cada worker entrega às suas sessões"""
+
+    CANAL = "realtime:eventos"
+
+    def __init__(self, hub: RealtimeHub, url: str):
+        self.hub = hub
+        self._redis = redis_asyncio.from_url(url)
+        self._tarefa: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        self._tarefa = asyncio.create_task(self._escutar())
+
+    async def stop(self) -> None:
+        if self._tarefa:
+            self._tarefa.cancel()
+
+    async def publish(self, destinatarios: Iterable[str], evento: Dict[str, Any]) -> None:
+        payload = {"destinatarios": list(destinatarios), "evento": evento}
+        await self._redis.publish(self.CANAL, json.dumps(payload, default=str))
+
+    async def _escutar(self) -> None:
+        while True:
+            try:
+                pubsub = self._redis.pubsub()
+                await pubsub.subscribe(self.CANAL)
+                async for message in pubsub.listen():
+                    if message["type"] != "message":
+                        continue
+                    payload = json.loads(message["data"])
+                    for nickname in payload["destinatarios"]:
+                        self.hub.entregar(nickname, payload["evento"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Erro no broker realtime (Redis): {e}; reconectando")
+                await asyncio.sleep(1)
+
+
+def create_broker(hub: RealtimeHub):
+    """Redis quando configurado e disponível; senão, entrega local"""
+    if REALTIME_REDIS_URL and redis_asyncio is not None:
+        return RedisBroker(hub, REALTIME_REDIS_URL)
+    if REALTIME_REDIS_URL:
+        print("Aviso: REALTIME_REDIS_URL definido mas o pacote redis não está instalado; usando entrega local")
+    return LocalBroker(hub)
+
+
+hub = RealtimeHub()
+broker = create_broker(hub)
+
+
+async def publicar(destinatarios: Iterable[str], tipo: str, dados: Any) -> None:
+    """
+    Enviar um evento ({tipo, dados, enviado_em}) às sessões dos usuários.
+    Falhas são só registradas: a escrita que gerou o evento já foi feita.
+    """
+    evento = {"tipo": tipo, "dados": dados, "enviado_em": time.time()}
+    try:
+        await broker.publish(set(destinatarios), evento)
+    except Exception as e:
+        print(f"Erro ao publicar evento realtime '{tipo}': {e}")
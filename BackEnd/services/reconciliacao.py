@@ -0,0 +1,27 @@
+import asyncio
+import logging
+import os
+from config.database import get_async_database
+
+logger = logging.getLogger(__name__)
+
+# Intervalo (s) entre reconciliações de usuario.qtdcartas; 0 desativa o job
+QTDCARTAS_RECONCILE_INTERVAL = float(os.getenv("QTDCARTAS_RECONCILE_INTERVAL", "3600"))
+
+
+async def reconciliar_qtdcartas() -> int:
+    """Corrigir em lote os contadores qtdcartas divergentes de coleta"""
+    result = await get_async_database().rpc("reconciliar_qtdcartas", {}).execute()
+    return result.data or 0
+
+
+async def loop_reconciliacao(intervalo: float = QTDCARTAS_RECONCILE_INTERVAL) -> None:
+    """Job periódico que repara divergências do contador mantido por delta"""
+    while True:
+        await asyncio.sleep(intervalo)
+        try:
+            corrigidos = await reconciliar_qtdcartas()
+            if corrigidos:
+                logger.warning("Reconciliação de qtdcartas corrigiu %d usuário(s)", corrigidos)
+        except Exception as e:
+            logger.warning("Falha na reconciliação de qtdcartas: %s", e)
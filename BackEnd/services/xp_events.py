@@ -0,0 +1,24 @@
+import logging
+from typing import Callable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Ouvintes recebem (nickname, xp); xp None indica usuário removido
+XpListener = Callable[[str, Optional[int]], None]
+
+_ouvintes: List[XpListener] = []
+
+
+def ao_mudar_xp(ouvinte: XpListener) -> XpListener:
+    """Registrar um ouvinte de mudanças de XP (pode ser usado como decorator)"""
+    _ouvintes.append(ouvinte)
+    return ouvinte
+
+
+def xp_alterado(nickname: str, xp: Optional[int]) -> None:
+    """Avisar índices e caches em memória que o XP de um usuário mudou"""
+    for ouvinte in _ouvintes:
+        try:
+            ouvinte(nickname, xp)
+        except Exception as e:
+            logger.warning("Falha ao propagar mudança de XP de %s: %s", nickname, e)
@@ -0,0 +1,34 @@
+import base64
+import json
+
+import pytest
+
+from controllers.mensagem_controller import codificar_cursor, decodificar_cursor
+
+
+def cursor_bruto(valor) -> str:
+    return base64.urlsafe_b64encode(json.dumps(valor).encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def test_ida_e_volta():
+    mensagem = {"datahora": "2025-07-01T12:30:45.123456", "remetente": "ana", "texto": "oi"}
+    cursor = codificar_cursor(mensagem)
+    assert "=" not in cursor
+    assert decodificar_cursor(cursor) == ("2025-07-01T12:30:45.123456", "ana")
+
+
+def test_datahora_normalizada():
+    assert decodificar_cursor(cursor_bruto(["2025-07-01 12:30:45", "bob"])) == ("2025-07-01T12:30:45", "bob")
+
+
+@pytest.mark.parametrize("cursor", [
+    "",
+    "não-é-base64",
+    cursor_bruto({"datahora": "2025-07-01T12:30:45"}),
+    cursor_bruto(["2025-07-01T12:30:45"]),
+    cursor_bruto(["ontem", "ana"]),
+    cursor_bruto(['2025-07-01T12:30:45"),or(x', "ana"]),
+])
+def test_cursor_invalido(cursor):
+    with pytest.raises(ValueError, match="Cursor inválido"):
+        decodificar_cursor(cursor)
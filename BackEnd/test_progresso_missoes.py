@@ -0,0 +1,123 @@
+from datetime import datetime, timedelta, timezone
+
+from services.progresso_missoes import (
+    ResumoColecao,
+    avaliar_missao,
+    contar,
+    definir_missao,
+    item_avanco,
+    missao_ativa,
+)
+
+AGORA = datetime(2025, 7, 1, 12, tzinfo=timezone.utc)
+
+COLECAO = ResumoColecao([
+    {"qrcode": "QR001", "quantidade": 3, "carta": {"raridade": "comum"}},
+    {"qrcode": "QR002", "quantidade": 1, "carta": {"raridade": "rara"}},
+    {"qrcode": "QR003", "quantidade": 2, "carta": {"raridade": "Épica"}},
+    {"qrcode": "QR004", "quantidade": 1, "carta": {"raridade": "Lendária"}},
+])
+
+
+def missao(**campos):
+    return definir_missao({"codigo": 1, "datainicio": None, "datafim": None, **campos}, AGORA)
+
+
+def coleta(qrcode, raridade, quantidade=1):
+    return {"qrcode": qrcode, "quantidade": quantidade, "raridade": raridade}
+
+
+def test_missao_de_quantidade():
+    definicao = missao(tipo="Veterano", quantidadetotal=10)
+    assert (definicao["tipoMissao"], definicao["contador"], definicao["meta"]) == ("quantidade", "total", 10)
+    assert definicao["descricao"] == "Colete 10 cartas no total"
+    assert contar(definicao, COLECAO) == 7
+
+    item = item_avanco(definicao, [coleta("QR001", "comum", 2), coleta("QR002", "rara")])
+    assert item["distintas"] is False
+    assert item["incremento"] == 3
+
+
+def test_missao_de_quantidade_sem_meta_usa_padrao():
+    assert missao(tipo="Coletor Iniciante", quantidadetotal=0)["meta"] == 5
+
+
+def test_cacador_de_raras():
+    definicao = missao(tipo="Caçador de Raras")
+    assert (definicao["tipoMissao"], definicao["contador"], definicao["meta"]) == ("raridade", "raras", 3)
+    assert contar(definicao, COLECAO) == 3
+
+    item = item_avanco(definicao, [coleta("QR001", "comum"), coleta("QR003", "Épica")])
+    assert item["qrcodes"] == ["QR003"]
+    assert item["raridades"] == ["epica", "lendaria", "rara"]
+    assert item_avanco(definicao, [coleta("QR001", "comum")]) is None
+
+
+def test_lenda_viva():
+    definicao = missao(tipo="Lenda Viva")
+    assert (definicao["contador"], definicao["meta"]) == ("lendarias", 1)
+    assert contar(definicao, COLECAO) == 1
+    assert item_avanco(definicao, [coleta("QR004", "Lendária")])["raridades"] == ["lendaria"]
+    assert item_avanco(definicao, [coleta("QR002", "rara")]) is None
+
+
+def test_evento_especial():
+    definicao = missao(tipo="Evento Especial")
+    assert (definicao["tipoMissao"], definicao["contador"], definicao["meta"]) == ("evento", "unicas", 15)
+    assert definicao["recompensa_xp"] == 300
+    assert contar(definicao, COLECAO) == 4
+
+
+def test_evento_especial_encerrado():
+    definicao = missao(tipo="Evento Especial", datafim=(AGORA - timedelta(days=1)).isoformat())
+    assert definicao["descricao"].endswith("(Evento encerrado)")
+    assert not missao_ativa(definicao, AGORA)
+
+
+def test_missao_com_cartas_vinculadas():
+    definicao = missao(tipo="Trilha", cartas_raras=["QR002", "QR009"])
+    assert (definicao["contador"], definicao["meta"]) == ("vinculadas", 2)
+    assert contar(definicao, COLECAO) == 1
+
+    item = item_avanco(definicao, [coleta("QR001", "comum"), coleta("QR009", "rara")])
+    assert item["qrcodes"] == ["QR009"]
+    assert item["cartas"] == ["QR002", "QR009"]
+
+
+def test_missao_geral():
+    definicao = missao(tipo="Outra")
+    assert (definicao["tipoMissao"], definicao["contador"], definicao["meta"]) == ("geral", "unicas", 5)
+    assert contar(definicao, COLECAO) == 4
+
+
+def test_recoleta_da_mesma_carta_nao_avanca_de_novo():
+    # Escanear, remover e escanear de novo manda o mesmo QRCode, que o banco
+    # credita uma única vez por (usuario, codigo, qrcode); nunca um incremento
+    definicao = missao(tipo="Evento Especial")
+    creditadas = set()
+    for _ in range(15):
+        item = item_avanco(definicao, [coleta("QR001", "comum")])
+        assert "incremento" not in item
+        creditadas.update(item["qrcodes"])
+    assert len(creditadas) == 1
+
+
+def test_missao_ativa():
+    assert missao_ativa({"datainicio": None, "datafim": None}, AGORA)
+    assert not missao_ativa({"datainicio": (AGORA + timedelta(hours=1)).isoformat()}, AGORA)
+    assert missao_ativa({"datainicio": "2025-06-01T00:00:00", "datafim": "2025-07-31T00:00:00"}, AGORA)
+
+
+def test_avaliar_missao():
+    definicao = missao(tipo="Caçador de Raras")
+
+    parcial = avaliar_missao(definicao, 2)
+    assert (parcial["progresso"], parcial["porcentagem"], parcial["concluida"]) == (2, 67, False)
+    assert parcial["recompensa"] == "50 XP"
+    assert "contador" not in parcial and "cartas_raras" not in parcial
+
+    concluida = avaliar_missao(definicao, 5)
+    assert (concluida["progresso"], concluida["porcentagem"], concluida["concluida"]) == (3, 100, True)
+    assert concluida["recompensa"] == "200 XP"
+
+    assert avaliar_missao(missao(tipo="Evento Especial"), 15)["recompensa"] == "300 XP + Carta Especial"
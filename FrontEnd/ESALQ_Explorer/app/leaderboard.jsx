@@ -46,9 +46,9 @@ export default function LeaderboardScreen() {
         // Encontrar posição do usuário atual
         const nickname = await AsyncStorage.getItem('nickname');
         if (nickname) {
-          const userIndex = response.data.findIndex(user => user.nickname === nickname);
-          if (userIndex !== -1) {
-            setUserPosition(userIndex + 1);
+          const user = response.data.find(user => user.nickname === nickname);
+          if (user) {
+            setUserPosition(user.posicao);
           }
         }
       } else {
@@ -104,7 +104,7 @@ export default function LeaderboardScreen() {
   };
 
   const renderLeaderboardItem = (user, index) => {
-    const position = index + 1;
+    const position = user.posicao ?? index + 1;
     const isCurrentUser = user.nickname === userNickname;
 
     return (
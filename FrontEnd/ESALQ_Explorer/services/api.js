@@ -5,6 +5,7 @@ class ApiService {
   constructor() {
     this.baseURL = BACKEND_URL;
     this.token = null;
+    this.catalogBundle = null;
   }
 
   // Método para definir o token
@@ -33,12 +34,12 @@ class ApiService {
     const token = await this.getToken();
 
     const config = {
+      timeout: 10000, // 10 segundos de timeout
+      ...options,
       headers: {
         "Content-Type": "application/json",
         ...options.headers,
       },
-      timeout: 10000, // 10 segundos de timeout
-      ...options,
     };
 
     // Adiciona o token de autorização se existir
@@ -115,28 +116,111 @@ class ApiService {
     await this.clearToken();
   }
 
+  // Catálogo (cartas, histórias e missões): um GET condicional por sessão,
+  // guardado no AsyncStorage para funcionar offline
+  async getCatalogBundle() {
+    if (this.catalogBundle) {
+      return this.catalogBundle;
+    }
+
+    const salvo = await AsyncStorage.getItem("catalog_bundle");
+    const bundleSalvo = salvo ? JSON.parse(salvo) : null;
+    const token = await this.getToken();
+
+    const headers = {};
+    if (token) {
+      headers.Authorization = `Bearer ${token}`;
+    }
+    if (bundleSalvo?.etag) {
+      headers["If-None-Match"] = bundleSalvo.etag;
+    }
+
+    try {
+      const response = await fetch(`${this.baseURL}/api/catalog/bundle`, { headers });
+
+      if (response.status === 304 && bundleSalvo) {
+        this.catalogBundle = bundleSalvo;
+      } else if (response.ok) {
+        const body = await response.json();
+        this.catalogBundle = {
+          etag: response.headers.get("ETag"),
+          version: body.version,
+          ...body.data,
+        };
+        await AsyncStorage.setItem("catalog_bundle", JSON.stringify(this.catalogBundle));
+      } else {
+        throw new ApiError(response.status, null, response);
+      }
+    } catch (error) {
+      // Sem conexão (ou erro no servidor): usa a última cópia salva, se houver
+      if (!bundleSalvo) {
+        throw error;
+      }
+      this.catalogBundle = bundleSalvo;
+    }
+
+    return this.catalogBundle;
+  }
+
   // Métodos para cartas
   async getCartas() {
-    const { data } = await this.get("/api/cartas");
-    return data.data; // O backend retorna { success: true, data: [...] }
+    const bundle = await this.getCatalogBundle();
+    return bundle.cartas;
   }
 
   async getCarta(id) {
+    const bundle = await this.getCatalogBundle();
+    const carta = bundle.cartas.find((c) => c.qrcode === id);
+    if (carta) {
+      return carta;
+    }
+
+    // Carta criada depois do snapshot: busca direto no servidor
     const { data } = await this.get(`/api/cartas/${id}`);
     return data.data;
   }
 
+  // Cartas mais próximas de um ponto (raio em metros; sem raio, as `limit` mais próximas)
+  async getCartasProximas(lat, lon, { raio = null, limit = 10, excluirColetadas = false } = {}) {
+    const params = new URLSearchParams({
+      lat: String(lat),
+      lon: String(lon),
+      limit: String(limit),
+      excluir_coletadas: String(excluirColetadas),
+    });
+    if (raio) {
+      params.append("raio", String(raio));
+    }
+
+    const { data } = await this.get(`/api/cartas/proximas?${params.toString()}`);
+    return data.data; // Cada carta inclui `distancia` em metros
+  }
+
   // Métodos para coleção do usuário
   async getMinhaColecao() {
     const { data } = await this.get("/api/minha-colecao");
     return data.data; // Retorna array de objetos com carta e quantidade
   }
 
+  // Chave única por operação de escrita; retries reutilizam a mesma chave
+  novaChaveIdempotencia() {
+    return `${Date.now().toString(36)}-${Math.random().toString(36).slice(2, 12)}`;
+  }
+
   async adicionarCartaColecao(cartaId) {
-    const { data } = await this.post("/api/colecao/adicionar", {
-      carta_id: cartaId,
-    });
-    return data.data;
+    const options = { headers: { "Idempotency-Key": this.novaChaveIdempotencia() } };
+    const body = { carta_id: cartaId };
+    try {
+      const { data } = await this.post("/api/colecao/adicionar", body, options);
+      return data.data;
+    } catch (error) {
+      if (!(error instanceof NetworkError)) {
+        throw error;
+      }
+      // Uma nova tentativa com a mesma chave não duplica a carta nem o XP
+      const { data } = await this.post("/api/colecao/adicionar", body, options);
+      return data.data;
+    }
   }
 
   async removerCartaColecao(cartaId, quantidade = 1) {
@@ -196,201 +280,9 @@ class ApiService {
   // Calcular progresso das missões
   async calcularProgressoMissoes() {
     try {
-      // Buscar dados necessários
-      const [missoes, minhaColecao, participacoesQtd, participacoesRaridade] = await Promise.all([
-        this.getMissoes().catch(() => []),
-        this.getMinhaColecao().catch(() => []),
-        this.getParticipacoesQuantidade().catch(() => []),
-        this.getParticipacoesRaridade().catch(() => [])
-      ]);
-      
-
-      // Validar se os dados são arrays
-      const missoesValidas = Array.isArray(missoes) ? missoes : [];
-      const colecaoValida = Array.isArray(minhaColecao) ? minhaColecao : [];
-      const missoesComProgresso = [];
-
-      for (const missao of missoesValidas) {
-        const missaoComProgresso = {
-          codigo: missao?.codigo || 0,
-          tipo: missao?.tipo || 'Missão',
-          educador: missao?.educador || 'Sistema',
-          datainicio: missao?.datainicio || new Date(),
-          datafim: missao?.dataFim || null,
-          progresso: 0,
-          meta: 0,
-          concluida: false,
-          porcentagem: 0,
-          descricao: '',
-          recompensa: '50 XP',
-          icone: '🎯'
-        };
-
-        try {
-          console.log(`🔍 Processando missão ${missao?.codigo}: ${missao?.tipo}`);
-          
-          // Primeiro verificar se é missão de quantidade (MissaoQtd)
-          const missaoQtd = await this.getMissaoQuantidade(missao?.codigo).catch((error) => {
-            console.log(`❌ Erro ao buscar MissaoQtd para código ${missao?.codigo}:`, error);
-            return null;
-          });
-          
-          console.log(`📊 MissaoQtd para código ${missao?.codigo}:`, missaoQtd);
-          
-          if (missaoQtd) {
-            // É uma MissaoQtd - calcular baseado na quantidade
-            const totalCartas = colecaoValida.reduce((total, item) => total + (item?.quantidade || 0), 0);
-            
-            missaoComProgresso.meta = missaoQtd?.quantidadetotal || 5;
-            missaoComProgresso.progresso = Math.min(totalCartas, missaoComProgresso.meta);
-            missaoComProgresso.tipoMissao = 'quantidade';
-            
-            console.log(`✅ Missão ${missao?.codigo} é do tipo MissaoQtd - Meta: ${missaoComProgresso.meta}, Progresso: ${missaoComProgresso.progresso}`);
-            
-            // Definir detalhes específicos baseado no tipo
-            switch (missao?.tipo) {
-              case 'Coletor Iniciante':
-                missaoComProgresso.descricao = `Colete suas primeiras ${missaoComProgresso.meta} cartas`;
-                missaoComProgresso.icone = '🌱';
-                break;
-              case 'Explorador':
-                missaoComProgresso.descricao = `Colete ${missaoComProgresso.meta} cartas diferentes`;
-                missaoComProgresso.icone = '🗺️';
-                break;
-              case 'Veterano':
-                missaoComProgresso.descricao = `Colete ${missaoComProgresso.meta} cartas no total`;
-                missaoComProgresso.icone = '🏆';
-                break;
-              default:
-                missaoComProgresso.descricao = `Colete ${missaoComProgresso.meta} cartas`;
-                missaoComProgresso.icone = '📦';
-                break;
-            }
-          } else {
-            console.log(`🔍 Missão ${missao?.codigo} não é MissaoQtd, verificando MissaoRaridade...`);
-            
-            // Verificar se é missão de raridade (MissaoRaridade)
-            const missoesRaridade = await this.getMissaoRaridade().catch((error) => {
-              console.log(`❌ Erro ao buscar MissaoRaridade:`, error);
-              return [];
-            });
-            const missoesRaridadeValidas = Array.isArray(missoesRaridade) ? missoesRaridade : [];
-            const missaoRar = missoesRaridadeValidas.find(mr => mr?.codigo === missao?.codigo);
-            
-            console.log(`📊 MissaoRaridade encontrada para código ${missao?.codigo}:`, missaoRar);
-            console.log(`📋 Todas as MissaoRaridade:`, missoesRaridadeValidas);
-            
-            if (missaoRar || ['Caçador de Raras', 'Lenda Viva', 'Evento Especial'].includes(missao?.tipo)) {
-              // É uma MissaoRaridade ou missão especial
-              missaoComProgresso.tipoMissao = 'raridade';
-              
-              console.log(`✅ Missão ${missao?.codigo} é do tipo MissaoRaridade ou especial`);
-              
-              switch (missao?.tipo) {
-                case 'Caçador de Raras':
-                  missaoComProgresso.meta = 3;
-                  const cartasRaras = colecaoValida.filter(item => 
-                    item?.carta && (
-                      item.carta?.raridade === 'rara' || 
-                      item.carta?.raridade === 'epica' || 
-                      item.carta?.raridade === 'lendaria'
-                    )
-                  );
-                  missaoComProgresso.progresso = Math.min(cartasRaras.length, 3);
-                  missaoComProgresso.descricao = 'Encontre 3 cartas raras';
-                  missaoComProgresso.icone = '⭐';
-                  break;
-                  
-                case 'Lenda Viva':
-                  missaoComProgresso.meta = 1;
-                  const cartasLendarias = colecaoValida.filter(item => 
-                    item?.carta && item.carta?.raridade === 'lendaria'
-                  );
-                  missaoComProgresso.progresso = cartasLendarias.length > 0 ? 1 : 0;
-                  missaoComProgresso.descricao = 'Encontre uma carta lendária';
-                  missaoComProgresso.icone = '👑';
-                  break;
-                  
-                case 'Evento Especial':
-                  missaoComProgresso.meta = 15;
-                  const cartasUnicas = colecaoValida.length;
-                  missaoComProgresso.progresso = Math.min(cartasUnicas, 15);
-                  missaoComProgresso.descricao = 'Colete 15 cartas durante o evento';
-                  missaoComProgresso.icone = '🎉';
-                  missaoComProgresso.tipoMissao = 'evento';
-                  
-                  // Verificar se o evento ainda está ativo
-                  const agora = new Date();
-                  const fimEvento = missao?.DataFim ? new Date(missao.DataFim) : null;
-                  if (fimEvento && agora > fimEvento) {
-                    missaoComProgresso.descricao += ' (Evento encerrado)';
-                    missaoComProgresso.icone = '⏰';
-                  }
-                  break;
-                  
-                default:
-                  missaoComProgresso.meta = 1;
-                  missaoComProgresso.progresso = 0;
-                  missaoComProgresso.descricao = `Complete a missão ${missao?.tipo || 'Especial'}`;
-                  missaoComProgresso.icone = '🎯';
-                  break;
-              }
-            } else {
-              console.log(`⚠️ Missão ${missao?.codigo} (${missao?.tipo}) não encontrada em MissaoQtd nem MissaoRaridade - usando valores padrão`);
-              
-              // Missão sem tipo específico - usar valores padrão
-              missaoComProgresso.meta = 5;
-              missaoComProgresso.progresso = Math.min(colecaoValida.length, 5);
-              missaoComProgresso.descricao = `Complete a missão ${missao?.tipo || 'Geral'}`;
-              missaoComProgresso.tipoMissao = 'geral';
-            }
-          }
-
-          // Calcular porcentagem e status
-          if (missaoComProgresso.meta > 0) {
-            missaoComProgresso.porcentagem = Math.round((missaoComProgresso.progresso / missaoComProgresso.meta) * 100);
-            missaoComProgresso.concluida = missaoComProgresso.progresso >= missaoComProgresso.meta;
-          }
-
-          // Ajustar recompensa baseada no progresso e tipo de missão
-          if (missaoComProgresso.concluida) {
-            switch (missaoComProgresso.tipoMissao) {
-              case 'raridade':
-                missaoComProgresso.recompensa = '200 XP';
-                break;
-              case 'evento':
-                missaoComProgresso.recompensa = '300 XP + Carta Especial';
-                break;
-              default:
-                missaoComProgresso.recompensa = '100 XP';
-                break;
-            }
-          } else if (missaoComProgresso.porcentagem >= 75) {
-            missaoComProgresso.recompensa = '75 XP';
-          } else if (missaoComProgresso.porcentagem >= 50) {
-            missaoComProgresso.recompensa = '50 XP';
-          } else {
-            missaoComProgresso.recompensa = '25 XP';
-          }
-
-        } catch (error) {
-          console.warn(`Erro ao processar missão ${missao?.codigo || 'desconhecida'}:`, error);
-          // Mantém valores padrão em caso de erro
-        }
-
-        missoesComProgresso.push(missaoComProgresso);
-      }
-
-      console.log('Missões processadas:', missoesComProgresso.map(m => ({
-        codigo: m.codigo,
-        tipo: m.tipo,
-        progresso: `${m.progresso}/${m.meta}`,
-        porcentagem: `${m.porcentagem}%`,
-        concluida: m.concluida
-      })));
-
-      return missoesComProgresso;
-
+      // Progresso calculado pelo backend (missões ativas, numa só requisição)
+      const { data } = await this.get("/api/missoes/progresso");
+      return Array.isArray(data?.data) ? data.data : [];
     } catch (error) {
       console.error('Erro ao calcular progresso das missões:', error);
       // Retorna algumas missões de exemplo em caso de erro
@@ -423,13 +315,45 @@ class ApiService {
   }
 
   // Buscar leaderboard (ranking dos usuários)
+  // Topo do ranking; revalida com If-None-Match e reaproveita a última resposta em 304
   async getLeaderboard(limit = 10) {
-    const { data } = await this.get(
-      `/api/usuarios/?limit=${limit}`
+    const anterior = this.leaderboardCache?.[limit];
+    const headers = { "Content-Type": "application/json" };
+    const token = await this.getToken();
+    if (token) {
+      headers.Authorization = `Bearer ${token}`;
+    }
+    if (anterior?.etag) {
+      headers["If-None-Match"] = anterior.etag;
+    }
+
+    const response = await fetch(
+      `${this.baseURL}/api/usuarios/leaderboard?limit=${limit}`,
+      { headers }
     );
+
+    if (response.status === 304 && anterior) {
+      return anterior.data;
+    }
+
+    const data = await response.json();
+    if (!response.ok) {
+      throw new ApiError(response.status, data, response);
+    }
+
+    this.leaderboardCache = {
+      ...this.leaderboardCache,
+      [limit]: { etag: response.headers.get("ETag"), data },
+    };
     return data;
   }
 
+  // Ranking entre amigos, com a posição do usuário no grupo
+  async getLeaderboardAmigos() {
+    const { data } = await this.get("/api/usuarios/leaderboard/amigos");
+    return data.data;
+  }
+
   // === AMIZADES ===
 
   // Enviar solicitação de amizade
@@ -0,0 +1,65 @@
+-- Ranking correspondente a um nível (mesmas faixas de _calculate_ranking no backend)
+CREATE OR REPLACE FUNCTION ranking_por_nivel(p_nivel INT)
+RETURNS VARCHAR
+LANGUAGE sql
+IMMUTABLE
+AS $$
+  SELECT CASE
+    WHEN p_nivel >= 50 THEN 'Lendário'
+    WHEN p_nivel >= 30 THEN 'Mestre'
+    WHEN p_nivel >= 20 THEN 'Especialista'
+    WHEN p_nivel >= 10 THEN 'Avançado'
+    WHEN p_nivel >= 5 THEN 'Intermediário'
+    ELSE 'Iniciante'
+  END;
+$$;
+
+-- Coleta de carta em uma única transação: upsert em coleta, contador de cartas,
+-- XP (só para carta nova), nível e ranking do usuário. Devolve o estado final.
+-- Cada scan trava apenas a linha do próprio usuário, então muitos alunos
+-- escaneando o mesmo QRCode ao mesmo tempo não disputam a mesma linha.
+CREATE OR REPLACE FUNCTION coletar_carta(
+  p_usuario VARCHAR,
+  p_qrcode VARCHAR,
+  p_quantidade INT,
+  p_xp INT
+)
+RETURNS TABLE (
+  usuario VARCHAR,
+  qrcode VARCHAR,
+  quantidade INT,
+  nova BOOLEAN,
+  xp_ganho INT,
+  xp INT,
+  nivel INT,
+  nivel_anterior INT,
+  ranking VARCHAR,
+  qtdcartas INT
+)
+LANGUAGE plpgsql
+AS $$
+#variable_conflict use_column
+DECLARE
+  v_quantidade INT;
+  v_nova BOOLEAN;
+  v_xp_ganho INT;
+BEGIN
+  INSERT INTO coleta AS c (usuario, qrcode, quantidade)
+  VALUES (p_usuario, p_qrcode, p_quantidade)
+  ON CONFLICT (usuario, qrcode)
+  DO UPDATE SET quantidade = c.quantidade + EXCLUDED.quantidade
+  RETURNING c.quantidade, (c.xmax = 0) INTO v_quantidade, v_nova;
+
+  v_xp_ganho := CASE WHEN v_nova THEN p_xp ELSE 0 END;
+
+  RETURN QUERY
+  UPDATE usuario u
+  SET qtdcartas = COALESCE(u.qtdcartas, 0) + p_quantidade,
+      xp = COALESCE(u.xp, 0) + v_xp_ganho,
+      nivel = (COALESCE(u.xp, 0) + v_xp_ganho) / 1000 + 1,
+      ranking = ranking_por_nivel((COALESCE(u.xp, 0) + v_xp_ganho) / 1000 + 1)
+  WHERE u.nickname = p_usuario
+  RETURNING p_usuario, p_qrcode, v_quantidade, v_nova, v_xp_ganho,
+            u.xp, u.nivel, (u.xp - v_xp_ganho) / 1000 + 1, u.ranking, u.qtdcartas;
+END;
+$$;
@@ -0,0 +1,99 @@
+-- Manter usuario.qtdcartas por delta na mesma transação de cada escrita em coleta
+CREATE OR REPLACE FUNCTION aplicar_delta_qtdcartas()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+BEGIN
+  IF TG_OP IN ('UPDATE', 'DELETE') THEN
+    UPDATE usuario
+    SET qtdcartas = COALESCE(qtdcartas, 0) - OLD.quantidade
+    WHERE nickname = OLD.usuario;
+  END IF;
+
+  IF TG_OP IN ('INSERT', 'UPDATE') THEN
+    UPDATE usuario
+    SET qtdcartas = COALESCE(qtdcartas, 0) + NEW.quantidade
+    WHERE nickname = NEW.usuario;
+  END IF;
+
+  RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS coleta_qtdcartas ON coleta;
+CREATE TRIGGER coleta_qtdcartas
+AFTER INSERT OR DELETE OR UPDATE OF usuario, quantidade ON coleta
+FOR EACH ROW EXECUTE FUNCTION aplicar_delta_qtdcartas();
+
+-- O contador agora é mantido pelo trigger; coletar_carta só cuida de XP, nível e ranking
+CREATE OR REPLACE FUNCTION coletar_carta(
+  p_usuario VARCHAR,
+  p_qrcode VARCHAR,
+  p_quantidade INT,
+  p_xp INT
+)
+RETURNS TABLE (
+  usuario VARCHAR,
+  qrcode VARCHAR,
+  quantidade INT,
+  nova BOOLEAN,
+  xp_ganho INT,
+  xp INT,
+  nivel INT,
+  nivel_anterior INT,
+  ranking VARCHAR,
+  qtdcartas INT
+)
+LANGUAGE plpgsql
+AS $$
+#variable_conflict use_column
+DECLARE
+  v_quantidade INT;
+  v_nova BOOLEAN;
+  v_xp_ganho INT;
+BEGIN
+  INSERT INTO coleta AS c (usuario, qrcode, quantidade)
+  VALUES (p_usuario, p_qrcode, p_quantidade)
+  ON CONFLICT (usuario, qrcode)
+  DO UPDATE SET quantidade = c.quantidade + EXCLUDED.quantidade
+  RETURNING c.quantidade, (c.xmax = 0) INTO v_quantidade, v_nova;
+
+  v_xp_ganho := CASE WHEN v_nova THEN p_xp ELSE 0 END;
+
+  RETURN QUERY
+  UPDATE usuario u
+  SET xp = COALESCE(u.xp, 0) + v_xp_ganho,
+      nivel = (COALESCE(u.xp, 0) + v_xp_ganho) / 1000 + 1,
+      ranking = ranking_por_nivel((COALESCE(u.xp, 0) + v_xp_ganho) / 1000 + 1)
+  WHERE u.nickname = p_usuario
+  RETURNING p_usuario, p_qrcode, v_quantidade, v_nova, v_xp_ganho,
+            u.xp, u.nivel, (u.xp - v_xp_ganho) / 1000 + 1, u.ranking, u.qtdcartas;
+END;
+$$;
+
+-- Reconciliação em lote: corrige contadores que divergiram da soma em coleta.
+-- Devolve quantos usuários foram corrigidos.
+CREATE OR REPLACE FUNCTION reconciliar_qtdcartas()
+RETURNS INT
+LANGUAGE plpgsql
+AS $$
+DECLARE
+  v_corrigidos INT;
+BEGIN
+  UPDATE usuario u
+  SET qtdcartas = t.total
+  FROM (
+    SELECT u2.nickname, COALESCE(SUM(c.quantidade), 0)::INT AS total
+    FROM usuario u2
+    LEFT JOIN coleta c ON c.usuario = u2.nickname
+    GROUP BY u2.nickname
+  ) t
+  WHERE u.nickname = t.nickname
+    AND u.qtdcartas IS DISTINCT FROM t.total;
+
+  GET DIAGNOSTICS v_corrigidos = ROW_COUNT;
+  RETURN v_corrigidos;
+END;
+$$;
+
+SELECT reconciliar_qtdcartas();
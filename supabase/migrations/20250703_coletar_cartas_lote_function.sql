@@ -0,0 +1,50 @@
+-- Coleta em lote (fila offline): um upsert para todas as cartas, XP somado das
+-- cartas novas e uma única atualização do usuário. p_itens é um array JSON de
+-- {qrcode, quantidade, xp}; QRCodes repetidos são somados.
+CREATE OR REPLACE FUNCTION coletar_cartas_lote(p_usuario VARCHAR, p_itens JSONB)
+RETURNS JSONB
+LANGUAGE plpgsql
+AS $$
+DECLARE
+  v_itens JSONB;
+  v_xp_ganho INT;
+  v_usuario JSONB;
+BEGIN
+  WITH entrada AS (
+    SELECT i.qrcode, SUM(i.quantidade)::INT AS quantidade, MAX(i.xp) AS xp
+    FROM jsonb_to_recordset(p_itens) AS i(qrcode VARCHAR, quantidade INT, xp INT)
+    GROUP BY i.qrcode
+  ),
+  gravadas AS (
+    INSERT INTO coleta AS c (usuario, qrcode, quantidade)
+    SELECT p_usuario, e.qrcode, e.quantidade FROM entrada e
+    ON CONFLICT (usuario, qrcode)
+    DO UPDATE SET quantidade = c.quantidade + EXCLUDED.quantidade
+    RETURNING c.qrcode, c.quantidade, (c.xmax = 0) AS nova
+  )
+  SELECT
+    COALESCE(jsonb_agg(jsonb_build_object(
+      'qrcode', g.qrcode, 'quantidade', g.quantidade, 'nova', g.nova
+    )), '[]'::JSONB),
+    COALESCE(SUM(CASE WHEN g.nova THEN e.xp ELSE 0 END), 0)::INT
+  INTO v_itens, v_xp_ganho
+  FROM gravadas g
+  JOIN entrada e ON e.qrcode = g.qrcode;
+
+  UPDATE usuario u
+  SET xp = COALESCE(u.xp, 0) + v_xp_ganho,
+      nivel = (COALESCE(u.xp, 0) + v_xp_ganho) / 1000 + 1,
+      ranking = ranking_por_nivel((COALESCE(u.xp, 0) + v_xp_ganho) / 1000 + 1)
+  WHERE u.nickname = p_usuario
+  RETURNING jsonb_build_object(
+    'xp_ganho', v_xp_ganho,
+    'xp', u.xp,
+    'nivel', u.nivel,
+    'nivel_anterior', (u.xp - v_xp_ganho) / 1000 + 1,
+    'ranking', u.ranking,
+    'qtdcartas', u.qtdcartas
+  ) INTO v_usuario;
+
+  RETURN jsonb_build_object('itens', v_itens, 'usuario', v_usuario);
+END;
+$$;
@@ -0,0 +1,187 @@
+-- Ledger append-only de concessões de XP
+CREATE TABLE xp_evento (
+    id BIGSERIAL PRIMARY KEY,
+    usuario VARCHAR NOT NULL REFERENCES usuario(nickname) ON DELETE CASCADE,
+    quantidade INT NOT NULL,
+    origem VARCHAR NOT NULL CHECK (origem IN ('coleta', 'missao', 'troca', 'manual')),
+    referencia VARCHAR,
+    criado_em TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX idx_xp_evento_usuario ON xp_evento(usuario, criado_em);
+
+-- Rollups por janela (dia e semana no fuso do campus), mantidos a cada evento
+CREATE TABLE xp_janela (
+    usuario VARCHAR NOT NULL REFERENCES usuario(nickname) ON DELETE CASCADE,
+    janela VARCHAR NOT NULL CHECK (janela IN ('dia', 'semana')),
+    inicio DATE NOT NULL,
+    xp INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (usuario, janela, inicio)
+);
+
+CREATE INDEX idx_xp_janela_ranking ON xp_janela(janela, inicio, xp DESC);
+
+-- Início da janela que contém o instante, no fuso do campus
+CREATE OR REPLACE FUNCTION inicio_janela_xp(p_janela VARCHAR, p_instante TIMESTAMPTZ)
+RETURNS DATE
+LANGUAGE sql
+STABLE
+AS $$
+  SELECT date_trunc(CASE WHEN p_janela = 'semana' THEN 'week' ELSE 'day' END,
+                    p_instante AT TIME ZONE 'America/Sao_Paulo')::DATE;
+$$;
+
+CREATE OR REPLACE FUNCTION acumular_xp_janelas()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+BEGIN
+  INSERT INTO xp_janela AS j (usuario, janela, inicio, xp)
+  VALUES
+    (NEW.usuario, 'dia', inicio_janela_xp('dia', NEW.criado_em), NEW.quantidade),
+    (NEW.usuario, 'semana', inicio_janela_xp('semana', NEW.criado_em), NEW.quantidade)
+  ON CONFLICT (usuario, janela, inicio)
+  DO UPDATE SET xp = j.xp + EXCLUDED.xp;
+  RETURN NULL;
+END;
+$$;
+
+CREATE TRIGGER xp_evento_janelas
+AFTER INSERT ON xp_evento
+FOR EACH ROW EXECUTE FUNCTION acumular_xp_janelas();
+
+-- Ranking da janela corrente (dia ou semana): leitura indexada dos rollups
+CREATE OR REPLACE FUNCTION ranking_janela(p_janela VARCHAR, p_limit INT)
+RETURNS TABLE (nickname VARCHAR, xp INT, inicio DATE)
+LANGUAGE sql
+STABLE
+AS $$
+  SELECT j.usuario, j.xp, j.inicio
+  FROM xp_janela j
+  WHERE j.janela = p_janela
+    AND j.inicio = inicio_janela_xp(p_janela, NOW())
+  ORDER BY j.xp DESC, j.usuario
+  LIMIT p_limit;
+$$;
+
+-- Ranking do período de uma missão: soma dos rollups diários entre início e fim
+CREATE OR REPLACE FUNCTION ranking_janela_missao(p_codigo INT, p_limit INT)
+RETURNS TABLE (nickname VARCHAR, xp INT)
+LANGUAGE sql
+STABLE
+AS $$
+  SELECT j.usuario, SUM(j.xp)::INT
+  FROM xp_janela j
+  JOIN missao m ON m.codigo = p_codigo
+  WHERE j.janela = 'dia'
+    AND j.inicio BETWEEN inicio_janela_xp('dia', m.datainicio) AND inicio_janela_xp('dia', m.datafim)
+  GROUP BY j.usuario
+  ORDER BY 2 DESC, j.usuario
+  LIMIT p_limit;
+$$;
+
+-- Coletas passam a registrar o XP concedido no ledger, na mesma transação
+CREATE OR REPLACE FUNCTION coletar_carta(
+  p_usuario VARCHAR,
+  p_qrcode VARCHAR,
+  p_quantidade INT,
+  p_xp INT
+)
+RETURNS TABLE (
+  usuario VARCHAR,
+  qrcode VARCHAR,
+  quantidade INT,
+  nova BOOLEAN,
+  xp_ganho INT,
+  xp INT,
+  nivel INT,
+  nivel_anterior INT,
+  ranking VARCHAR,
+  qtdcartas INT
+)
+LANGUAGE plpgsql
+AS $$
+#variable_conflict use_column
+DECLARE
+  v_quantidade INT;
+  v_nova BOOLEAN;
+  v_xp_ganho INT;
+BEGIN
+  INSERT INTO coleta AS c (usuario, qrcode, quantidade)
+  VALUES (p_usuario, p_qrcode, p_quantidade)
+  ON CONFLICT (usuario, qrcode)
+  DO UPDATE SET quantidade = c.quantidade + EXCLUDED.quantidade
+  RETURNING c.quantidade, (c.xmax = 0) INTO v_quantidade, v_nova;
+
+  v_xp_ganho := CASE WHEN v_nova THEN p_xp ELSE 0 END;
+
+  IF v_xp_ganho > 0 THEN
+    INSERT INTO xp_evento (usuario, quantidade, origem, referencia)
+    VALUES (p_usuario, v_xp_ganho, 'coleta', p_qrcode);
+  END IF;
+
+  RETURN QUERY
+  UPDATE usuario u
+  SET xp = COALESCE(u.xp, 0) + v_xp_ganho,
+      nivel = (COALESCE(u.xp, 0) + v_xp_ganho) / 1000 + 1,
+      ranking = ranking_por_nivel((COALESCE(u.xp, 0) + v_xp_ganho) / 1000 + 1)
+  WHERE u.nickname = p_usuario
+  RETURNING p_usuario, p_qrcode, v_quantidade, v_nova, v_xp_ganho,
+            u.xp, u.nivel, (u.xp - v_xp_ganho) / 1000 + 1, u.ranking, u.qtdcartas;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION coletar_cartas_lote(p_usuario VARCHAR, p_itens JSONB)
+RETURNS JSONB
+LANGUAGE plpgsql
+AS $$
+DECLARE
+  v_itens JSONB;
+  v_xp_ganho INT;
+  v_usuario JSONB;
+BEGIN
+  WITH entrada AS (
+    SELECT i.qrcode, SUM(i.quantidade)::INT AS quantidade, MAX(i.xp) AS xp
+    FROM jsonb_to_recordset(p_itens) AS i(qrcode VARCHAR, quantidade INT, xp INT)
+    GROUP BY i.qrcode
+  ),
+  gravadas AS (
+    INSERT INTO coleta AS c (usuario, qrcode, quantidade)
+    SELECT p_usuario, e.qrcode, e.quantidade FROM entrada e
+    ON CONFLICT (usuario, qrcode)
+    DO UPDATE SET quantidade = c.quantidade + EXCLUDED.quantidade
+    RETURNING c.qrcode, c.quantidade, (c.xmax = 0) AS nova
+  ),
+  eventos AS (
+    INSERT INTO xp_evento (usuario, quantidade, origem, referencia)
+    SELECT p_usuario, e.xp, 'coleta', g.qrcode
+    FROM gravadas g
+    JOIN entrada e ON e.qrcode = g.qrcode
+    WHERE g.nova AND e.xp > 0
+  )
+  SELECT
+    COALESCE(jsonb_agg(jsonb_build_object(
+      'qrcode', g.qrcode, 'quantidade', g.quantidade, 'nova', g.nova
+    )), '[]'::JSONB),
+    COALESCE(SUM(CASE WHEN g.nova THEN e.xp ELSE 0 END), 0)::INT
+  INTO v_itens, v_xp_ganho
+  FROM gravadas g
+  JOIN entrada e ON e.qrcode = g.qrcode;
+
+  UPDATE usuario u
+  SET xp = COALESCE(u.xp, 0) + v_xp_ganho,
+      nivel = (COALESCE(u.xp, 0) + v_xp_ganho) / 1000 + 1,
+      ranking = ranking_por_nivel((COALESCE(u.xp, 0) + v_xp_ganho) / 1000 + 1)
+  WHERE u.nickname = p_usuario
+  RETURNING jsonb_build_object(
+    'xp_ganho', v_xp_ganho,
+    'xp', u.xp,
+    'nivel', u.nivel,
+    'nivel_anterior', (u.xp - v_xp_ganho) / 1000 + 1,
+    'ranking', u.ranking,
+    'qtdcartas', u.qtdcartas
+  ) INTO v_usuario;
+
+  RETURN jsonb_build_object('itens', v_itens, 'usuario', v_usuario);
+END;
+$$;
@@ -0,0 +1,83 @@
+-- Concessão atômica de XP: incremento, nível (1000 XP por nível), ranking e
+-- registro no ledger numa única instrução; devolve o estado antes e depois
+CREATE OR REPLACE FUNCTION conceder_xp(
+  p_usuario VARCHAR,
+  p_quantidade INT,
+  p_origem VARCHAR DEFAULT 'manual',
+  p_referencia VARCHAR DEFAULT NULL
+)
+RETURNS TABLE (
+  nickname VARCHAR,
+  xp_anterior INT,
+  xp INT,
+  nivel_anterior INT,
+  nivel INT,
+  ranking VARCHAR
+)
+LANGUAGE plpgsql
+AS $$
+#variable_conflict use_column
+BEGIN
+  RETURN QUERY
+  SELECT * FROM conceder_xp_lote(
+    jsonb_build_array(jsonb_build_object('usuario', p_usuario, 'quantidade', p_quantidade)),
+    p_origem,
+    p_referencia
+  );
+END;
+$$;
+
+-- Forma em lote (ex.: educador premiando uma turma): p_itens é um array JSON
+-- de {usuario, quantidade}; usuários inexistentes não aparecem no resultado
+CREATE OR REPLACE FUNCTION conceder_xp_lote(
+  p_itens JSONB,
+  p_origem VARCHAR DEFAULT 'manual',
+  p_referencia VARCHAR DEFAULT NULL
+)
+RETURNS TABLE (
+  nickname VARCHAR,
+  xp_anterior INT,
+  xp INT,
+  nivel_anterior INT,
+  nivel INT,
+  ranking VARCHAR
+)
+LANGUAGE plpgsql
+AS $$
+#variable_conflict use_column
+BEGIN
+  -- Travar as linhas em ordem de nickname evita deadlock entre lotes concorrentes
+  PERFORM 1
+  FROM usuario u
+  WHERE u.nickname IN (SELECT i.usuario FROM jsonb_to_recordset(p_itens) AS i(usuario VARCHAR))
+  ORDER BY u.nickname
+  FOR UPDATE;
+
+  RETURN QUERY
+  WITH entrada AS (
+    SELECT i.usuario, SUM(i.quantidade)::INT AS quantidade
+    FROM jsonb_to_recordset(p_itens) AS i(usuario VARCHAR, quantidade INT)
+    GROUP BY i.usuario
+  ),
+  atualizados AS (
+    UPDATE usuario u
+    SET xp = COALESCE(u.xp, 0) + e.quantidade,
+        nivel = (COALESCE(u.xp, 0) + e.quantidade) / 1000 + 1,
+        ranking = ranking_por_nivel((COALESCE(u.xp, 0) + e.quantidade) / 1000 + 1)
+    FROM entrada e
+    WHERE u.nickname = e.usuario
+    RETURNING u.nickname, u.xp - e.quantidade AS xp_anterior, u.xp,
+              (u.xp - e.quantidade) / 1000 + 1 AS nivel_anterior, u.nivel, u.ranking,
+              e.quantidade
+  ),
+  eventos AS (
+    INSERT INTO xp_evento (usuario, quantidade, origem, referencia)
+    SELECT a.nickname, a.quantidade, p_origem, p_referencia
+    FROM atualizados a
+    WHERE a.quantidade <> 0
+  )
+  SELECT a.nickname, a.xp_anterior, a.xp, a.nivel_anterior, a.nivel, a.ranking
+  FROM atualizados a
+  ORDER BY a.nickname;
+END;
+$$;
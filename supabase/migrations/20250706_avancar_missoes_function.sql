@@ -0,0 +1,82 @@
+-- Progresso incremental das missões: participaquantidade.qtdcoletadas guarda o
+-- contador de cada missão do usuário e participararidade.status marca as
+-- missões de raridade como 'em_andamento' ou 'concluida'.
+--
+-- p_itens é um array JSON de {codigo, incremento, meta, xp, raridade}. Com
+-- p_semente = false só avança participações que já existem; com true cria a
+-- participação com o valor inicial (calculado da coleção) se ainda não existe.
+-- A conclusão é detectada quando o contador cruza a meta, e o XP da missão é
+-- concedido uma única vez, na mesma transação (ledger com origem 'missao').
+CREATE OR REPLACE FUNCTION avancar_missoes(
+  p_usuario VARCHAR,
+  p_itens JSONB,
+  p_semente BOOLEAN DEFAULT FALSE
+)
+RETURNS TABLE (
+  codigo INT,
+  qtdcoletadas INT,
+  meta INT,
+  concluida BOOLEAN,
+  nova_conclusao BOOLEAN,
+  xp_ganho INT,
+  xp INT
+)
+LANGUAGE plpgsql
+AS $$
+#variable_conflict use_column
+DECLARE
+  v_item RECORD;
+  v_antes INT;
+  v_depois INT;
+  v_nova BOOLEAN;
+  v_xp INT;
+BEGIN
+  FOR v_item IN
+    SELECT (i->>'codigo')::INT AS codigo,
+           (i->>'incremento')::INT AS incremento,
+           (i->>'meta')::INT AS meta,
+           COALESCE((i->>'xp')::INT, 0) AS xp,
+           COALESCE((i->>'raridade')::BOOLEAN, FALSE) AS raridade
+    FROM jsonb_array_elements(p_itens) AS i
+    ORDER BY 1
+  LOOP
+    v_antes := NULL;
+    v_depois := NULL;
+    v_xp := NULL;
+
+    IF p_semente THEN
+      INSERT INTO participaquantidade AS p (usuario, codigo, qtdcoletadas)
+      VALUES (p_usuario, v_item.codigo, v_item.incremento)
+      ON CONFLICT (usuario, codigo) DO NOTHING
+      RETURNING 0, p.qtdcoletadas INTO v_antes, v_depois;
+    ELSE
+      UPDATE participaquantidade p
+      SET qtdcoletadas = COALESCE(p.qtdcoletadas, 0) + v_item.incremento
+      WHERE p.usuario = p_usuario AND p.codigo = v_item.codigo
+      RETURNING p.qtdcoletadas - v_item.incremento, p.qtdcoletadas INTO v_antes, v_depois;
+    END IF;
+
+    -- Sem participação ainda (ou semente que já existia): nada a fazer
+    CONTINUE WHEN v_depois IS NULL;
+
+    v_nova := v_antes < v_item.meta AND v_depois >= v_item.meta;
+
+    IF v_item.raridade THEN
+      INSERT INTO participararidade AS r (usuario, codigo, status)
+      VALUES (p_usuario, v_item.codigo,
+              CASE WHEN v_depois >= v_item.meta THEN 'concluida' ELSE 'em_andamento' END)
+      ON CONFLICT (usuario, codigo)
+      DO UPDATE SET status = EXCLUDED.status
+      WHERE r.status IS DISTINCT FROM 'concluida';
+    END IF;
+
+    IF v_nova AND v_item.xp > 0 THEN
+      SELECT c.xp INTO v_xp
+      FROM conceder_xp(p_usuario, v_item.xp, 'missao', v_item.codigo::VARCHAR) AS c;
+    END IF;
+
+    RETURN QUERY SELECT v_item.codigo, v_depois, v_item.meta, v_depois >= v_item.meta, v_nova,
+                        CASE WHEN v_nova AND v_item.xp > 0 THEN v_item.xp ELSE 0 END, v_xp;
+  END LOOP;
+END;
+$$;
@@ -0,0 +1,109 @@
+-- Resumo de conversa na tabela chat: uma linha por par de usuários (sempre
+-- com usuario1 <= usuario2) com a última mensagem e as não lidas de cada lado,
+-- mantida pelo trigger de mensagem. A lista de chats sai desta tabela numa
+-- única consulta paginada, sem varrer o histórico de mensagens.
+ALTER TABLE chat
+  ADD COLUMN IF NOT EXISTS ultima_mensagem TEXT,
+  ADD COLUMN IF NOT EXISTS ultima_data TIMESTAMP,
+  ADD COLUMN IF NOT EXISTS ultimo_tipo VARCHAR,
+  ADD COLUMN IF NOT EXISTS ultimo_remetente VARCHAR,
+  ADD COLUMN IF NOT EXISTS nao_lidas_usuario1 INT NOT NULL DEFAULT 0,
+  ADD COLUMN IF NOT EXISTS nao_lidas_usuario2 INT NOT NULL DEFAULT 0;
+
+-- Normalizar pares já gravados na ordem inversa
+DELETE FROM chat c
+WHERE c.usuario1 > c.usuario2
+  AND EXISTS (SELECT 1 FROM chat o WHERE o.usuario1 = c.usuario2 AND o.usuario2 = c.usuario1);
+
+UPDATE chat SET usuario1 = usuario2, usuario2 = usuario1
+WHERE usuario1 > usuario2;
+
+DO $$
+BEGIN
+  IF NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conname = 'chat_par_ordenado') THEN
+    ALTER TABLE chat ADD CONSTRAINT chat_par_ordenado CHECK (usuario1 <= usuario2);
+  END IF;
+END;
+$$;
+
+CREATE INDEX IF NOT EXISTS idx_chat_usuario1_data ON chat (usuario1, ultima_data DESC);
+CREATE INDEX IF NOT EXISTS idx_chat_usuario2_data ON chat (usuario2, ultima_data DESC);
+
+-- Trigger: cada mensagem nova atualiza o resumo do par e soma uma não lida
+-- para o destinatário. Mensagens inseridas fora de ordem não sobrescrevem
+-- uma última mensagem mais recente.
+CREATE OR REPLACE FUNCTION atualizar_resumo_chat()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+BEGIN
+  INSERT INTO chat AS c (usuario1, usuario2, ultima_mensagem, ultima_data, ultimo_tipo,
+                         ultimo_remetente, nao_lidas_usuario1, nao_lidas_usuario2)
+  VALUES (
+    LEAST(NEW.remetente, NEW.destinatario),
+    GREATEST(NEW.remetente, NEW.destinatario),
+    NEW.texto,
+    NEW.datahora,
+    NEW.tipo,
+    NEW.remetente,
+    CASE WHEN NEW.destinatario < NEW.remetente THEN 1 ELSE 0 END,
+    CASE WHEN NEW.destinatario > NEW.remetente THEN 1 ELSE 0 END
+  )
+  ON CONFLICT (usuario1, usuario2) DO UPDATE SET
+    ultima_mensagem = CASE WHEN c.ultima_data IS NULL OR EXCLUDED.ultima_data >= c.ultima_data
+                           THEN EXCLUDED.ultima_mensagem ELSE c.ultima_mensagem END,
+    ultimo_tipo = CASE WHEN c.ultima_data IS NULL OR EXCLUDED.ultima_data >= c.ultima_data
+                       THEN EXCLUDED.ultimo_tipo ELSE c.ultimo_tipo END,
+    ultimo_remetente = CASE WHEN c.ultima_data IS NULL OR EXCLUDED.ultima_data >= c.ultima_data
+                            THEN EXCLUDED.ultimo_remetente ELSE c.ultimo_remetente END,
+    ultima_data = GREATEST(c.ultima_data, EXCLUDED.ultima_data),
+    nao_lidas_usuario1 = c.nao_lidas_usuario1 + EXCLUDED.nao_lidas_usuario1,
+    nao_lidas_usuario2 = c.nao_lidas_usuario2 + EXCLUDED.nao_lidas_usuario2;
+  RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS mensagem_resumo_chat ON mensagem;
+CREATE TRIGGER mensagem_resumo_chat
+AFTER INSERT ON mensagem
+FOR EACH ROW EXECUTE FUNCTION atualizar_resumo_chat();
+
+-- Carga inicial a partir do histórico (não lidas começam em zero)
+INSERT INTO chat AS c (usuario1, usuario2, ultima_mensagem, ultima_data, ultimo_tipo, ultimo_remetente)
+SELECT DISTINCT ON (LEAST(m.remetente, m.destinatario), GREATEST(m.remetente, m.destinatario))
+       LEAST(m.remetente, m.destinatario),
+       GREATEST(m.remetente, m.destinatario),
+       m.texto, m.datahora, m.tipo, m.remetente
+FROM mensagem m
+ORDER BY LEAST(m.remetente, m.destinatario), GREATEST(m.remetente, m.destinatario), m.datahora DESC
+ON CONFLICT (usuario1, usuario2) DO UPDATE SET
+  ultima_mensagem = EXCLUDED.ultima_mensagem,
+  ultima_data = EXCLUDED.ultima_data,
+  ultimo_tipo = EXCLUDED.ultimo_tipo,
+  ultimo_remetente = EXCLUDED.ultimo_remetente;
+
+-- Lista de chats de um usuário: resumo + dados do contato, mais recentes primeiro
+CREATE OR REPLACE FUNCTION chats_usuario(p_usuario VARCHAR, p_limit INT DEFAULT 50, p_offset INT DEFAULT 0)
+RETURNS TABLE (
+  contato VARCHAR,
+  ultima_mensagem TEXT,
+  ultima_data TIMESTAMP,
+  tipo VARCHAR,
+  ultimo_remetente VARCHAR,
+  nao_lidas INT,
+  fotoperfil TEXT,
+  nivel INT
+)
+LANGUAGE sql
+STABLE
+AS $$
+  SELECT u.nickname, c.ultima_mensagem, c.ultima_data, c.ultimo_tipo, c.ultimo_remetente,
+         CASE WHEN c.usuario1 = p_usuario THEN c.nao_lidas_usuario1 ELSE c.nao_lidas_usuario2 END,
+         u.fotoperfil, u.nivel
+  FROM chat c
+  JOIN usuario u ON u.nickname = CASE WHEN c.usuario1 = p_usuario THEN c.usuario2 ELSE c.usuario1 END
+  WHERE (c.usuario1 = p_usuario OR c.usuario2 = p_usuario)
+    AND c.ultima_data IS NOT NULL
+  ORDER BY c.ultima_data DESC, u.nickname
+  LIMIT p_limit OFFSET p_offset;
+$$;
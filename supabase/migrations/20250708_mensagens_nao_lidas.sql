@@ -0,0 +1,137 @@
+-- Não lidas e confirmação de leitura mantidas de forma incremental:
+-- usuario.nao_lidas_total soma as não lidas de todas as conversas do usuário
+-- (badge da home num lookup por chave primária) e chat.lido_em_usuarioN
+-- guarda até quando cada lado leu a conversa.
+ALTER TABLE usuario
+  ADD COLUMN IF NOT EXISTS nao_lidas_total INT NOT NULL DEFAULT 0;
+
+ALTER TABLE chat
+  ADD COLUMN IF NOT EXISTS lido_em_usuario1 TIMESTAMP,
+  ADD COLUMN IF NOT EXISTS lido_em_usuario2 TIMESTAMP;
+
+-- Trigger de mensagem: além do resumo do par, soma uma não lida no total do
+-- destinatário (mensagens para si mesmo não contam)
+CREATE OR REPLACE FUNCTION atualizar_resumo_chat()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+BEGIN
+  INSERT INTO chat AS c (usuario1, usuario2, ultima_mensagem, ultima_data, ultimo_tipo,
+                         ultimo_remetente, nao_lidas_usuario1, nao_lidas_usuario2)
+  VALUES (
+    LEAST(NEW.remetente, NEW.destinatario),
+    GREATEST(NEW.remetente, NEW.destinatario),
+    NEW.texto,
+    NEW.datahora,
+    NEW.tipo,
+    NEW.remetente,
+    CASE WHEN NEW.destinatario < NEW.remetente THEN 1 ELSE 0 END,
+    CASE WHEN NEW.destinatario > NEW.remetente THEN 1 ELSE 0 END
+  )
+  ON CONFLICT (usuario1, usuario2) DO UPDATE SET
+    ultima_mensagem = CASE WHEN c.ultima_data IS NULL OR EXCLUDED.ultima_data >= c.ultima_data
+                           THEN EXCLUDED.ultima_mensagem ELSE c.ultima_mensagem END,
+    ultimo_tipo = CASE WHEN c.ultima_data IS NULL OR EXCLUDED.ultima_data >= c.ultima_data
+                       THEN EXCLUDED.ultimo_tipo ELSE c.ultimo_tipo END,
+    ultimo_remetente = CASE WHEN c.ultima_data IS NULL OR EXCLUDED.ultima_data >= c.ultima_data
+                            THEN EXCLUDED.ultimo_remetente ELSE c.ultimo_remetente END,
+    ultima_data = GREATEST(c.ultima_data, EXCLUDED.ultima_data),
+    nao_lidas_usuario1 = c.nao_lidas_usuario1 + EXCLUDED.nao_lidas_usuario1,
+    nao_lidas_usuario2 = c.nao_lidas_usuario2 + EXCLUDED.nao_lidas_usuario2;
+
+  IF NEW.remetente <> NEW.destinatario THEN
+    UPDATE usuario
+    SET nao_lidas_total = nao_lidas_total + 1
+    WHERE nickname = NEW.destinatario;
+  END IF;
+  RETURN NULL;
+END;
+$$;
+
+-- Marcar a conversa com p_contato como lida por p_usuario: zera as não lidas
+-- do par, desconta do total e registra o horário da leitura. Trava a linha do
+-- chat antes da do usuário, na mesma ordem do trigger.
+CREATE OR REPLACE FUNCTION marcar_chat_lido(p_usuario VARCHAR, p_contato VARCHAR)
+RETURNS TABLE (lidas INT, nao_lidas_total INT, lido_em TIMESTAMP)
+LANGUAGE plpgsql
+AS $$
+DECLARE
+  v_primeiro BOOLEAN := p_usuario <= p_contato;
+  v_lidas INT;
+  v_total INT;
+  v_agora TIMESTAMP := now();
+BEGIN
+  SELECT CASE WHEN v_primeiro THEN c.nao_lidas_usuario1 ELSE c.nao_lidas_usuario2 END
+  INTO v_lidas
+  FROM chat c
+  WHERE c.usuario1 = LEAST(p_usuario, p_contato)
+    AND c.usuario2 = GREATEST(p_usuario, p_contato)
+  FOR UPDATE;
+
+  IF NOT FOUND THEN
+    v_lidas := 0;
+  ELSE
+    UPDATE chat c SET
+      nao_lidas_usuario1 = CASE WHEN v_primeiro THEN 0 ELSE c.nao_lidas_usuario1 END,
+      nao_lidas_usuario2 = CASE WHEN v_primeiro THEN c.nao_lidas_usuario2 ELSE 0 END,
+      lido_em_usuario1 = CASE WHEN v_primeiro THEN v_agora ELSE c.lido_em_usuario1 END,
+      lido_em_usuario2 = CASE WHEN v_primeiro THEN c.lido_em_usuario2 ELSE v_agora END
+    WHERE c.usuario1 = LEAST(p_usuario, p_contato)
+      AND c.usuario2 = GREATEST(p_usuario, p_contato);
+  END IF;
+
+  IF v_lidas > 0 THEN
+    UPDATE usuario u
+    SET nao_lidas_total = GREATEST(u.nao_lidas_total - v_lidas, 0)
+    WHERE u.nickname = p_usuario
+    RETURNING u.nao_lidas_total INTO v_total;
+  ELSE
+    SELECT u.nao_lidas_total INTO v_total FROM usuario u WHERE u.nickname = p_usuario;
+  END IF;
+
+  RETURN QUERY SELECT v_lidas, COALESCE(v_total, 0), v_agora;
+END;
+$$;
+
+-- Carga inicial do total a partir dos resumos de conversa
+UPDATE usuario u
+SET nao_lidas_total = t.total
+FROM (
+  SELECT usuario, SUM(nao_lidas)::INT AS total
+  FROM (
+    SELECT usuario1 AS usuario, nao_lidas_usuario1 AS nao_lidas FROM chat
+    UNION ALL
+    SELECT usuario2, nao_lidas_usuario2 FROM chat WHERE usuario1 <> usuario2
+  ) lados
+  GROUP BY usuario
+) t
+WHERE u.nickname = t.usuario;
+
+-- Lista de chats: inclui até quando o contato leu a conversa (confirmação de leitura)
+DROP FUNCTION IF EXISTS chats_usuario(VARCHAR, INT, INT);
+CREATE OR REPLACE FUNCTION chats_usuario(p_usuario VARCHAR, p_limit INT DEFAULT 50, p_offset INT DEFAULT 0)
+RETURNS TABLE (
+  contato VARCHAR,
+  ultima_mensagem TEXT,
+  ultima_data TIMESTAMP,
+  tipo VARCHAR,
+  ultimo_remetente VARCHAR,
+  nao_lidas INT,
+  contato_lido_em TIMESTAMP,
+  fotoperfil TEXT,
+  nivel INT
+)
+LANGUAGE sql
+STABLE
+AS $$
+  SELECT u.nickname, c.ultima_mensagem, c.ultima_data, c.ultimo_tipo, c.ultimo_remetente,
+         CASE WHEN c.usuario1 = p_usuario THEN c.nao_lidas_usuario1 ELSE c.nao_lidas_usuario2 END,
+         CASE WHEN c.usuario1 = p_usuario THEN c.lido_em_usuario2 ELSE c.lido_em_usuario1 END,
+         u.fotoperfil, u.nivel
+  FROM chat c
+  JOIN usuario u ON u.nickname = CASE WHEN c.usuario1 = p_usuario THEN c.usuario2 ELSE c.usuario1 END
+  WHERE (c.usuario1 = p_usuario OR c.usuario2 = p_usuario)
+    AND c.ultima_data IS NOT NULL
+  ORDER BY c.ultima_data DESC, u.nickname
+  LIMIT p_limit OFFSET p_offset;
+$$;
@@ -0,0 +1,137 @@
+-- Cartas já creditadas a cada missão do usuário. Missões que contam cartas
+-- distintas (raras, lendárias, únicas, vinculadas) só avançam quando a carta
+-- entra aqui pela primeira vez: remover da coleção e coletar de novo, ou
+-- receber de volta numa troca, não conta a mesma carta duas vezes.
+CREATE TABLE IF NOT EXISTS missao_carta_creditada (
+  usuario VARCHAR REFERENCES usuario(nickname) ON DELETE CASCADE,
+  codigo INT REFERENCES missao(codigo) ON DELETE CASCADE,
+  qrcode VARCHAR REFERENCES carta(qrcode) ON DELETE CASCADE,
+  creditada_em TIMESTAMP NOT NULL DEFAULT now(),
+  PRIMARY KEY (usuario, codigo, qrcode)
+);
+
+-- Progresso incremental das missões, agora criando a participação na escrita.
+--
+-- p_itens é um array JSON de {codigo, meta, xp, raridade, distintas,
+-- incremento, qrcodes, raridades, cartas}:
+--   distintas = false: o contador soma `incremento` (cartas coletadas no total);
+--   distintas = true: o contador é o número de cartas creditadas; `qrcodes`
+--     são as cartas desta coleta que contam para a missão.
+-- Sem participação ainda, o valor inicial vem da coleção (que já inclui esta
+-- coleta): soma das quantidades, ou as cartas que passam no filtro
+-- `raridades` (normalizadas, sem acento) / `cartas` (QRCodes), quando dados.
+-- A conclusão é detectada quando o contador cruza a meta, e o XP da missão é
+-- concedido uma única vez, na mesma transação (ledger com origem 'missao').
+DROP FUNCTION IF EXISTS avancar_missoes(VARCHAR, JSONB, BOOLEAN);
+
+CREATE OR REPLACE FUNCTION avancar_missoes(
+  p_usuario VARCHAR,
+  p_itens JSONB
+)
+RETURNS TABLE (
+  codigo INT,
+  qtdcoletadas INT,
+  meta INT,
+  concluida BOOLEAN,
+  nova_conclusao BOOLEAN,
+  xp_ganho INT,
+  xp INT
+)
+LANGUAGE plpgsql
+AS $$
+#variable_conflict use_column
+DECLARE
+  v_item RECORD;
+  v_antes INT;
+  v_depois INT;
+  v_existe BOOLEAN;
+  v_nova BOOLEAN;
+  v_xp INT;
+BEGIN
+  -- Coletas simultâneas do mesmo usuário avançam as missões uma de cada vez
+  PERFORM pg_advisory_xact_lock(hashtext('avancar_missoes:' || p_usuario));
+
+  FOR v_item IN
+    SELECT (i->>'codigo')::INT AS codigo,
+           (i->>'meta')::INT AS meta,
+           COALESCE((i->>'xp')::INT, 0) AS xp,
+           COALESCE((i->>'raridade')::BOOLEAN, FALSE) AS raridade,
+           COALESCE((i->>'distintas')::BOOLEAN, FALSE) AS distintas,
+           COALESCE((i->>'incremento')::INT, 0) AS incremento,
+           ARRAY(SELECT jsonb_array_elements_text(COALESCE(i->'qrcodes', '[]'::jsonb))) AS qrcodes,
+           CASE WHEN jsonb_typeof(i->'raridades') = 'array'
+                THEN ARRAY(SELECT jsonb_array_elements_text(i->'raridades')) END AS raridades,
+           CASE WHEN jsonb_typeof(i->'cartas') = 'array'
+                THEN ARRAY(SELECT jsonb_array_elements_text(i->'cartas')) END AS cartas
+    FROM jsonb_array_elements(p_itens) AS i
+    ORDER BY 1
+  LOOP
+    v_xp := NULL;
+
+    SELECT p.qtdcoletadas INTO v_antes
+    FROM participaquantidade p
+    WHERE p.usuario = p_usuario AND p.codigo = v_item.codigo
+    FOR UPDATE;
+    v_existe := FOUND;
+    v_antes := COALESCE(v_antes, 0);
+
+    IF v_item.distintas THEN
+      IF NOT EXISTS (SELECT 1 FROM missao_carta_creditada m
+                     WHERE m.usuario = p_usuario AND m.codigo = v_item.codigo) THEN
+        -- Semente: cartas da coleção que contam para a missão
+        INSERT INTO missao_carta_creditada (usuario, codigo, qrcode)
+        SELECT p_usuario, v_item.codigo, c.qrcode
+        FROM coleta c
+        JOIN carta ca ON ca.qrcode = c.qrcode
+        WHERE c.usuario = p_usuario
+          AND (v_item.raridades IS NULL
+               OR translate(lower(ca.raridade), 'áàâãéêíóôõúç', 'aaaaeeiooouc') = ANY(v_item.raridades))
+          AND (v_item.cartas IS NULL OR c.qrcode = ANY(v_item.cartas))
+        ON CONFLICT DO NOTHING;
+      END IF;
+
+      INSERT INTO missao_carta_creditada (usuario, codigo, qrcode)
+      SELECT p_usuario, v_item.codigo, q
+      FROM unnest(v_item.qrcodes) AS q
+      ON CONFLICT DO NOTHING;
+
+      SELECT COUNT(*) INTO v_depois
+      FROM missao_carta_creditada m
+      WHERE m.usuario = p_usuario AND m.codigo = v_item.codigo;
+      -- Participações anteriores a esta tabela nunca regridem
+      v_depois := GREATEST(v_antes, v_depois);
+    ELSIF v_existe THEN
+      v_depois := v_antes + v_item.incremento;
+    ELSE
+      -- Semente: total coletado até agora
+      SELECT COALESCE(SUM(c.quantidade), 0) INTO v_depois
+      FROM coleta c
+      WHERE c.usuario = p_usuario;
+    END IF;
+
+    INSERT INTO participaquantidade AS p (usuario, codigo, qtdcoletadas)
+    VALUES (p_usuario, v_item.codigo, v_depois)
+    ON CONFLICT (usuario, codigo)
+    DO UPDATE SET qtdcoletadas = EXCLUDED.qtdcoletadas;
+
+    v_nova := v_antes < v_item.meta AND v_depois >= v_item.meta;
+
+    IF v_item.raridade THEN
+      INSERT INTO participararidade AS r (usuario, codigo, status)
+      VALUES (p_usuario, v_item.codigo,
+              CASE WHEN v_depois >= v_item.meta THEN 'concluida' ELSE 'em_andamento' END)
+      ON CONFLICT (usuario, codigo)
+      DO UPDATE SET status = EXCLUDED.status
+      WHERE r.status IS DISTINCT FROM 'concluida';
+    END IF;
+
+    IF v_nova AND v_item.xp > 0 THEN
+      SELECT c.xp INTO v_xp
+      FROM conceder_xp(p_usuario, v_item.xp, 'missao', v_item.codigo::VARCHAR) AS c;
+    END IF;
+
+    RETURN QUERY SELECT v_item.codigo, v_depois, v_item.meta, v_depois >= v_item.meta, v_nova,
+                        CASE WHEN v_nova AND v_item.xp > 0 THEN v_item.xp ELSE 0 END, v_xp;
+  END LOOP;
+END;
+$$;
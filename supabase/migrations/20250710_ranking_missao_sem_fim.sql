@@ -0,0 +1,17 @@
+-- Ranking do período de uma missão: missões sem data de fim (ou de início)
+-- ficam abertas daquele lado, em vez de comparar com NULL e não devolver nada
+CREATE OR REPLACE FUNCTION ranking_janela_missao(p_codigo INT, p_limit INT)
+RETURNS TABLE (nickname VARCHAR, xp INT)
+LANGUAGE sql
+STABLE
+AS $$
+  SELECT j.usuario, SUM(j.xp)::INT
+  FROM xp_janela j
+  JOIN missao m ON m.codigo = p_codigo
+  WHERE j.janela = 'dia'
+    AND (m.datainicio IS NULL OR j.inicio >= inicio_janela_xp('dia', m.datainicio))
+    AND (m.datafim IS NULL OR j.inicio <= inicio_janela_xp('dia', m.datafim))
+  GROUP BY j.usuario
+  ORDER BY 2 DESC, j.usuario
+  LIMIT p_limit;
+$$;
@@ -0,0 +1,11 @@
+-- Criar chat com o par ordenado pela collation do banco (LEAST/GREATEST), a
+-- mesma do CHECK chat_par_ordenado e do trigger de resumo; ordenar no
+-- Python (por codepoint) diverge em nicknames com maiúsculas e minúsculas
+CREATE OR REPLACE FUNCTION criar_chat(p_usuario1 VARCHAR, p_usuario2 VARCHAR)
+RETURNS SETOF chat
+LANGUAGE sql
+AS $$
+  INSERT INTO chat (usuario1, usuario2)
+  VALUES (LEAST(p_usuario1, p_usuario2), GREATEST(p_usuario1, p_usuario2))
+  RETURNING *;
+$$;